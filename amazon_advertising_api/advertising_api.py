@@ -1,7 +1,20 @@
 from amazon_advertising_api import versions as v
 from amazon_advertising_api.versions import versions
-from amazon_advertising_api.regions import regions
-from io import BytesIO
+from amazon_advertising_api.regions import base_url, regions
+from amazon_advertising_api.bulk import DEFAULT_CHUNK_SIZE, BulkMutator
+from amazon_advertising_api.cache import request_key
+from amazon_advertising_api.coalesce import SingleFlight
+from amazon_advertising_api.connection_pool import (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT,
+                                                     PoolManager)
+from amazon_advertising_api.deadline import check_deadline
+from amazon_advertising_api.endpoints import install as install_endpoints
+from amazon_advertising_api.exceptions import AdvertisingApiError
+from amazon_advertising_api.instrumentation import new_event, record_response
+from amazon_advertising_api.jsonlib import loads, parsed_result, response_body
+from amazon_advertising_api.models import encode_entity
+from amazon_advertising_api.pagination import iter_pages
+from amazon_advertising_api.recommendations import KEYWORD_BID_LIMIT, KeywordBidRecommender
+from amazon_advertising_api.streaming import iter_chunks, iter_gunzip, iter_json_array
 try:
     # Python 3
     import urllib.request
@@ -11,10 +24,14 @@ except ImportError:
     # Python 2
     from six.moves import urllib
     PYTHON = 2
+import copy
 import gzip
 import json
+import threading
+import time
 
 
+@install_endpoints
 class AdvertisingApi(object):
 
     """Lightweight client library for Amazon Sponsored Products API."""
@@ -26,7 +43,21 @@ class AdvertisingApi(object):
                  profile_id=None,
                  access_token=None,
                  refresh_token=None,
-                 sandbox=False):
+                 sandbox=False,
+                 pool_size=10,
+                 pool_idle_timeout=60,
+                 pool_manager=None,
+                 token_manager=None,
+                 rate_limiter=None,
+                 retry_policy=None,
+                 endpoint=None,
+                 token_url=None,
+                 hooks=None,
+                 parse_responses=False,
+                 cache=None,
+                 coalesce=False,
+                 connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout=DEFAULT_READ_TIMEOUT):
         """
         Client initialization.
 
@@ -43,6 +74,51 @@ class AdvertisingApi(object):
         :type refresh_token: string
         :param sandbox: Indicate whether you are operating in sandbox or prod.
         :type sandbox: boolean
+        :param pool_size: Number of idle keep-alive connections kept per
+            endpoint host.
+        :type pool_size: integer
+        :param pool_idle_timeout: Seconds an idle connection is kept before
+            it is closed rather than reused.
+        :type pool_idle_timeout: float
+        :param pool_manager: Optional PoolManager to share connections
+            between several clients. Overrides pool_size, pool_idle_timeout
+            and the timeouts.
+        :type pool_manager: PoolManager
+        :param token_manager: Optional TokenManager that supplies and
+            refreshes the access token. It may be shared between clients.
+        :type token_manager: TokenManager
+        :param rate_limiter: Optional RateLimiter consulted before each API
+            request. It may be shared between clients.
+        :type rate_limiter: RateLimiter
+        :param retry_policy: Optional RetryPolicy for transient failures.
+            Results then carry a **retries** count.
+        :type retry_policy: RetryPolicy
+        :param endpoint: Optional API host, or URL such as
+            'http://127.0.0.1:8080', overriding the region's endpoint.
+        :type endpoint: string
+        :param token_url: Optional token host and path, or URL, overriding
+            the region's token URL.
+        :type token_url: string
+        :param hooks: Optional request hooks, called before and after every
+            API call and download. See instrumentation.py.
+        :type hooks: list
+        :param parse_responses: Return successful API responses parsed, as a
+            ParsedResult whose **response** is the decoded JSON and whose
+            **raw** holds the body bytes, instead of as JSON text.
+        :type parse_responses: boolean
+        :param cache: Optional EntityCache for GET results. It may be shared
+            between clients.
+        :type cache: EntityCache
+        :param coalesce: Let concurrent identical GET calls share one
+            request; each caller gets its own copy of the result.
+        :type coalesce: boolean
+        :param connect_timeout: Seconds allowed to open a connection, or
+            None to wait indefinitely.
+        :type connect_timeout: float
+        :param read_timeout: Seconds allowed for each send and read of a
+            request, or None to wait indefinitely. Use deadline.deadline
+            to bound a whole call.
+        :type read_timeout: float
         """
         self.client_id = client_id
         self.client_secret = client_secret
@@ -57,6 +133,22 @@ class AdvertisingApi(object):
         self.profile_id = profile_id
         self.token_url = None
 
+        if pool_manager is None:
+            pool_manager = PoolManager(maxsize=pool_size,
+                                       idle_timeout=pool_idle_timeout,
+                                       connect_timeout=connect_timeout,
+                                       read_timeout=read_timeout)
+        self.pool_manager = pool_manager
+        self.token_manager = token_manager
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.hooks = list(hooks or [])
+        self.parse_responses = parse_responses
+        self.cache = cache
+        self.single_flight = SingleFlight() if coalesce else None
+        # Caps the requests in flight for this client; see for_profile.
+        self.request_limit = None
+
         if region in regions:
             if sandbox:
                 self.endpoint = regions[region]['sandbox']
@@ -66,16 +158,83 @@ class AdvertisingApi(object):
         else:
             raise KeyError('Region {} not found in regions.'.format(region))
 
+        if endpoint is not None:
+            self.endpoint = endpoint
+        if token_url is not None:
+            self.token_url = token_url
+
     @property
     def access_token(self):
+        if self.token_manager is not None:
+            return self.token_manager.get_token()
         return self._access_token
 
     @access_token.setter
     def access_token(self, value):
         """Set access_token"""
+        if self.token_manager is not None:
+            self.token_manager.access_token = value
         self._access_token = value
 
+    def for_profile(self, profile_id, max_in_flight=None):
+        """
+        Returns a copy of this client scoped to another profile. The copy
+        shares connections, tokens, rate limiter, retry policy, hooks,
+        cache and in-flight requests.
+
+        :param profile_id: The profile the new client acts for.
+        :type profile_id: string
+        :param max_in_flight: Optional cap on the API requests the copy has
+            in flight at once, across all threads using it.
+        :type max_in_flight: integer
+        """
+        client = copy.copy(self)
+        client.profile_id = profile_id
+        client.request_limit = None
+        if max_in_flight is not None:
+            client.request_limit = self._request_limit(max_in_flight)
+        return client
+
+    @staticmethod
+    def _request_limit(max_in_flight):
+        return threading.BoundedSemaphore(max_in_flight)
+
+    def connection_stats(self):
+        """
+        Returns connection reuse statistics for every endpoint host this
+        client has talked to.
+
+        :returns: dictionary keyed by ``scheme://host`` with **requests**,
+            **connections_created**, **connections_reused**,
+            **connections_discarded** and **idle** counts.
+        """
+        return self.pool_manager.stats()
+
     def do_refresh_token(self):
+        if self.token_manager is not None:
+            return self.token_manager.refresh()
+
+        req = self._prepare_refresh_token()
+        if isinstance(req, dict):
+            return req
+
+        def send():
+            f = self.pool_manager.urlopen(req)
+            return f.code, f.read().decode('utf-8')
+
+        try:
+            # Refreshing is safe to repeat even though it is a POST.
+            (code, response), retries = self._retry('POST', send, idempotent=True)
+            result = self._refresh_token_result(code, response)
+        except urllib.error.HTTPError as e:
+            retries = getattr(e, 'retries', 0)
+            result = {'success': False,
+                      'code': e.code,
+                      'response': '{msg}: {details}'.format(msg=e.msg, details=e.read())}
+        return self._with_retries(result, retries)
+
+    def _prepare_refresh_token(self):
+        """Builds the token request, or returns an error dictionary."""
         if self.refresh_token is None:
             return {'success': False,
                     'code': 0,
@@ -93,27 +252,23 @@ class AdvertisingApi(object):
 
         data = urllib.parse.urlencode(params)
 
-        req = urllib.request.Request(
-            url='https://{}'.format(self.token_url),
-            data=data.encode('utf-8'))
-
-        try:
-            f = urllib.request.urlopen(req)
-            response = f.read().decode('utf-8')
-            if 'access_token' in response:
-                json_data = json.loads(response)
-                self._access_token = json_data['access_token']
-                return {'success': True,
-                        'code': f.code,
-                        'response': self._access_token}
-            else:
-                return {'success': False,
-                        'code': f.code,
-                        'response': 'access_token not in response.'}
-        except urllib.error.HTTPError as e:
+        return urllib.request.Request(
+            url=base_url(self.token_url),
+            data=data.encode('utf-8'),
+            headers={'Content-Type': 'application/x-www-form-urlencoded'})
+
+    def _refresh_token_result(self, code, response):
+        """Stores the refreshed access token from a token response body."""
+        if 'access_token' in response:
+            json_data = json.loads(response)
+            self._access_token = json_data['access_token']
+            return {'success': True,
+                    'code': code,
+                    'response': self._access_token}
+        else:
             return {'success': False,
-                    'code': e.code,
-                    'response': '{msg}: {details}'.format(msg=e.msg, details=e.read())}
+                    'code': code,
+                    'response': 'access_token not in response.'}
 
     def register_profile(self, country_code):
         """
@@ -132,912 +287,9 @@ class AdvertisingApi(object):
         method = 'PUT'
         return self._operation(interface, params, method)
 
-    def get_profiles(self):
-        """
-        Retrieves profiles associated with an auth token.
-
-        :GET: /profiles
-        :returns:
-            :200: Success
-            :401: Unauthorized
-        """
-        interface = 'profiles'
-        return self._operation(interface)
-
-    def get_profile(self, profile_id):
-        """
-        Retrieves a single profile by Id.
-
-        :GET: /profiles/{profileId}
-        :param profile_id: The Id of the requested profile.
-        :type profile_id: string
-        :returns:
-            :200: List of **Profile**
-            :401: Unauthorized
-            :404: Profile not found
-        """
-        interface = 'profiles/{}'.format(profile_id)
-        return self._operation(interface)
-
-    def update_profiles(self, data):
-        """
-        Updates one or more profiles. Advertisers are identified using their
-        profileIds.
-
-        :PUT: /profiles
-        :param data: A list of updates containing **profileId** and the
-            mutable fields to be modified. Only daily budgets are mutable at
-            this time.
-        :type data: List of **Profile**
-        :returns:
-            :207: List of **ProfileResponse** reflecting the same order as the
-                input
-            :401: Unauthorized
-        """
-        interface = 'profiles'
-        return self._operation(interface, data, method='PUT')
-
-    def get_campaign(self, campaign_id, campaign_type='sp'):
-        """
-        Retrieves a campaign by Id. Note that this call returns the minimal
-        set of campaign fields, but is more efficient than **getCampaignEx**.
-
-        :GET: {campaignType}/campaigns/{campaignId}
-        :param campaign_id: The Id of the requested campaign.
-        :type campaign_id: string
-        :param campaign_type: The campaignType of the requested campaign ('sp' or 'sb')
-          Defaults to 'sp'
-        :type campaign_type: string
-        :returns:
-            :200: Campaign
-            :401: Unauthorized
-            :404: Campaign not found
-        """
-        interface = '{}/campaigns/{}'. format(campaign_type, campaign_id)
-
-        return self._operation(interface)
-
-    def get_campaign_ex(self, campaign_id, campaign_type='sp'):
-        """
-        Retrieves a campaign and its extended fields by ID. Note that this
-        call returns the complete set of campaign fields (including serving
-        status and other read-only fields), but is less efficient than
-        **getCampaign**.
-
-        :GET: {campaignType}/campaigns/extended/{campaignId}
-        :param campaign_id: The Id of the requested campaign.
-        :type campaign_id: string
-        :param campaign_type: The campaignType of the requested campaign ('sp' or 'sb')
-          Defaults to 'sp'
-        :type campaign_type: string
-        :returns:
-            :200: Campaign
-            :401: Unauthorized
-            :404: Campaign not found
-
-        """
-        interface = '{}/campaigns/extended/{}'. format(campaign_type, campaign_id)
-
-        return self._operation(interface)
-
-    def create_campaigns(self, data, campaign_type='sp'):
-        """
-        Creates one or more campaigns. Successfully created campaigns will be
-        assigned unique **campaignIds**.
-
-        :POST: /campaigns
-        :param data: A list of up to 100 campaigns to be created.  Required
-            fields for campaign creation are **name**, **campaignType**,
-            **targetingType**, **state**, **dailyBudget** and **startDate**.
-        :type data: List of **Campaign**
-        :returns:
-            :207: List of **CampaignResponse** reflecting the same order as the
-                input.
-            :401: Unauthorized
-        """
-        interface = '{}/campaigns'.format(campaign_type)
-        return self._operation(interface, data, method='POST')
-
-    def update_campaigns(self, data, campaign_type='sp'):
-        """
-        Updates one or more campaigns.  Campaigns are identified using their
-        **campaignIds**.
-
-        :PUT: /campaigns
-        :param data: A list of up to 100 updates containing **campaignIds** and
-            the mutable fields to be modified. Mutable fields are **name**,
-            **state**, **dailyBudget**, **startDate**, and **endDate**.
-        :type data: List of **Campaign**
-        :returns:
-            :207: List of **CampaignResponse** reflecting the same order as the
-                input
-            :401: Unauthorized
-        """
-        interface = '{}/campaigns'.format(campaign_type)
-        return self._operation(interface, data, method='PUT')
-
-    def get_campaigns(self, campaign_type='sp'):
-        """
-        Gets campaigns
-
-        :GET: /campaigns
-        :returns:
-            :207: List of **CampaignResponse**
-            :401: Unauthorized
-        """
-        interface = '{}/campaigns'.format(campaign_type)
-        return self._operation(interface)
-
-    def archive_campaign(self, campaign_id, campaign_type='sp'):
-        """
-        Sets the campaign status to archived. This same operation can be
-        performed via an update, but is included for completeness.
-
-        :DELETE: /campaigns/{campaignId}
-        :param campaign_id: The Id of the campaign to be archived.
-        :type campaign_id: string
-        :returns:
-            :200: Success, campaign response
-            :401: Unauthorized
-            :404: Campaign not found
-        """
-        interface = '{}/campaigns/{}'.format(campaign_type, campaign_id)
-        return self._operation(interface, method='DELETE')
-
-    def list_campaigns(self, data=None, campaign_type='sp'):
-        """
-        Retrieves a list of campaigns satisfying optional criteria.
-
-        :GET: /{campaignType}/campaigns
-        :param campaign_type: The campaignType to retrieve campaigns for ('sp' or 'hsa')
-          Defaults to 'sp'
-        :type campaign_type: string
-        :param data: Optional, search criteria containing the following
-            parameters.
-
-        data may contain the following optional parameters:
-
-        :param startIndex: 0-indexed record offset for the result set.
-            Defaults to 0.
-        :type startIndex: Integer
-        :param count: Number of records to include in the paged response.
-            Defaults to max page size.
-        :type count: Integer
-        :param campaignType: Restricts results to campaigns of a single
-            campaign type. Must be **sponsoredProducts**.
-        :type campaignType: String
-        :param stateFilter: Restricts results to campaigns with state within
-            the specified comma-separatedlist. Must be one of **enabled**,
-            **paused**, **archived**. Default behavior is to include all.
-        :param name: Restricts results to campaigns with the specified name.
-        :type name: String
-        :param campaignFilterId: Restricts results to campaigns specified in
-            comma-separated list.
-        :type campaignFilterId: String
-        :returns:
-            :200: Success. list of campaign
-            :401: Unauthorized
-        """
-        interface = '{}/campaigns' .format(campaign_type)
-
-        return self._operation(interface, data)
-
-    def list_campaigns_ex(self, data=None, campaign_type='sp'):
-        """
-        Retrieves a list of campaigns with extended fields satisfying
-        optional filtering criteria.
-
-        :GET: /{campaignType}/campaigns/extended
-        :param campaign_type: campaignType of the requested campaigns ('sp' or 'hsa')
-          Defaults to 'sp'
-        :type campaign_type: string
-        :param data: Optional, search criteria containing the following
-            parameters.
-        :type data: JSON string
-        """
-        interface = '{}/campaigns/extended' .format(campaign_type)
-        return self._operation(interface, data)
-
-    def get_ad_group(self, ad_group_id, campaign_type='sp'):
-        """
-        Retrieves an ad group by Id. Note that this call returns the minimal
-        set of ad group fields, but is more efficient than getAdGroupEx.
-
-        :GET: /sp/adGroups/{adGroupId}
-        :param ad_group_id: The Id of the requested ad group.
-        :type ad_group_id: string
-
-        :returns:
-            :200: Success, AdGroup response
-            :401: Unauthorized
-            :404: Ad group not found
-        """
-        interface = '{}/adGroups/{}'.format(campaign_type, ad_group_id)
-
-        return self._operation(interface)
-
-    def get_ad_group_ex(self, ad_group_id, campaign_type='sp'):
-        """
-        Retrieves an ad group and its extended fields by ID. Note that this
-        call returns the complete set of ad group fields (including serving
-        status and other read-only fields), but is less efficient than
-        getAdGroup.
-
-        :GET: /sp/adGroups/extended/{adGroupId}
-        :param ad_group_id: The Id of the requested ad group.
-        :type ad_group_id: string
-
-        :returns:
-            :200: Success, AdGroup response
-            :401: Unauthorized
-            :404: Ad group not found
-        """
-        interface = '{}/adGroups/extended/{}'.format(campaign_type, ad_group_id)
-        return self._operation(interface)
-
-    def create_ad_groups(self, data, campaign_type='sp'):
-        """
-        Creates one or more ad groups. Successfully created ad groups will
-        be assigned unique adGroupIds.
-
-        :POST: /adGroups
-        :param data: A list of up to 100 ad groups to be created. Required
-            fields for ad group creation are campaignId, name, state and
-            defaultBid.
-        :type data: List of **AdGroup**
-
-        :returns:
-            :207: Multi-status. List of AdGroupResponse reflecting the same
-                order as the input
-            :401: Unauthorized
-        """
-        interface = '{}/adGroups'.format(campaign_type)
-        return self._operation(interface, data, method='POST')
-
-    def update_ad_groups(self, data, campaign_type='sp'):
-        """
-        Updates one or more ad groups. Ad groups are identified using their
-        adGroupIds.
-
-        :PUT: /adGroups
-        :param data: A list of up to 100 updates containing adGroupIds and the
-            mutable fields to be modified.
-        :type data: List of **AdGroup**
-
-        :returns:
-            :207: Multi-status. List of AdGroupResponse reflecting the same
-                order as the input
-            :401: Unauthorized
-        """
-        interface = '{}/adGroups'.format(campaign_type)
-        return self._operation(interface, data, method='PUT')
-
-    def archive_ad_group(self, ad_group_id, campaign_type="sp"):
-        """
-        Sets the ad group status to archived. This same operation can be
-        performed via an update, but is included for completeness.
-
-        :DELETE: /adGroup/{adGroupId}
-        :param ad_group_id: The Id of the ad group to be archived.
-        :type ad_group_id: string
-
-        :returns:
-            :200: Success. AdGroupResponse
-            :401: Unauthorized
-            :404: Ad group not found
-        """
-        interface = '{}/adGroups/{}'.format(campaign_type, ad_group_id)
-        return self._operation(interface, method='DELETE')
-
-    def list_ad_groups(self, data=None, campaign_type="sp"):
-        """
-        Retrieves a list of ad groups satisfying optional criteria.
-
-        :GET: /sp/adGroups
-        :param data: Parameter list of criteria.
-
-        data may contain the following optional parameters:
-
-        :param startIndex: 0-indexed record offset for the result
-            set. Defaults to 0.
-        :type startIndex: integer
-        :param count: Number of records to include in the paged response.
-            Defaults to max page size.
-        :type count: integer
-        :param campaignType: Restricts results to ad groups belonging to
-            campaigns of the specified type. Must be sponsoredProducts
-        :type campaignType: string
-        :param campaignIdFilter: Restricts results to ad groups within
-            campaigns specified in comma-separated list.
-        :type campaignIdFilter: string
-        :param adGroupIdFilter: Restricts results to ad groups specified in
-            comma-separated list.
-        :type adGroupIdFilter: string
-        :param stateFilter: Restricts results to keywords with state within the
-            specified comma-separatedlist. Must be one of enabled, paused,
-            archived.  Default behavior is to include all.
-        :type stateFilter: string
-        :param name: Restricts results to ad groups with the specified name.
-        :type name: string
-
-        :returns:
-            :200: Success. List of adGroup.
-            :401: Unauthorized.
-
-        """
-        interface = '{}/adGroups'.format(campaign_type)
-
-        return self._operation(interface, data)
-
-    def list_ad_groups_ex(self, data=None, campaign_type="sp"):
-        """
-        Retrieves a list of ad groups satisfying optional criteria.
-
-        :GET: /sp/adGroups/extended
-        :param data: Parameter list of criteria.
-
-        data may contain the following optional parameters:
-
-        :param startIndex: 0-indexed record offset for the result
-            set. Defaults to 0.
-        :type startIndex: integer
-        :param count: Number of records to include in the paged response.
-            Defaults to max page size.
-        :type count: integer
-        :param campaignType: Restricts results to ad groups belonging to
-            campaigns of the specified type. Must be sponsoredProducts
-        :type campaignType: string
-        :param campaignIdFilter: Restricts results to ad groups within
-            campaigns specified in comma-separated list.
-        :type campaignIdFilter: string
-        :param adGroupIdFilter: Restricts results to ad groups specified in
-            comma-separated list.
-        :type adGroupIdFilter: string
-        :param stateFilter: Restricts results to keywords with state within the
-            specified comma-separatedlist. Must be one of enabled, paused,
-            archived.  Default behavior is to include all.
-        :type stateFilter: string
-        :param name: Restricts results to ad groups with the specified name.
-        :type name: string
-
-        :returns:
-            :200: Success. List of adGroup.
-            :401: Unauthorized.
-        """
-        interface = '{}/adGroups/extended'.format(campaign_type)
-        return self._operation(interface, data)
-
-    def get_target(self, target_id, campaign_type='sp'):
-        """
-        Retrieves an ad group by Id. Note that this call returns the minimal
-        set of ad group fields, but is more efficient than getAdGroupEx.
-
-        :GET: /sp/targets/{targetId}
-        :param target_id: The Id of the requested ad group.
-        :type target_id: string
-
-        :returns:
-            :200: Success, Target response
-            :401: Unauthorized
-            :404: Ad group not found
-        """
-        interface = '{}/targets/{}'.format(campaign_type, target_id)
-
-        return self._operation(interface)
-
-    def get_target_ex(self, target_id):
-        """
-        Retrieves a target and its extended fields by ID. Note that this
-        call returns the complete set of target fields (including serving
-        status and other read-only fields), but is less efficient than
-        getTarget.
-
-        :GET: /sp/targets/extended/{adGroupId}
-        :param target_id: The Id of the requested target.
-        :type target_id: string
-
-        :returns:
-            :200: Success, Target response
-            :401: Unauthorized
-            :404: Target not found
-        """
-        interface = 'sp/targets/extended/{}'.format(target_id)
-        return self._operation(interface)
-
-    def create_targets(self, data, campaign_type='sp'):
-        """
-        Creates one or more ad groups. Successfully created ad groups will
-        be assigned unique adGroupIds.
-
-        :POST: /targets
-        :param data: A list of up to 100 targets to be created.
-        :type data: List of **Target**
-
-        :returns:
-            :207: Multi-status. List of AdGroupResponse reflecting the same
-                order as the input
-            :401: Unauthorized
-        """
-        interface = '{}/targets'.format(campaign_type)
-
-        return self._operation(interface, data, method='POST')
-
-    def create_targets_list(self, data, campaign_type='sp'):
-        """
-        Creates many targets
-
-        :POST: /targets
-        :param data: A list of up to 100 targets to be created.
-        :type data: List of **Target**
-
-        :returns:
-            :207: Multi-status. List of AdGroupResponse reflecting the same
-                order as the input
-            :401: Unauthorized
-        """
-        interface = '{}/targets/list'.format(campaign_type)
-
-        # not tested
-        return self._operation(interface, data, method='POST')
-
-    def update_targets(self, data, campaign_type='sp'):
-        """
-        Updates one or more targets. Targets are identified using their
-        targetId.
-
-        :PUT: /targets
-        :param data: A list of up to 100 updates containing targetIds and the
-            mutable fields to be modified.
-        :type data: List of **Target**
-
-        :returns:
-            :207: Multi-status. List of Targets reflecting the same
-                order as the input
-            :401: Unauthorized
-        """
-        interface = '{}/targets'.format(campaign_type)
-
-        return self._operation(interface, data, method='PUT')
-
-    def archive_target(self, ad_group_id, campaign_type='sp'):
-        """
-        Sets the ad group status to archived. This same operation can be
-        performed via an update, but is included for completeness.
-
-        :DELETE: /targets/{targetId}
-        :param target_id: The Id of the ad group to be archived.
-        :type target_id: string
-
-        :returns:
-            :200: Success. TargetResponse
-            :401: Unauthorized
-            :404: Ad group not found
-        """
-        interface = '{}/targets/{}'.format(campaign_type, ad_group_id)
-        return self._operation(interface, method='DELETE')
-
-    def list_targets(self, data=None):
-        """
-        Retrieves a list of targets satisfying optional criteria.
-
-        :GET: /sp/targets
-        :param data: Parameter list of criteria.
-
-        data may contain the following optional parameters:
-
-        :param startIndex: 0-indexed record offset for the result
-            set. Defaults to 0.
-        :type startIndex: integer
-        :param count: Number of records to include in the paged response.
-            Defaults to max page size.
-        :type count: integer
-        :param expressionTypeFilter: Restricts results to targets
-            with expression types within the specified comma-separated list.
-            Possible filter types are: auto and manual
-        :type expressionTypeFilter: string
-        :param expressionTextFilter: Content of the targeting expression
-        :type expressionTextFilter: string
-        :param campaignIdFilter: Restricts results to ad groups within
-            campaigns specified in comma-separated list.
-        :type campaignIdFilter: string
-        :param adGroupIdFilter: Restricts results to ad groups specified in
-            comma-separated list.
-        :type adGroupIdFilter: string
-        :param stateFilter: Restricts results to targets with state within the
-            specified comma-separatedlist. Must be one of enabled, paused,
-            archived.  Default behavior is to include all.
-        :type stateFilter: string
-        :returns:
-            :200: Success. List of Targets.
-            :401: Unauthorized.
-        """
-        interface = 'sp/targets'
-        return self._operation(interface, data)
-
-    def list_targets_ex(self, data=None):
-        """
-        Retrieves a list of targets satisfying optional criteria.
-
-        :GET: /sp/targets/extended
-        :param data: Parameter list of criteria.
-
-        data may contain the following optional parameters:
-
-        :param startIndex: 0-indexed record offset for the result
-            set. Defaults to 0.
-        :type startIndex: integer
-        :param count: Number of records to include in the paged response.
-            Defaults to max page size.
-        :type count: integer
-        :param expressionTypeFilter: Restricts results to targets
-            with expression types within the specified comma-separated list.
-            Possible filter types are: auto and manual
-        :type expressionTypeFilter: string
-        :param expressionTextFilter: Content of the targeting expression
-        :type expressionTextFilter: string
-        :param campaignIdFilter: Restricts results to ad groups within
-            campaigns specified in comma-separated list.
-        :type campaignIdFilter: string
-        :param adGroupIdFilter: Restricts results to ad groups specified in
-            comma-separated list.
-        :type adGroupIdFilter: string
-        :param stateFilter: Restricts results to targets with state within the
-            specified comma-separatedlist. Must be one of enabled, paused,
-            archived.  Default behavior is to include all.
-        :type stateFilter: string
-        :returns:
-            :200: Success. List of Targets.
-            :401: Unauthorized.
-        """
-        interface = 'sp/targets/extended'
-        return self._operation(interface, data)
-
-    def get_negative_target(self, target_id, campaign_type='sb'):
-        """
-        Retrieves an ad group by Id. Note that this call returns the minimal
-        set of ad group fields, but is more efficient than getAdGroupEx.
-
-        :GET: /sp/negativeTargets/{targetId}
-        :param target_id: The Id of the requested ad group.
-        :type target_id: string
-
-        :returns:
-            :200: Success, Target response
-            :401: Unauthorized
-            :404: Ad group not found
-        """
-        interface = '{}/negativeTargets/{}'.format(campaign_type, target_id)
-
-        return self._operation(interface)
-
-    def get_negative_target_ex(self, target_id):
-        """
-        Retrieves a target and its extended fields by ID. Note that this
-        call returns the complete set of target fields (including serving
-        status and other read-only fields), but is less efficient than
-        getTarget.
-
-        :GET: /sp/negativeTargets/extended/{adGroupId}
-        :param target_id: The Id of the requested target.
-        :type target_id: string
-
-        :returns:
-            :200: Success, Target response
-            :401: Unauthorized
-            :404: Target not found
-        """
-        interface = 'sp/negativeTargets/extended/{}'.format(target_id)
-        return self._operation(interface)
-
-    def create_negative_targets(self, data, campaign_type='sp'):
-        """
-        Creates one or more ad groups. Successfully created ad groups will
-        be assigned unique adGroupIds.
-
-        :POST: /negativeTargets
-        :param data: A list of up to 100 negativeTargets to be created.
-        :type data: List of **Target**
-
-        :returns:
-            :207: Multi-status. List of AdGroupResponse reflecting the same
-                order as the input
-            :401: Unauthorized
-        """
-        interface = '{}/negativeTargets'.format(campaign_type)
-
-        return self._operation(interface, data, method='POST')
-
-    def create_negative_targets_list(self, data, campaign_type='sb'):
-        """
-        Creates list of targets
-
-        :POST: /negativeTargets/list
-        :param data: A list of negativeTargets to be created.
-        :type data: List of **Target**
-
-        :returns:
-            :207: Multi-status. List of AdGroupResponse reflecting the same
-                order as the input
-            :401: Unauthorized
-        """
-        interface = '{}/negativeTargets/list'.format(campaign_type)
-
-        return self._operation(interface, data, method='POST')
-
-    def update_negative_targets(self, data, campaign_type='sp'):
-        """
-        Updates one or more negativeTargets. negativeTargets are identified using their
-        targetId.
-
-        :PUT: /negativeTargets
-        :param data: A list of up to 100 updates containing targetIds and the
-            mutable fields to be modified.
-        :type data: List of **Target**
-
-        :returns:
-            :207: Multi-status. List of negativeTargets reflecting the same
-                order as the input
-            :401: Unauthorized
-        """
-        interface = '{}/negativeTargets'.format(campaign_type)
-        return self._operation(interface, data, method='PUT')
-
-    def archive_negative_target(self, ad_group_id, campaign_type='sp'):
-        """
-        Sets the ad group status to archived. This same operation can be
-        performed via an update, but is included for completeness.
-
-        :DELETE: /negativeTargets/{targetId}
-        :param target_id: The Id of the ad group to be archived.
-        :type target_id: string
-
-        :returns:
-            :200: Success. TargetResponse
-            :401: Unauthorized
-            :404: Ad group not found
-        """
-        interface = '{}/negativeTargets/{}'.format(campaign_type, ad_group_id)
-        return self._operation(interface, method='DELETE')
-
-    def list_negative_targets(self, data=None):
-        """
-        Retrieves a list of negativeTargets satisfying optional criteria.
-
-        :GET: /sp/negativeTargets
-        :param data: Parameter list of criteria.
-
-        data may contain the following optional parameters:
-
-        :param startIndex: 0-indexed record offset for the result
-            set. Defaults to 0.
-        :type startIndex: integer
-        :param count: Number of records to include in the paged response.
-            Defaults to max page size.
-        :type count: integer
-        :param expressionTypeFilter: Restricts results to negativeTargets
-            with expression types within the specified comma-separated list.
-            Possible filter types are: auto and manual
-        :type expressionTypeFilter: string
-        :param expressionTextFilter: Content of the targeting expression
-        :type expressionTextFilter: string
-        :param campaignIdFilter: Restricts results to ad groups within
-            campaigns specified in comma-separated list.
-        :type campaignIdFilter: string
-        :param adGroupIdFilter: Restricts results to ad groups specified in
-            comma-separated list.
-        :type adGroupIdFilter: string
-        :param stateFilter: Restricts results to negativeTargets with state within the
-            specified comma-separatedlist. Must be one of enabled, paused,
-            archived.  Default behavior is to include all.
-        :type stateFilter: string
-        :returns:
-            :200: Success. List of negativeTargets.
-            :401: Unauthorized.
-        """
-        interface = 'sp/negativeTargets'
-        return self._operation(interface, data)
-
-    def list_negative_targets_ex(self, data=None):
-        """
-        Retrieves a list of negativeTargets satisfying optional criteria.
-
-        :GET: /sp/negativeTargets/extended
-        :param data: Parameter list of criteria.
-
-        data may contain the following optional parameters:
-
-        :param startIndex: 0-indexed record offset for the result
-            set. Defaults to 0.
-        :type startIndex: integer
-        :param count: Number of records to include in the paged response.
-            Defaults to max page size.
-        :type count: integer
-        :param expressionTypeFilter: Restricts results to negativeTargets
-            with expression types within the specified comma-separated list.
-            Possible filter types are: auto and manual
-        :type expressionTypeFilter: string
-        :param expressionTextFilter: Content of the targeting expression
-        :type expressionTextFilter: string
-        :param campaignIdFilter: Restricts results to ad groups within
-            campaigns specified in comma-separated list.
-        :type campaignIdFilter: string
-        :param adGroupIdFilter: Restricts results to ad groups specified in
-            comma-separated list.
-        :type adGroupIdFilter: string
-        :param stateFilter: Restricts results to negativeTargets with state within the
-            specified comma-separatedlist. Must be one of enabled, paused,
-            archived.  Default behavior is to include all.
-        :type stateFilter: string
-        :returns:
-            :200: Success. List of negativeTargets.
-            :401: Unauthorized.
-        """
-        interface = 'sp/negativeTargets/extended'
-        return self._operation(interface, data)
-
-    def get_biddable_keyword(self, keyword_id, campaign_type='sp'):
-        """
-        Retrieves a keyword by ID. Note that this call returns the minimal set
-        of keyword fields, but is more efficient than getBiddableKeywordEx.
-
-        :GET: /{campaignType}/keywords/{keywordId}
-        :param keyword_id: The Id of the requested keyword.
-        :type keyword_id: string
-        :param campaign_type: The campaignType for the requested keyword
-          Defaults to 'sp'
-        :type campaign_type: string
-
-        :returns:
-            :200: Success. Keyword.
-            :401: Unauthorized.
-            :404: Keyword not found.
-        """
-        interface = '{}/keywords/{}'.format(campaign_type, keyword_id)
-
-        return self._operation(interface)
-
-    def get_biddable_keyword_ex(self, keyword_id):
-        """
-        Retrieves a keyword and its extended fields by ID. Note that this call
-        returns the complete set of keyword fields (including serving status
-        and other read-only fields), but is less efficient than
-        getBiddableKeyword.
-
-        :GET: /keywords/extended/{keywordId}
-        :param keyword_id: The Id of the requested keyword.
-        :type keyword_id: string
-
-        :returns:
-            :200: Success. Keyword.
-            :401: Unauthorized.
-            :404: Keyword not found.
-        """
-        interface = 'sp/keywords/extended/{}'.format(keyword_id)
-        return self._operation(interface)
-
-    def create_biddable_keywords(self, data, campaign_type='sp'):
-        """
-        Creates one or more keywords. Successfully created keywords will be
-        assigned unique keywordIds.
-
-        :POST: /keywords
-        :param data: A list of up to 1000 keywords to be created. Required
-            fields for keyword creation are campaignId, adGroupId, keywordText,
-            matchType and state.
-        :type data: List of **Keyword**
-        """
-        interface = '{}/keywords'.format(campaign_type)
-
-        return self._operation(interface, data)
-
-    def update_biddable_keywords(self, data, campaign_type='sp'):
-        interface = '{}/keywords'.format(campaign_type)
-        return self._operation(interface, data, method='PUT')
-
-    def archive_biddable_keyword(self, keyword_id, campaign_type='sp'):
-        interface = '{}/keywords/{}'.format(campaign_type, keyword_id)
-        return self._operation(interface, method='DELETE')
-
-    def list_biddable_keywords(self, data=None, campaign_type='sp'):
-        interface = '{}/keywords'.format(campaign_type)
-        return self._operation(interface, data)
-
-    def list_biddable_keywords_ex(self, data=None):
-        interface = 'sp/keywords/extended'
-        return self._operation(interface, data)
-
-    def get_negative_keyword(self, negative_keyword_id, campaign_type='sp'):
-        interface = '{}/negativeKeywords/{}'.format(campaign_type, negative_keyword_id)
-        return self._operation(interface)
-
-    def get_negative_keyword_ex(self, negative_keyword_id):
-        interface = 'sp/negativeKeywords/extended/{}'.format(negative_keyword_id)
-        return self._operation(interface)
-
-    def create_negative_keywords(self, data, campaign_type="sp"):
-        interface = '{}/negativeKeywords'.format(campaign_type)
-
-        return self._operation(interface, data, method='POST')
-
-    def update_negative_keywords(self, data, campaign_type='sp'):
-        interface = '{}/negativeKeywords'.format(campaign_type)
-        return self._operation(interface, data, method='PUT')
-
-    def archive_negative_keyword(self, negative_keyword_id, campaign_type='sp'):
-        interface = '{}/negativeKeywords/{}'.format(campaign_type, negative_keyword_id)
-        return self._operation(interface, method='DELETE')
-
-    def list_negative_keywords(self, data=None, campaign_type='sp'):
-        interface = '{}/negativeKeywords'.format(campaign_type)
-        return self._operation(interface, data)
-
-    def list_negative_keywords_ex(self, data=None):
-        interface = 'sp/negativeKeywords/extended'
-        return self._operation(interface, data)
-
-    def get_campaign_negative_keyword(self, campaign_negative_keyword_id):
-        interface = 'sp/campaignNegativeKeywords/{}'.format(
-            campaign_negative_keyword_id)
-        return self._operation(interface)
-
-    def get_campaign_negative_keyword_ex(self, campaign_negative_keyword_id):
-        interface = 'sp/campaignNegativeKeywords/extended/{}'.format(
-            campaign_negative_keyword_id)
-        return self._operation(interface)
-
-    def create_campaign_negative_keywords(self, data):
-        interface = 'campaignNegativeKeywords'
-        return self._operation(interface, data, method='POST')
-
-    def update_campaign_negative_keywords(self, data):
-        interface = 'campaignNegativeKeywords'
-        return self._operation(interface, data, method='PUT')
-
-    def remove_campaign_negative_keyword(self, campaign_negative_keyword_id):
-        interface = 'campaignNegativeKeywords/{}'.format(
-            campaign_negative_keyword_id)
-        return self._operation(interface, method='DELETE')
-
-    def list_campaign_negative_keywords(self, data=None):
-        interface = 'sp/campaignNegativeKeywords'
-        return self._operation(interface, data)
-
-    def list_campaign_negative_keywords_ex(self, data=None):
-        interface = 'sp/campaignNegativeKeywords/extended'
-        return self._operation(interface, data)
-
-    def get_product_ad(self, product_ad_id):
-        interface = 'sp/productAds/{}'.format(product_ad_id)
-        return self._operation(interface)
-
-    def get_product_ad_ex(self, product_ad_id):
-        interface = 'sp/productAds/extended/{}'.format(product_ad_id)
-        return self._operation(interface)
-
-    def create_product_ads(self, data):
-        interface = 'productAds'
-        return self._operation(interface, data, method='POST')
-
-    def update_product_ads(self, data):
-        interface = 'productAds'
-        return self._operation(interface, data, method='PUT')
-
     def archive_product_ads(self):
         pass
 
-    def list_product_ads(self, data=None, campaign_type="sp"):
-        interface = '{}/productAds'.format(campaign_type)
-        return self._operation(interface, data)
-
-    def list_product_ads_ex(self, data=None, campaign_type="sp"):
-        interface = '{}/productAds/extended'.format(campaign_type)
-        return self._operation(interface, data)
-
-    def create_keyword_recommendations(self, data, campaign_type='sp'):
-        interface = '{}/recommendations/keyword'.format(campaign_type)
-
-        return self._operation(interface, data, method='POST')
-
     def request_snapshot(self, record_type=None, snapshot_id=None, data=None, campaign_type='sp'):
         """
         :POST: /snapshots
@@ -1075,29 +327,49 @@ class AdvertisingApi(object):
                     'code': 0,
                     'response': 'record_type and report_id are both empty.'}
 
-    def get_report(self, report_id):
+    def get_report(self, report_id, stream=False, path=None):
+        """
+        Downloads a report once it is ready.
+
+        :param report_id: The Id of the requested report.
+        :type report_id: string
+        :param stream: Yield the report rows as they are decompressed and
+            parsed rather than returning a list.
+        :type stream: boolean
+        :param path: Save the raw gzipped report to this path instead.
+        :type path: string
+        :returns: The status result while the report is pending, otherwise
+            the download result.
+        """
         interface = 'reports/{}'.format(report_id)
         res = self._operation(interface)
         if res['success']:
-            body = json.loads(res['response'])
+            body = response_body(res)
             if body.get('status') == 'SUCCESS':
-                res = self._download(location=body['location'])
+                res = self._download(location=body['location'], stream=stream,
+                                     path=path)
         return res
 
-    def get_snapshot(self, snapshot_id):
+    def get_snapshot(self, snapshot_id, stream=False, path=None):
+        """
+        Downloads a snapshot once it is ready.
+
+        :param snapshot_id: The Id of the requested snapshot.
+        :type snapshot_id: string
+        :param stream: Yield the snapshot entities as they are decompressed
+            and parsed rather than returning a list.
+        :type stream: boolean
+        :param path: Save the raw gzipped snapshot to this path instead.
+        :type path: string
+        """
         interface = 'snapshots/{}'.format(snapshot_id)
         res = self._operation(interface)
-        if json.loads(res['response'])['status'] == 'SUCCESS':
-            res = self._download(
-                location=json.loads(res['response'])['location'])
-            return res
-        else:
-            return res
-
-    def get_ad_group_bid_recommendations(self, ad_group_id):
-        """Request bid recommendations for specified ad group."""
-        interface = 'adGroups/{}/bidRecommendations'.format(ad_group_id)
-        return self._operation(interface)
+        if res['success']:
+            body = response_body(res)
+            if body.get('status') == 'SUCCESS':
+                res = self._download(location=body['location'], stream=stream,
+                                     path=path)
+        return res
 
     def get_keyword_bid_recommendations(self, keyword_id=None, keyword_data=None):
         """
@@ -1111,11 +383,95 @@ class AdvertisingApi(object):
         ```
         int adGroupId: []
         ```
+
+        :param keyword_id: Id of a single keyword.
+        :type keyword_id: integer
+        :param keyword_data: ``{'adGroupId': ..., 'keywords': [{'keyword':
+            ..., 'matchType': ...}, ...]}``.
+        :type keyword_data: dictionary
         """
-        pass
+        if keyword_id is not None:
+            interface = 'keywords/{}/bidRecommendations'.format(keyword_id)
+            return self._operation(interface)
+        elif keyword_data is not None:
+            interface = 'keywords/bidRecommendations'
+            return self._operation(interface, keyword_data, method='POST')
+        else:
+            return {'success': False,
+                    'code': 0,
+                    'response': 'keyword_id and keyword_data are both empty.'}
+
+    def get_bulk_keyword_bid_recommendations(self, keywords, chunk_size=KEYWORD_BID_LIMIT,
+                                             max_workers=8):
+        """
+        Requests bid recommendations for any number of keywords, across
+        ad groups, in concurrent batches of up to 100.
+
+        :param keywords: Keywords with keywordId, adGroupId, keywordText
+            and matchType, e.g. from iter_biddable_keywords.
+        :type keywords: list
+        :param chunk_size: Maximum keywords per request.
+        :type chunk_size: integer
+        :param max_workers: Maximum requests in flight.
+        :type max_workers: integer
+        :returns: result whose **response** maps each keywordId to its
+            recommendation.
+        """
+        recommender = KeywordBidRecommender(self, chunk_size=chunk_size, max_workers=max_workers)
+        return recommender.run(keywords)
 
-    def _download(self, location):
-        headers = {'Authorization': 'Bearer {}'.format(self._access_token),
+    def bulk_mutate(self, method, data, chunk_size=DEFAULT_CHUNK_SIZE, max_workers=4, **kwargs):
+        """
+        Sends a large create or update in API-sized chunks, concurrently.
+
+        :param method: Name of the bulk method, e.g. 'update_biddable_keywords'.
+        :type method: string
+        :param data: Items to create or update, any number of them.
+        :type data: list
+        :param chunk_size: Maximum items per request.
+        :type chunk_size: integer
+        :param max_workers: Maximum requests in flight.
+        :type max_workers: integer
+        :returns: dictionary with the item responses merged in input order.
+            See BulkMutator.run.
+        """
+        mutator = BulkMutator(self, chunk_size=chunk_size, max_workers=max_workers)
+        return mutator.run(method, data, **kwargs)
+
+    def _iter_pages(self, list_method, data, page_size, prefetch, model=None, **kwargs):
+        """
+        Yields the entities of a paged list method one at a time. Pages are
+        requested under the deadline in effect while iterating.
+
+        :param model: Optional model class from models.py, e.g. Keyword, to
+            yield entities as instead of dictionaries.
+        :raises AdvertisingApiError: when a page request fails.
+        """
+        def fetch(params):
+            return list_method(params, **kwargs)
+        return iter_pages(fetch, data, page_size=page_size, prefetch=prefetch, model=model)
+
+    def _download(self, location, stream=False, path=None):
+        """
+        Downloads a gzipped report or snapshot. The 307 redirect to the
+        storage host is followed here, and both requests go through the
+        connection pool.
+
+        :param location: The location returned by the report or snapshot
+            status call.
+        :type location: string
+        :param stream: Return the rows as a generator that decompresses and
+            parses the body chunk by chunk instead of as a list.
+        :type stream: boolean
+        :param path: Write the raw gzipped body to this file path without
+            decoding it. The response is then the path.
+        :type path: string
+        """
+        try:
+            access_token = self.access_token
+        except AdvertisingApiError as e:
+            return e.result
+        headers = {'Authorization': 'Bearer {}'.format(access_token),
                    'Content-Type': 'application/json',
                    'User-Agent': self.user_agent}
 
@@ -1124,35 +480,65 @@ class AdvertisingApi(object):
         else:
             raise ValueError('Invalid profile Id.')
 
-        opener = urllib.request.build_opener(NoRedirectHandler())
-        urllib.request.install_opener(opener)
-        req = urllib.request.Request(url=location, headers=headers, data=None)
-        try:
-            response = urllib.request.urlopen(req)
-            if 'location' in response:
-                if response['location'] is not None:
-                    req = urllib.request.Request(url=response['location'])
-                    res = urllib.request.urlopen(req)
-                    res_data = res.read()
-                    buf = BytesIO(res_data)
-                    f = gzip.GzipFile(fileobj=buf)
-                    data = f.read()
-                    return {'success': True,
-                            'code': res.code,
-                            'api_version': versions["api_version"],
-                            'response': json.loads(data.decode('utf-8'))}
-                else:
-                    return {'success': False,
-                            'code': response.code,
-                            'response': 'Location is empty.'}
-            else:
+        event = self._start_event('download', self._download_interface(location), 'GET', location)
+
+        def send():
+            req = urllib.request.Request(url=location, headers=headers, data=None)
+            try:
+                response = self._urlopen(req)
+            except urllib.error.HTTPError as e:
+                record_response(event, e)
+                raise
+            # Drain the redirect so its connection goes back to the pool.
+            response.read()
+            record_response(event, response)
+            if response.code != 307:
                 return {'success': False,
                         'code': response.code,
-                        'response': 'Location not found.'}
+                        'response': 'Location not found.'}, None
+            if response.headers.get('Location') is None:
+                return {'success': False,
+                        'code': response.code,
+                        'response': 'Location is empty.'}, None
+            req = urllib.request.Request(url=urllib.parse.urljoin(location, response.headers['Location']))
+            try:
+                res = self.pool_manager.urlopen(req)
+            except urllib.error.HTTPError as e:
+                record_response(event, e)
+                raise
+            if path is not None:
+                with open(path, 'wb') as f:
+                    for chunk in iter_chunks(res):
+                        f.write(chunk)
+                data = path
+            elif stream:
+                data = iter_json_array(iter_gunzip(iter_chunks(res)))
+            else:
+                data = loads(gzip.decompress(res.read()))
+            if not stream:
+                record_response(event, res)
+            return {'success': True,
+                    'code': res.code,
+                    'api_version': versions["api_version"],
+                    'response': data}, res
+
+        try:
+            (result, res), retries = self._retry('GET', send)
         except urllib.error.HTTPError as e:
-            return {'success': False,
-                    'code': e.code,
-                    'response': '{msg}: {details}'.format(msg=e.msg, details=e.read())}
+            retries = getattr(e, 'retries', 0)
+            result = {'success': False,
+                      'code': e.code,
+                      'response': '{msg}: {details}'.format(msg=e.msg, details=e.read())}
+        except Exception as e:
+            self._finish_event(event, None, getattr(e, 'retries', 0), e)
+            raise
+        else:
+            if stream and res is not None and event is not None:
+                # Report the download once the caller has consumed the rows.
+                result['response'] = self._finish_stream(event, result, retries, res, result['response'])
+                return self._with_retries(result, retries)
+        self._finish_event(event, result, retries)
+        return self._with_retries(result, retries)
 
     def _operation(self, interface, params=None, method='GET'):
         """
@@ -1165,14 +551,229 @@ class AdvertisingApi(object):
         :param method: Call method. Should be either 'GET', 'PUT', or 'POST'
         :type method: string
         """
+        if method != 'GET':
+            if self.cache is None:
+                return self._request(interface, params, method)[0]
+            try:
+                return self._request(interface, params, method)[0]
+            finally:
+                self.cache.invalidate(self.profile_id, interface)
+
+        if self.single_flight is not None:
+            return self.single_flight.do(request_key(self.profile_id, interface, params),
+                                         lambda: self._get(interface, params))
+        return self._get(interface, params)
+
+    def _get(self, interface, params=None):
+        """Makes a GET call, through the cache if there is one."""
+        if self.cache is None:
+            return self._request(interface, params)[0]
+
+        generation = self.cache.generation(self.profile_id, interface)
+        result, etag = self.cache.get(self.profile_id, interface, params)
+        if result is not None:
+            return result
+        result, response_etag = self._request(interface, params, 'GET', etag)
+        if etag is not None and result['code'] == 304:
+            cached = self.cache.revalidated(self.profile_id, interface, params)
+            if cached is not None:
+                return cached
+            result, response_etag = self._request(interface, params)
+        self.cache.put(self.profile_id, interface, params, result, response_etag, generation)
+        return result
+
+    def _request(self, interface, params=None, method='GET', etag=None):
+        """
+        Sends an API call.
+
+        :param etag: ETag of a cached result to revalidate.
+        :returns: ``(result, etag)``, with the ETag of the response if any.
+        """
+        prepared = self._prepare_operation(interface, params, method)
+        if isinstance(prepared, dict):
+            return prepared, None
+        req, api_version = prepared
+        if etag is not None:
+            req.add_header('If-None-Match', etag)
+        event = self._start_event('operation', interface, method, req.full_url, req.data)
+
+        def send():
+            try:
+                f = self._urlopen(req)
+            except urllib.error.HTTPError as e:
+                record_response(event, e)
+                raise
+            response = f.read()
+            record_response(event, f)
+            return f.code, response, f.headers.get('ETag')
+
+        response_etag = None
+        try:
+            (code, response, response_etag), retries = self._retry(method, send)
+            result = self._success_result(code, response, api_version)
+
+        except urllib.error.HTTPError as e:
+            retries = getattr(e, 'retries', 0)
+            result = {'success': False,
+                      'api_version': api_version,
+                      'code': e.code,
+                      'response': '{msg}: {details}'.format(msg=e.msg, details=e.read())}
+        except Exception as e:
+            self._finish_event(event, None, getattr(e, 'retries', 0), e)
+            raise
+        self._finish_event(event, result, retries)
+        return self._with_retries(result, retries), response_etag
+
+    def _success_result(self, code, body, api_version):
+        """Builds the result of a successful call from the body bytes."""
+        if self.parse_responses:
+            return parsed_result(body, success=True, api_version=api_version, code=code)
+        return {'success': True,
+                'api_version': api_version,
+                'code': code,
+                'response': body.decode('utf-8')}
+
+    def _start_event(self, kind, interface, method, url, data=None):
+        """
+        Creates the hook event for a call and runs the before hooks.
+
+        :returns: the event, or None when the client has no hooks.
+        """
+        if not self.hooks:
+            return None
+        event = new_event(kind, interface, method, self.profile_id, url,
+                          len(data) if data else 0)
+        for hook in self.hooks:
+            hook.before_request(event)
+        return event
+
+    def _finish_event(self, event, result, retries=0, error=None):
+        """Completes **event** from the call's result and runs the after hooks."""
+        if event is None:
+            return
+        event['success'] = bool(result and result['success'])
+        event['retries'] = retries
+        if event['status'] is None:
+            event['status'] = result['code'] if result is not None else 0
+        event['error'] = error
+        event['timings']['total'] = time.perf_counter() - event.pop('_start')
+        for hook in self.hooks:
+            hook.after_request(event)
+
+    def _finish_stream(self, event, result, retries, response, rows):
+        """
+        Yields the streamed rows, then completes **event**; the after hooks
+        run once the rows have been consumed.
+        """
+        try:
+            for row in rows:
+                yield row
+        except Exception as e:
+            record_response(event, response)
+            self._finish_event(event, None, retries, e)
+            raise
+        record_response(event, response)
+        self._finish_event(event, result, retries)
+
+    def _download_interface(self, location):
+        """Returns the interface path of a download **location**."""
+        prefix = '{}/{}/'.format(base_url(self.endpoint), self.api_version)
+        if location.startswith(prefix):
+            return location[len(prefix):]
+        return urllib.parse.urlsplit(location).path.lstrip('/')
+
+    def _retry(self, method, send, idempotent=None):
+        """
+        Calls **send** until it returns or the retry policy gives up.
+
+        :returns: ``(value, retries)``. An exception that is not retried is
+            re-raised with a **retries** attribute.
+        """
+        retries = 0
+        while True:
+            try:
+                return send(), retries
+            except Exception as e:
+                delay = None
+                if self.retry_policy is not None:
+                    delay = self.retry_policy.next_delay(method, retries, e, idempotent)
+                if delay is None:
+                    e.retries = retries
+                    raise
+                try:
+                    check_deadline(delay)
+                except AdvertisingApiError as exceeded:
+                    exceeded.retries = retries
+                    raise exceeded from e
+                time.sleep(delay)
+                retries += 1
+
+    def _with_retries(self, result, retries):
+        if self.retry_policy is not None:
+            result['retries'] = retries
+        return result
+
+    def _urlopen(self, req):
+        """
+        Sends an API request. With a token manager, a 401 invalidates the
+        token that was used and the request is retried once with a fresh one.
+        """
+        try:
+            return self._send(req)
+        except urllib.error.HTTPError as e:
+            if e.code != 401 or self.token_manager is None:
+                raise
+            stale = req.get_header('Authorization')[len('Bearer '):]
+            self.token_manager.invalidate(stale)
+            try:
+                access_token = self.token_manager.get_token()
+            except AdvertisingApiError:
+                raise e
+            req.add_header('Authorization', 'Bearer {}'.format(access_token))
+            return self._send(req)
+
+    def _send(self, req):
+        """Sends a request, holding a slot of the request limit if there is one."""
+        if self.request_limit is None:
+            return self._throttled_send(req)
+        with self.request_limit:
+            return self._throttled_send(req)
+
+    def _throttled_send(self, req):
+        """Sends a request, throttled by the rate limiter if there is one."""
+        if self.rate_limiter is None:
+            return self.pool_manager.urlopen(req)
+
+        self.rate_limiter.acquire(self.profile_id, self.endpoint)
+        try:
+            f = self.pool_manager.urlopen(req)
+        except urllib.error.HTTPError as e:
+            self.rate_limiter.feedback(self.profile_id, self.endpoint, e.code,
+                                       e.headers.get('Retry-After'))
+            raise
+        self.rate_limiter.feedback(self.profile_id, self.endpoint, f.code)
+        return f
+
+    def _prepare_operation(self, interface, params=None, method='GET'):
+        """
+        Builds the request for an API call.
+
+        :returns: ``(request, api_version)``, or an error dictionary when the
+            call cannot be made.
+        """
         api_v3 = interface.startswith('sb')
 
-        if self._access_token is None:
+        try:
+            access_token = self.access_token
+        except AdvertisingApiError as e:
+            return e.result
+
+        if access_token is None:
             return {'success': False,
                     'code': 0,
                     'response': 'access_token is empty.'}
 
-        headers = {'Authorization': 'Bearer {}'.format(self._access_token),
+        headers = {'Authorization': 'Bearer {}'.format(access_token),
                    'Amazon-Advertising-API-ClientId': self.client_id,
                    'Content-Type': 'application/json',
                    'User-Agent': self.user_agent}
@@ -1187,7 +788,7 @@ class AdvertisingApi(object):
 
         data = None
 
-        url = f"https://{self.endpoint}/" + ("" if api_v3 else f"{self.api_version}/") + f"{interface}"
+        url = f"{base_url(self.endpoint)}/" + ("" if api_v3 else f"{self.api_version}/") + f"{interface}"
 
         if method == 'GET':
             if params is not None:
@@ -1198,7 +799,7 @@ class AdvertisingApi(object):
             url += '{params}'.format(params=p)
         else:
             if params is not None:
-                data = json.dumps(params).encode('utf-8')
+                data = json.dumps(params, default=encode_entity).encode('utf-8')
 
         if PYTHON == 3:
             req = urllib.request.Request(url=url, headers=headers, data=data)
@@ -1206,36 +807,7 @@ class AdvertisingApi(object):
             req = MethodRequest(url=url, headers=headers, data=data, method=method)
         req.method = method
 
-        try:
-            f = urllib.request.urlopen(req)
-            return {
-                'success': True,
-                'api_version': self.api_version if not api_v3 else versions['api_version_sb'],
-                'code': f.code,
-                'response': f.read().decode('utf-8')}
-
-        except urllib.error.HTTPError as e:
-            return {'success': False,
-                    'api_version': self.api_version if not api_v3 else versions['api_version_sb'],
-                    'code': e.code,
-                    'response': '{msg}: {details}'.format(msg=e.msg, details=e.read())}
-
-
-class NoRedirectHandler(urllib.request.HTTPErrorProcessor):
-    """Handles report and snapshot redirects."""
-
-    def http_response(self, request, response):
-        if response.code == 307:
-            if 'Location' in response.headers:
-                return {'code': 307,
-                        'location': response.headers['Location']}
-            else:
-                return {'code': response.code, 'location': None}
-        else:
-            return urllib.request.HTTPErrorProcessor.http_response(
-                self, request, response)
-
-    https_response = http_response
+        return req, self.api_version if not api_v3 else versions['api_version_sb']
 
 
 class MethodRequest(urllib.request.Request):
@@ -0,0 +1,393 @@
+from amazon_advertising_api.advertising_api import AdvertisingApi
+from amazon_advertising_api.async_transport import AsyncTransport
+from amazon_advertising_api.bulk import DEFAULT_CHUNK_SIZE, BulkMutator
+from amazon_advertising_api.cache import request_key
+from amazon_advertising_api.coalesce import AsyncSingleFlight
+from amazon_advertising_api.deadline import check_deadline
+from amazon_advertising_api.exceptions import AdvertisingApiError
+from amazon_advertising_api.instrumentation import record_response
+from amazon_advertising_api.jsonlib import loads, response_body
+from amazon_advertising_api.pagination import aiter_pages
+from amazon_advertising_api.recommendations import KEYWORD_BID_LIMIT, KeywordBidRecommender
+from amazon_advertising_api.streaming import aiter_chunks, aiter_gunzip, aiter_json_array
+from amazon_advertising_api.versions import versions
+import asyncio
+import gzip
+import urllib.error
+import urllib.parse
+import urllib.request
+
+
+class AsyncAdvertisingApi(AdvertisingApi):
+
+    """
+    asyncio flavour of :class:`AdvertisingApi`.
+
+    Every endpoint method returns an awaitable, e.g.
+    ``await api.list_campaigns()``. Requests share one non-blocking
+    keep-alive transport and at most ``max_concurrency`` of them are in
+    flight at once.
+    """
+
+    def __init__(self, *args, max_concurrency=50, transport=None, **kwargs):
+        """
+        Accepts the same arguments as :class:`AdvertisingApi`, plus:
+
+        :param max_concurrency: Maximum number of requests in flight.
+        :type max_concurrency: integer
+        :param transport: Optional AsyncTransport to share between clients.
+        :type transport: AsyncTransport
+        """
+        super(AsyncAdvertisingApi, self).__init__(*args, **kwargs)
+        if transport is None:
+            transport = AsyncTransport(maxsize=self.pool_manager.maxsize,
+                                       idle_timeout=self.pool_manager.idle_timeout,
+                                       connect_timeout=self.pool_manager.connect_timeout,
+                                       read_timeout=self.pool_manager.read_timeout,
+                                       proxies=self.pool_manager.proxies)
+        self.transport = transport
+        if self.single_flight is not None:
+            self.single_flight = AsyncSingleFlight()
+        self.max_concurrency = max_concurrency
+        self._semaphore = None
+
+    @property
+    def semaphore(self):
+        # Created lazily so it binds to the running event loop.
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def for_profile(self, profile_id, max_in_flight=None):
+        # Create the semaphore first so the copy shares the in-flight cap.
+        self.semaphore
+        return super(AsyncAdvertisingApi, self).for_profile(profile_id, max_in_flight)
+
+    @staticmethod
+    def _request_limit(max_in_flight):
+        return asyncio.Semaphore(max_in_flight)
+
+    def connection_stats(self):
+        return self.transport.stats()
+
+    async def _urlopen(self, req):
+        try:
+            return await self._send(req)
+        except urllib.error.HTTPError as e:
+            if e.code != 401 or self.token_manager is None:
+                raise
+            stale = req.get_header('Authorization')[len('Bearer '):]
+            self.token_manager.invalidate(stale)
+            try:
+                access_token = await self._get_token()
+            except AdvertisingApiError:
+                raise e
+            req.add_header('Authorization', 'Bearer {}'.format(access_token))
+            return await self._send(req)
+
+    async def _fetch(self, req, stream=False):
+        async with self.semaphore:
+            return await self.transport.urlopen(req, stream=stream)
+
+    async def _send(self, req):
+        """Sends an API request, holding a slot of the request limit if there is one."""
+        if self.request_limit is None:
+            return await self._throttled_send(req)
+        async with self.request_limit:
+            return await self._throttled_send(req)
+
+    async def _throttled_send(self, req):
+        """Sends an API request, throttled by the rate limiter if there is one."""
+        if self.rate_limiter is None:
+            return await self._fetch(req)
+
+        delay = self.rate_limiter.reserve(self.profile_id, self.endpoint)
+        if delay > 0:
+            check_deadline(delay)
+            await asyncio.sleep(delay)
+        try:
+            f = await self._fetch(req)
+        except urllib.error.HTTPError as e:
+            self.rate_limiter.feedback(self.profile_id, self.endpoint, e.code,
+                                       e.headers.get('Retry-After'))
+            raise
+        self.rate_limiter.feedback(self.profile_id, self.endpoint, f.code)
+        return f
+
+    async def _get_token(self):
+        """Fetches the managed token without blocking the event loop."""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self.token_manager.get_token)
+
+    async def do_refresh_token(self):
+        if self.token_manager is not None:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(None, self.token_manager.refresh)
+
+        req = self._prepare_refresh_token()
+        if isinstance(req, dict):
+            return req
+
+        async def send():
+            f = await self._fetch(req)
+            return f.code, (await f.read()).decode('utf-8')
+
+        try:
+            (code, response), retries = await self._retry('POST', send, idempotent=True)
+            result = self._refresh_token_result(code, response)
+        except urllib.error.HTTPError as e:
+            retries = getattr(e, 'retries', 0)
+            result = {'success': False,
+                      'code': e.code,
+                      'response': '{msg}: {details}'.format(msg=e.msg, details=e.read())}
+        return self._with_retries(result, retries)
+
+    async def request_snapshot(self, record_type=None, snapshot_id=None, data=None, campaign_type='sp'):
+        return await _awaitable(super(AsyncAdvertisingApi, self).request_snapshot(
+            record_type=record_type, snapshot_id=snapshot_id, data=data,
+            campaign_type=campaign_type))
+
+    async def request_report(self, record_type=None, report_id=None, data=None, campaign_type='sp'):
+        return await _awaitable(super(AsyncAdvertisingApi, self).request_report(
+            record_type=record_type, report_id=report_id, data=data,
+            campaign_type=campaign_type))
+
+    async def get_report(self, report_id, stream=False, path=None):
+        """
+        Like :meth:`AdvertisingApi.get_report`; with **stream** the response
+        is an async generator of rows, for use with ``async for``.
+        """
+        interface = 'reports/{}'.format(report_id)
+        res = await self._operation(interface)
+        if res['success']:
+            body = response_body(res)
+            if body.get('status') == 'SUCCESS':
+                res = await self._download(location=body['location'], stream=stream,
+                                           path=path)
+        return res
+
+    async def get_snapshot(self, snapshot_id, stream=False, path=None):
+        """
+        Like :meth:`AdvertisingApi.get_snapshot`; with **stream** the
+        response is an async generator of entities.
+        """
+        interface = 'snapshots/{}'.format(snapshot_id)
+        res = await self._operation(interface)
+        if res['success']:
+            body = response_body(res)
+            if body.get('status') == 'SUCCESS':
+                res = await self._download(location=body['location'], stream=stream,
+                                           path=path)
+        return res
+
+    async def get_keyword_bid_recommendations(self, keyword_id=None, keyword_data=None):
+        return await _awaitable(super(AsyncAdvertisingApi, self).get_keyword_bid_recommendations(
+            keyword_id=keyword_id, keyword_data=keyword_data))
+
+    async def get_bulk_keyword_bid_recommendations(self, keywords, chunk_size=KEYWORD_BID_LIMIT,
+                                                   max_workers=8):
+        recommender = KeywordBidRecommender(self, chunk_size=chunk_size, max_workers=max_workers)
+        return await recommender.arun(keywords)
+
+    async def bulk_mutate(self, method, data, chunk_size=DEFAULT_CHUNK_SIZE, max_workers=4, **kwargs):
+        mutator = BulkMutator(self, chunk_size=chunk_size, max_workers=max_workers)
+        return await mutator.arun(method, data, **kwargs)
+
+    def _iter_pages(self, list_method, data, page_size, prefetch, model=None, **kwargs):
+        """Async generator version; use with ``async for``."""
+        def fetch(params):
+            return list_method(params, **kwargs)
+        return aiter_pages(fetch, data, page_size=page_size, prefetch=prefetch, model=model)
+
+    async def _download(self, location, stream=False, path=None):
+        if self.token_manager is not None:
+            try:
+                await self._get_token()
+            except AdvertisingApiError as e:
+                return e.result
+        headers = {'Authorization': 'Bearer {}'.format(self.access_token),
+                   'Content-Type': 'application/json',
+                   'User-Agent': self.user_agent}
+
+        if self.profile_id is not None:
+            headers['Amazon-Advertising-API-Scope'] = self.profile_id
+        else:
+            raise ValueError('Invalid profile Id.')
+
+        event = self._start_event('download', self._download_interface(location), 'GET', location)
+
+        async def send():
+            req = urllib.request.Request(url=location, headers=headers, data=None)
+            try:
+                response = await self._urlopen(req)
+            except urllib.error.HTTPError as e:
+                record_response(event, e)
+                raise
+            record_response(event, response)
+            if response.code != 307:
+                return {'success': False,
+                        'code': response.code,
+                        'response': 'Location not found.'}, None
+            if response.headers.get('Location') is None:
+                return {'success': False,
+                        'code': response.code,
+                        'response': 'Location is empty.'}, None
+            req = urllib.request.Request(url=urllib.parse.urljoin(location, response.headers['Location']))
+            try:
+                res = await self._fetch(req, stream=stream or path is not None)
+            except urllib.error.HTTPError as e:
+                record_response(event, e)
+                raise
+            if path is not None:
+                with open(path, 'wb') as f:
+                    async for chunk in aiter_chunks(res):
+                        f.write(chunk)
+                data = path
+            elif stream:
+                data = aiter_json_array(aiter_gunzip(aiter_chunks(res)))
+            else:
+                data = loads(gzip.decompress(await res.read()))
+            if not stream:
+                record_response(event, res)
+            return {'success': True,
+                    'code': res.code,
+                    'api_version': versions["api_version"],
+                    'response': data}, res
+
+        try:
+            (result, res), retries = await self._retry('GET', send)
+        except urllib.error.HTTPError as e:
+            retries = getattr(e, 'retries', 0)
+            result = {'success': False,
+                      'code': e.code,
+                      'response': '{msg}: {details}'.format(msg=e.msg, details=e.read())}
+        except Exception as e:
+            self._finish_event(event, None, getattr(e, 'retries', 0), e)
+            raise
+        else:
+            if stream and res is not None and event is not None:
+                # Report the download once the caller has consumed the rows.
+                result['response'] = self._finish_stream(event, result, retries, res, result['response'])
+                return self._with_retries(result, retries)
+        self._finish_event(event, result, retries)
+        return self._with_retries(result, retries)
+
+    async def _finish_stream(self, event, result, retries, response, rows):
+        try:
+            async for row in rows:
+                yield row
+        except Exception as e:
+            record_response(event, response)
+            self._finish_event(event, None, retries, e)
+            raise
+        record_response(event, response)
+        self._finish_event(event, result, retries)
+
+    async def _operation(self, interface, params=None, method='GET'):
+        if method != 'GET':
+            if self.cache is None:
+                return (await self._request(interface, params, method))[0]
+            try:
+                return (await self._request(interface, params, method))[0]
+            finally:
+                self.cache.invalidate(self.profile_id, interface)
+
+        if self.single_flight is not None:
+            return await self.single_flight.do(request_key(self.profile_id, interface, params),
+                                               lambda: self._get(interface, params))
+        return await self._get(interface, params)
+
+    async def _get(self, interface, params=None):
+        if self.cache is None:
+            return (await self._request(interface, params))[0]
+
+        generation = self.cache.generation(self.profile_id, interface)
+        result, etag = self.cache.get(self.profile_id, interface, params)
+        if result is not None:
+            return result
+        result, response_etag = await self._request(interface, params, 'GET', etag)
+        if etag is not None and result['code'] == 304:
+            cached = self.cache.revalidated(self.profile_id, interface, params)
+            if cached is not None:
+                return cached
+            result, response_etag = await self._request(interface, params)
+        self.cache.put(self.profile_id, interface, params, result, response_etag, generation)
+        return result
+
+    async def _request(self, interface, params=None, method='GET', etag=None):
+        if self.token_manager is not None:
+            # Warm the token off the loop so _prepare_operation never blocks.
+            try:
+                await self._get_token()
+            except AdvertisingApiError as e:
+                return e.result, None
+        prepared = self._prepare_operation(interface, params, method)
+        if isinstance(prepared, dict):
+            return prepared, None
+        req, api_version = prepared
+        if etag is not None:
+            req.add_header('If-None-Match', etag)
+        event = self._start_event('operation', interface, method, req.full_url, req.data)
+
+        async def send():
+            try:
+                f = await self._urlopen(req)
+            except urllib.error.HTTPError as e:
+                record_response(event, e)
+                raise
+            record_response(event, f)
+            return f.code, await f.read(), f.headers.get('ETag')
+
+        response_etag = None
+        try:
+            (code, response, response_etag), retries = await self._retry(method, send)
+            result = self._success_result(code, response, api_version)
+
+        except urllib.error.HTTPError as e:
+            retries = getattr(e, 'retries', 0)
+            result = {'success': False,
+                      'api_version': api_version,
+                      'code': e.code,
+                      'response': '{msg}: {details}'.format(msg=e.msg, details=e.read())}
+        except Exception as e:
+            self._finish_event(event, None, getattr(e, 'retries', 0), e)
+            raise
+        self._finish_event(event, result, retries)
+        return self._with_retries(result, retries), response_etag
+
+    async def _retry(self, method, send, idempotent=None):
+        retries = 0
+        while True:
+            try:
+                return await send(), retries
+            except Exception as e:
+                delay = None
+                if self.retry_policy is not None:
+                    delay = self.retry_policy.next_delay(method, retries, e, idempotent)
+                if delay is None:
+                    e.retries = retries
+                    raise
+                try:
+                    check_deadline(delay)
+                except AdvertisingApiError as exceeded:
+                    exceeded.retries = retries
+                    raise exceeded from e
+                await asyncio.sleep(delay)
+                retries += 1
+
+    async def aclose(self):
+        """Closes the idle connections held by the transport."""
+        self.transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+
+async def _awaitable(result):
+    """Awaits coroutines, passes plain error dictionaries through."""
+    if asyncio.iscoroutine(result):
+        return await result
+    return result
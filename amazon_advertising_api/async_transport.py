@@ -0,0 +1,518 @@
+"""Non-blocking HTTP/1.1 keep-alive transport built on asyncio streams."""
+from amazon_advertising_api.connection_pool import (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT,
+                                                     IDEMPOTENT_METHODS, get_proxy, new_timings)
+from amazon_advertising_api.deadline import current_deadline
+from amazon_advertising_api.exceptions import DeadlineExceeded
+import asyncio
+import http.client
+import socket
+import ssl
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from io import BytesIO
+
+# Largest piece of a body read under one read timeout.
+READ_CHUNK = 64 * 1024
+
+
+class AsyncResponse(object):
+    """
+    Fully read response returned by :meth:`AsyncTransport.urlopen`.
+
+    Exposes ``code``, ``reason``, ``headers``, ``timings`` and ``read()``
+    like the synchronous responses, except that ``read`` is a coroutine.
+    """
+
+    def __init__(self, url, status, reason, headers, body, timings=None):
+        self.url = url
+        self.code = status
+        self.status = status
+        self.reason = reason
+        self.msg = reason
+        self.headers = headers
+        self.body = body
+        self.timings = timings or new_timings()
+        self.bytes_received = len(body)
+
+    async def read(self):
+        return self.body
+
+
+class AsyncStreamingResponse(object):
+    """
+    Response returned by :meth:`AsyncTransport.urlopen` with **stream** set.
+
+    The body is read from the connection by ``await read(amt)``, each read
+    bounded by the read timeout; the connection goes back to its pool once
+    the body has been read to the end, or is dropped by ``close()``.
+    """
+
+    def __init__(self, url, status, reason, headers, body, timings):
+        self.url = url
+        self.code = status
+        self.status = status
+        self.reason = reason
+        self.msg = reason
+        self.headers = headers
+        self.timings = timings
+        self._body = body
+
+    @property
+    def bytes_received(self):
+        return self._body.bytes_received
+
+    async def read(self, amt=None):
+        return await self._body.read(amt)
+
+    def close(self):
+        self._body.close()
+
+
+async def _wait(coro, timeout):
+    if timeout is None:
+        return await coro
+    return await asyncio.wait_for(coro, timeout)
+
+
+class _AsyncConnection(object):
+
+    def __init__(self, reader, writer, timings=None):
+        self.reader = reader
+        self.writer = writer
+        self.last_used = time.monotonic()
+        # Connection setup phases, reported with the first request only.
+        self.timings = timings
+
+    def close(self):
+        self.writer.close()
+
+
+class _AsyncBody(object):
+
+    """Reads a response body from its connection, piece by piece."""
+
+    def __init__(self, pool, conn, length, chunked, keep_alive, timings, deadline):
+        """
+        :param length: Bytes in the body, or None to read until the
+            connection closes; ignored when **chunked**.
+        """
+        self._pool = pool
+        self._conn = conn
+        self._length = length
+        self._chunked = chunked
+        self._chunk_left = 0
+        self._keep_alive = keep_alive
+        self._timings = timings
+        self._deadline = deadline
+        self.bytes_received = 0
+        if not chunked and length == 0:
+            self._release()
+
+    async def read(self, amt=None):
+        """Returns up to **amt** bytes, or the rest of the body; b'' at the end."""
+        if amt is None:
+            parts = []
+            while True:
+                data = await self.read(READ_CHUNK)
+                if not data:
+                    return b''.join(parts)
+                parts.append(data)
+        if self._conn is None:
+            return b''
+        start = time.perf_counter()
+        try:
+            data = await self._read(amt)
+        except BaseException as e:
+            self.close()
+            deadline = self._deadline
+            if isinstance(e, asyncio.TimeoutError) and deadline is not None and deadline.expired():
+                raise DeadlineExceeded(deadline.seconds) from e
+            raise
+        self._timings['read'] += time.perf_counter() - start
+        self.bytes_received += len(data)
+        return data
+
+    async def _read(self, amt):
+        pool, reader, deadline = self._pool, self._conn.reader, self._deadline
+        if self._chunked:
+            if self._chunk_left == 0:
+                size_line = await pool._readline(reader, deadline)
+                size = int(size_line.split(b';', 1)[0].strip(), 16)
+                if size == 0:
+                    # Trailers, terminated by an empty line.
+                    while (await pool._readline(reader, deadline)) != b'\r\n':
+                        pass
+                    self._release()
+                    return b''
+                self._chunk_left = size
+            data = await self._recv(min(amt, self._chunk_left))
+            self._chunk_left -= len(data)
+            if self._chunk_left == 0:
+                await pool._readexactly(reader, 2, deadline)
+            return data
+        if self._length is None:
+            data = await _wait(reader.read(amt), pool._read_timeout(deadline))
+            if not data:
+                self._release()
+            return data
+        data = await self._recv(min(amt, self._length))
+        self._length -= len(data)
+        if self._length == 0:
+            self._release()
+        return data
+
+    async def _recv(self, n):
+        data = await _wait(self._conn.reader.read(n), self._pool._read_timeout(self._deadline))
+        if not data:
+            raise asyncio.IncompleteReadError(b'', n)
+        return data
+
+    def _release(self):
+        conn, self._conn = self._conn, None
+        self._pool._put_conn(conn, reusable=self._keep_alive)
+
+    def close(self):
+        """Drops the connection unless the body has been read to the end."""
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self._pool._put_conn(conn, reusable=False)
+
+
+class AsyncConnectionPool(object):
+
+    """
+    Idle keep-alive stream connections to one scheme/host/port.
+
+    **connect_timeout** bounds opening a connection and **read_timeout**
+    each write and read on it, so slow but steady downloads keep going; use
+    a deadline to bound a whole call.
+    """
+
+    def __init__(self, scheme, host, port=None, maxsize=10, idle_timeout=60,
+                 ssl_context=None, connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout=DEFAULT_READ_TIMEOUT, proxy=None):
+        self.scheme = scheme
+        self.host = host
+        self.port = port or (443 if scheme == 'https' else 80)
+        self.proxy = proxy
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.ssl_context = ssl_context
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._idle = []
+        self._stats = {'requests': 0,
+                       'connections_created': 0,
+                       'connections_reused': 0,
+                       'connections_discarded': 0}
+
+    async def _new_conn(self):
+        ssl_context = None
+        if self.scheme == 'https':
+            ssl_context = self.ssl_context or ssl.create_default_context()
+        loop = asyncio.get_running_loop()
+        timings = {'dns': 0.0, 'connect': 0.0, 'tls': 0.0}
+
+        host, port = self.host, self.port
+        if self.proxy is not None:
+            host, port = self.proxy.host, self.proxy.port
+
+        start = time.perf_counter()
+        infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        resolved = time.perf_counter()
+        timings['dns'] = resolved - start
+
+        error = None
+        for family, socktype, proto, _, address in infos:
+            sock = socket.socket(family, socktype, proto)
+            sock.setblocking(False)
+            try:
+                await loop.sock_connect(sock, address)
+                break
+            except OSError as e:
+                error = e
+                sock.close()
+            except BaseException:
+                sock.close()
+                raise
+        else:
+            raise error or OSError('getaddrinfo returned no addresses')
+        if self.proxy is not None and ssl_context is not None:
+            try:
+                await self._tunnel(loop, sock)
+            except BaseException:
+                sock.close()
+                raise
+        connected = time.perf_counter()
+        timings['connect'] = connected - resolved
+
+        try:
+            reader, writer = await asyncio.open_connection(
+                sock=sock, ssl=ssl_context,
+                server_hostname=self.host if ssl_context is not None else None)
+        except BaseException:
+            sock.close()
+            raise
+        if ssl_context is not None:
+            timings['tls'] = time.perf_counter() - connected
+        self._stats['connections_created'] += 1
+        return _AsyncConnection(reader, writer, timings)
+
+    async def _tunnel(self, loop, sock):
+        """Asks the proxy for a CONNECT tunnel to the target host."""
+        target = '{}:{}'.format(self.host, self.port)
+        lines = ['CONNECT {} HTTP/1.1'.format(target), 'Host: {}'.format(target)]
+        lines.extend('{}: {}'.format(name, value) for name, value in self.proxy.headers.items())
+        await loop.sock_sendall(sock, ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        response = b''
+        while b'\r\n\r\n' not in response:
+            data = await loop.sock_recv(sock, 4096)
+            if not data:
+                raise ConnectionResetError('Proxy closed the connection during CONNECT')
+            response += data
+        status_line = response.split(b'\r\n', 1)[0].decode('latin-1')
+        parts = status_line.split(' ', 2)
+        if len(parts) < 2 or parts[1] != '200':
+            raise OSError('Tunnel connection failed: {}'.format(status_line))
+
+    async def _get_conn(self, timeout=None):
+        now = time.monotonic()
+        while self._idle:
+            conn = self._idle.pop()
+            if (self.idle_timeout is not None and now - conn.last_used > self.idle_timeout) \
+                    or conn.reader.at_eof():
+                self._stats['connections_discarded'] += 1
+                conn.close()
+                continue
+            self._stats['connections_reused'] += 1
+            return conn, True
+        return await _wait(self._new_conn(), timeout), False
+
+    def _put_conn(self, conn, reusable=True):
+        if reusable and len(self._idle) < self.maxsize:
+            conn.last_used = time.monotonic()
+            self._idle.append(conn)
+        else:
+            self._stats['connections_discarded'] += 1
+            conn.close()
+
+    async def urlopen(self, method, url, body=None, headers=None, stream=False):
+        """
+        Sends a request and reads the whole response, or only its headers
+        when **stream** is set.
+
+        Redirects are not followed. A request that fails on a reused
+        connection before the status line arrives is sent once more on a new
+        connection if its method is idempotent. Statuses of 400 and above raise
+        :class:`urllib.error.HTTPError`. Timeouts raise
+        ``asyncio.TimeoutError``, or :class:`DeadlineExceeded` when the
+        deadline in effect runs out.
+
+        :returns: :class:`AsyncResponse`, or :class:`AsyncStreamingResponse`
+            when **stream** is set and the request succeeded.
+        """
+        parts = urllib.parse.urlsplit(url)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        headers = dict(headers or {})
+        if self.proxy is not None and self.scheme != 'https':
+            # Plain http proxies take the absolute URL.
+            path = url
+            headers.update(self.proxy.headers)
+
+        lines = ['{} {} HTTP/1.1'.format(method, path),
+                 'Host: {}'.format(parts.netloc)]
+        names = set()
+        for name, value in headers.items():
+            names.add(name.lower())
+            lines.append('{}: {}'.format(name, value))
+        if 'content-length' not in names and (body is not None or method in ('POST', 'PUT')):
+            lines.append('Content-Length: {}'.format(len(body or b'')))
+        request = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + (body or b'')
+
+        deadline = current_deadline()
+        connect_timeout = self.connect_timeout
+        if deadline is not None:
+            connect_timeout = deadline.timeout(connect_timeout)
+
+        self._stats['requests'] += 1
+        try:
+            conn, reused = await self._get_conn(connect_timeout)
+        except asyncio.TimeoutError as e:
+            if deadline is not None and deadline.expired():
+                raise DeadlineExceeded(deadline.seconds) from e
+            raise
+        timings = new_timings()
+        try:
+            try:
+                status_line = await self._send_request(conn, request, timings, deadline)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                if not reused or method not in IDEMPOTENT_METHODS:
+                    raise
+                # The server closed the idle keep-alive connection before it
+                # answered; send the request once more on a new one.
+                stale = conn
+                conn = await _wait(self._new_conn(), connect_timeout)
+                stale.close()
+                self._stats['connections_discarded'] += 1
+                status_line = await self._send_request(conn, request, timings, deadline)
+            status, reason, response_headers, response_body = \
+                await self._read_head(conn, method, status_line, timings, deadline)
+        except BaseException as e:
+            conn.close()
+            self._stats['connections_discarded'] += 1
+            if isinstance(e, asyncio.TimeoutError) and deadline is not None and deadline.expired():
+                raise DeadlineExceeded(deadline.seconds) from e
+            raise
+
+        if stream and status < 400:
+            return AsyncStreamingResponse(url, status, reason, response_headers, response_body,
+                                          timings)
+        data = await response_body.read()
+        if status >= 400:
+            error = urllib.error.HTTPError(url, status, reason, response_headers,
+                                           BytesIO(data))
+            error.timings = timings
+            error.bytes_received = len(data)
+            raise error
+        return AsyncResponse(url, status, reason, response_headers, data, timings)
+
+    def _read_timeout(self, deadline):
+        """Returns the timeout for the next write or read."""
+        if deadline is None:
+            return self.read_timeout
+        return deadline.timeout(self.read_timeout)
+
+    async def _readexactly(self, reader, n, deadline):
+        """Reads **n** bytes, applying the read timeout to each piece."""
+        chunks = []
+        left = n
+        while left:
+            data = await _wait(reader.read(min(left, READ_CHUNK)), self._read_timeout(deadline))
+            if not data:
+                raise asyncio.IncompleteReadError(b''.join(chunks), n)
+            chunks.append(data)
+            left -= len(data)
+        return b''.join(chunks)
+
+    async def _readline(self, reader, deadline):
+        return await _wait(reader.readuntil(b'\r\n'), self._read_timeout(deadline))
+
+    async def _send_request(self, conn, request, timings, deadline):
+        """Writes the request and returns the response's status line."""
+        if conn.timings is not None:
+            for phase, seconds in conn.timings.items():
+                timings[phase] += seconds
+            conn.timings = None
+        start = time.perf_counter()
+        conn.writer.write(request)
+        await _wait(conn.writer.drain(), self._read_timeout(deadline))
+        sent = time.perf_counter()
+        timings['send'] += sent - start
+        status_line = await self._readline(conn.reader, deadline)
+        timings['server'] += time.perf_counter() - sent
+        return status_line
+
+    async def _read_head(self, conn, method, status_line, timings, deadline):
+        """
+        Reads the headers following **status_line**.
+
+        :returns: ``(status, reason, headers, body)``, **body** being an
+            :class:`_AsyncBody` that owns the connection from then on.
+        """
+        reader = conn.reader
+        start = time.perf_counter()
+        version, status, reason = (status_line.decode('latin-1').rstrip('\r\n').split(' ', 2) + [''])[:3]
+        status = int(status)
+        header_lines = []
+        while True:
+            line = await self._readline(reader, deadline)
+            header_lines.append(line)
+            if line == b'\r\n':
+                break
+        headers = http.client.parse_headers(BytesIO(b''.join(header_lines)))
+        timings['server'] += time.perf_counter() - start
+
+        connection = headers.get('Connection', '').lower()
+        keep_alive = connection != 'close' and not (
+            version == 'HTTP/1.0' and connection != 'keep-alive')
+        chunked = False
+        if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+            length = 0
+        elif headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            length = None
+            chunked = True
+        elif headers.get('Content-Length') is not None:
+            length = int(headers['Content-Length'])
+        else:
+            length = None
+            keep_alive = False
+        body = _AsyncBody(self, conn, length, chunked, keep_alive, timings, deadline)
+        return status, reason, headers, body
+
+    def stats(self):
+        stats = dict(self._stats)
+        stats['idle'] = len(self._idle)
+        return stats
+
+    def close(self):
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+class AsyncTransport(object):
+
+    """Shares :class:`AsyncConnectionPool` instances per endpoint host."""
+
+    def __init__(self, maxsize=10, idle_timeout=60, ssl_context=None,
+                 connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT,
+                 proxies=None):
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.ssl_context = ssl_context
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.proxies = urllib.request.getproxies() if proxies is None else proxies
+        self._pools = {}
+
+    def connection_pool(self, url):
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = AsyncConnectionPool(parts.scheme, parts.hostname, parts.port,
+                                       maxsize=self.maxsize,
+                                       idle_timeout=self.idle_timeout,
+                                       ssl_context=self.ssl_context,
+                                       connect_timeout=self.connect_timeout,
+                                       read_timeout=self.read_timeout,
+                                       proxy=get_proxy(url, self.proxies))
+            self._pools[key] = pool
+        return pool
+
+    async def urlopen(self, req, stream=False):
+        """
+        Sends a ``urllib.request.Request`` through the pool for its host.
+
+        :returns: :class:`AsyncResponse`, or :class:`AsyncStreamingResponse`
+            when **stream** is set.
+        """
+        url = req.full_url
+        return await self.connection_pool(url).urlopen(
+            req.get_method(), url, body=req.data, headers=dict(req.header_items()),
+            stream=stream)
+
+    def stats(self):
+        stats = {}
+        for pool in self._pools.values():
+            stats['{}://{}:{}'.format(pool.scheme, pool.host, pool.port)] = pool.stats()
+        return stats
+
+    def close(self):
+        pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.close()
@@ -0,0 +1,140 @@
+"""Chunked, concurrent dispatch of bulk create/update calls."""
+from amazon_advertising_api.deadline import propagate
+from amazon_advertising_api.exceptions import error_result
+from amazon_advertising_api.jsonlib import response_body
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+
+DEFAULT_CHUNK_SIZE = 100
+
+
+def chunked(data, size):
+    """Splits **data** into lists of at most **size** items."""
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def _guarded(send):
+    def call(item):
+        try:
+            return send(item)
+        except Exception as e:
+            return error_result(e)
+    return call
+
+
+def dispatch(send, items, max_workers):
+    """
+    Calls **send** for each of **items**, up to **max_workers** at a time in
+    threads, and returns the results in order. A call that raises gets an
+    error result instead, so the results of the other calls are kept.
+    """
+    call = _guarded(send)
+    if len(items) <= 1 or max_workers <= 1:
+        return [call(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(propagate(call), items))
+
+
+async def adispatch(send, items, max_workers):
+    """:func:`dispatch` for a coroutine function **send**."""
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def call(item):
+        async with semaphore:
+            try:
+                return await send(item)
+            except Exception as e:
+                return error_result(e)
+
+    return await asyncio.gather(*[call(item) for item in items])
+
+
+class BulkMutator(object):
+
+    """
+    Splits a bulk mutation into API-sized chunks, sends them concurrently and
+    merges the per-item multi-status responses back into input order.
+    """
+
+    def __init__(self, api, chunk_size=DEFAULT_CHUNK_SIZE, max_workers=4):
+        """
+        :param api: Client used to send the chunks.
+        :type api: AdvertisingApi
+        :param chunk_size: Maximum items per request. The API accepts up to
+            100 for most mutators.
+        :type chunk_size: integer
+        :param max_workers: Maximum chunks in flight at once.
+        :type max_workers: integer
+        """
+        self.api = api
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+
+    def _method(self, method):
+        if isinstance(method, str):
+            return getattr(self.api, method)
+        return method
+
+    def run(self, method, data, **kwargs):
+        """
+        Sends **data** through a bulk mutator in chunks.
+
+        :param method: Name of the client method, e.g.
+            'update_biddable_keywords', or the bound method itself.
+        :param data: Items to create or update.
+        :type data: list
+        :param kwargs: Extra arguments for the method, e.g. campaign_type.
+        :returns: dictionary with **success** (every chunk succeeded),
+            **code** 207 and **response**, the list of item responses in
+            input order. Items of a failed chunk get a response with the
+            chunk's HTTP status and error, or code 'ERROR' when the request
+            raised, e.g. on a timeout; the other chunks' items are kept.
+        """
+        method = self._method(method)
+        chunks = chunked(list(data), self.chunk_size)
+        results = dispatch(lambda chunk: method(chunk, **kwargs), chunks, self.max_workers)
+        return _merge(chunks, results)
+
+    async def arun(self, method, data, **kwargs):
+        """:meth:`run` for an :class:`AsyncAdvertisingApi`."""
+        method = self._method(method)
+        chunks = chunked(list(data), self.chunk_size)
+        results = await adispatch(lambda chunk: method(chunk, **kwargs), chunks, self.max_workers)
+        return _merge(chunks, results)
+
+
+def chunk_responses(chunks, results, items=response_body):
+    """
+    Splits the results of chunked calls into per-item responses.
+
+    :param items: Returns the list of item responses of a successful
+        result; the response body by default.
+    :returns: ``(responses, failed)``, a list of item responses per chunk
+        and the number of failed chunks. Each item of a chunk whose call
+        failed, or whose response does not hold one entry per item, gets a
+        response with the chunk's HTTP status, or code 'ERROR' when the call
+        raised, and its error.
+    """
+    responses = []
+    failed = 0
+    for chunk, result in zip(chunks, results):
+        entries = None
+        if result['success']:
+            entries = items(result)
+            if not isinstance(entries, list) or len(entries) != len(chunk):
+                entries = None
+        if entries is None:
+            failed += 1
+            code = 'HTTP_{}'.format(result['code']) if result['code'] else 'ERROR'
+            entries = [{'code': code, 'description': result['response']} for _ in chunk]
+        responses.append(entries)
+    return responses, failed
+
+
+def _merge(chunks, results):
+    responses, failed = chunk_responses(chunks, results)
+    return {'success': failed == 0,
+            'code': 207,
+            'chunks': len(chunks),
+            'failed_chunks': failed,
+            'response': [item for entries in responses for item in entries]}
@@ -0,0 +1,202 @@
+"""
+In-memory cache for read endpoints.
+
+Successful GET results are kept per profile, interface and parameters, with
+a time to live per resource and least-recently-used eviction. A create,
+update or archive through a client using the cache drops every entry for
+that profile and resource, and a read that was already in flight then
+does not store its now possibly stale result. Entries whose response
+carried an ETag are revalidated with ``If-None-Match`` once they expire.
+"""
+from collections import OrderedDict
+import copy
+import json
+import threading
+import time
+
+# Seconds entries of each resource stay fresh, unless overridden.
+DEFAULT_TTLS = {'profiles': 3600,
+                'campaigns': 300,
+                'adGroups': 300,
+                'keywords': 300,
+                'negativeKeywords': 300,
+                'campaignNegativeKeywords': 300,
+                'productAds': 300,
+                'targets': 300,
+                'negativeTargets': 300}
+
+# Job status and download resources, never cached: a poll must see the
+# job's current state.
+UNCACHED_RESOURCES = ('reports', 'snapshots')
+
+# Campaign type prefixes of interface paths.
+CAMPAIGN_TYPES = ('sp', 'sb', 'sd', 'hsa')
+
+# POST/PUT interfaces that read rather than change their resource.
+READ_SUFFIXES = ('report', 'snapshot', 'bidRecommendations', 'list', 'keyword')
+
+
+def resource_of(interface):
+    """Returns the resource of **interface**, e.g. 'campaigns' for 'sp/campaigns/extended/1'."""
+    parts = interface.split('?', 1)[0].strip('/').split('/')
+    if len(parts) > 1 and parts[0] in CAMPAIGN_TYPES:
+        parts = parts[1:]
+    return parts[0]
+
+
+def request_key(profile_id, interface, params=None):
+    """Returns a hashable key identifying a read request."""
+    if params is not None and not isinstance(params, str):
+        params = json.dumps(params, sort_keys=True, default=str)
+    return (profile_id, interface, params)
+
+
+def copy_result(result):
+    """
+    Returns a copy of **result** that the caller may modify; a parsed
+    response is copied deeply.
+    """
+    duplicate = copy.copy(result)
+    response = result.get('response')
+    if not isinstance(response, (str, bytes)) and response is not None:
+        duplicate['response'] = copy.deepcopy(response)
+    return duplicate
+
+
+class EntityCache(object):
+
+    """Thread-safe LRU cache of read results, shareable between clients."""
+
+    def __init__(self, maxsize=10000, ttls=None, default_ttl=None):
+        """
+        :param maxsize: Maximum number of cached results.
+        :type maxsize: integer
+        :param ttls: Seconds to keep results per resource, merged over
+            DEFAULT_TTLS. A TTL of 0 disables caching for the resource.
+        :type ttls: dictionary
+        :param default_ttl: TTL for resources not in **ttls**; by default
+            they are not cached. UNCACHED_RESOURCES are never cached.
+        :type default_ttl: float
+        """
+        self.maxsize = maxsize
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()
+        # Invalidation count per (profile_id, resource).
+        self._generations = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'revalidated': 0,
+                       'invalidations': 0, 'evictions': 0}
+
+    def ttl(self, interface):
+        """Returns the TTL for **interface**, or None if it is not cached."""
+        resource = resource_of(interface)
+        if resource in UNCACHED_RESOURCES:
+            return None
+        return self.ttls.get(resource, self.default_ttl) or None
+
+    key = staticmethod(request_key)
+
+    def get(self, profile_id, interface, params=None):
+        """
+        Looks up a cached result.
+
+        :returns: ``(result, etag)``. **result** is a copy of a fresh
+            entry, or None. **etag** is the ETag of an expired entry that
+            may be revalidated, or None.
+        """
+        if self.ttl(interface) is None:
+            return None, None
+        key = self.key(profile_id, interface, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None, None
+            result, expires_at, etag = entry
+            if time.monotonic() < expires_at:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return copy_result(result), None
+            self._stats['misses'] += 1
+            if etag is None:
+                del self._entries[key]
+            return None, etag
+
+    def generation(self, profile_id, interface):
+        """
+        Returns the invalidation count of the resource of **interface**;
+        take it before sending a read and pass it to :meth:`put`.
+        """
+        with self._lock:
+            return self._generations.get((profile_id, resource_of(interface)), 0)
+
+    def put(self, profile_id, interface, params, result, etag=None, generation=None):
+        """
+        Stores a successful result.
+
+        :param generation: The resource's :meth:`generation` from before
+            the request was sent. The result is dropped if the resource has
+            been invalidated since, as it may predate that write.
+        :type generation: integer
+        """
+        ttl = self.ttl(interface)
+        if ttl is None or not result.get('success'):
+            return
+        key = self.key(profile_id, interface, params)
+        with self._lock:
+            if generation is not None and generation != self._generations.get(
+                    (profile_id, resource_of(interface)), 0):
+                return
+            self._entries[key] = (copy_result(result), time.monotonic() + ttl, etag)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def revalidated(self, profile_id, interface, params=None):
+        """
+        Renews an expired entry after the server answered 304.
+
+        :returns: a copy of the cached result, or None if it was dropped.
+        """
+        key = self.key(profile_id, interface, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            result, _, etag = entry
+            self._entries[key] = (result, time.monotonic() + self.ttl(interface), etag)
+            self._entries.move_to_end(key)
+            self._stats['revalidated'] += 1
+            return copy_result(result)
+
+    def invalidate(self, profile_id, interface):
+        """
+        Drops every entry for **profile_id** and the resource of
+        **interface**, unless the interface only reads, e.g. a report
+        request.
+        """
+        if interface.rstrip('/').rsplit('/', 1)[-1] in READ_SUFFIXES:
+            return
+        resource = resource_of(interface)
+        with self._lock:
+            generation_key = (profile_id, resource)
+            self._generations[generation_key] = self._generations.get(generation_key, 0) + 1
+            stale = [key for key in self._entries
+                     if key[0] == profile_id and resource_of(key[1]) == resource]
+            for key in stale:
+                del self._entries[key]
+            self._stats['invalidations'] += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Returns hit, miss, revalidation, invalidation and eviction counts."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+        return stats
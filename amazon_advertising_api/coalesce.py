@@ -0,0 +1,99 @@
+"""
+Single-flight coalescing of identical concurrent reads.
+
+While a request is in flight, callers making the same request wait for it
+instead of sending their own, and each receives its own copy of the result.
+"""
+from amazon_advertising_api.cache import copy_result
+import asyncio
+import threading
+
+
+class _Flight(object):
+
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self, done):
+        self.done = done
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight(object):
+
+    """Coalesces calls with equal keys across threads."""
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+        self._stats = {'calls': 0, 'coalesced': 0}
+
+    def do(self, key, fn):
+        """
+        Returns ``fn()``, or a copy of the result of the call with the same
+        **key** already in flight. Its exception, if any, is raised in every
+        waiting caller.
+        """
+        with self._lock:
+            self._stats['calls'] += 1
+            flight = self._flights.get(key)
+            if flight is not None:
+                self._stats['coalesced'] += 1
+                flight.waiters += 1
+                leader = False
+            else:
+                flight = self._flights[key] = _Flight(threading.Event())
+                leader = True
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy_result(flight.result)
+
+        try:
+            flight.result = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return copy_result(flight.result) if flight.waiters else flight.result
+
+    def stats(self):
+        """Returns the number of calls and of calls that joined another."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_flight'] = len(self._flights)
+        return stats
+
+
+class AsyncSingleFlight(SingleFlight):
+
+    """:class:`SingleFlight` for coroutines on one event loop."""
+
+    async def do(self, key, fn):
+        """Awaits ``fn()``, or a copy of the result of the same call in flight."""
+        self._stats['calls'] += 1
+        flight = self._flights.get(key)
+        if flight is not None:
+            self._stats['coalesced'] += 1
+            flight.waiters += 1
+            await asyncio.shield(flight.done)
+            if flight.error is not None:
+                raise flight.error
+            return copy_result(flight.result)
+
+        flight = self._flights[key] = _Flight(asyncio.get_running_loop().create_future())
+        try:
+            flight.result = await fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            del self._flights[key]
+            flight.done.set_result(None)
+        return copy_result(flight.result) if flight.waiters else flight.result
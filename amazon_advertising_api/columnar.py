@@ -0,0 +1,178 @@
+"""
+Columnar loading of report and snapshot rows.
+
+Rows are read one at a time, so a streamed download
+(``get_report(report_id, stream=True)``) is never held as a list of dicts.
+Numeric columns are packed into ``array.array`` buffers: Ids and counts as
+int64 ('q'), money and rates as float64 ('d'). Other values are kept in
+lists. numpy, pyarrow and pandas exports are available when those packages
+are installed.
+"""
+from array import array
+
+INT = 'q'
+FLOAT = 'd'
+OBJECT = 'O'
+
+# Column type hints by name; anything else is inferred from its values.
+INT_COLUMNS = ('impressions', 'clicks')
+INT_PREFIXES = ('attributedConversions', 'attributedUnitsOrdered')
+FLOAT_COLUMNS = ('cost', 'spend', 'bid', 'defaultBid', 'dailyBudget', 'acos', 'roas')
+FLOAT_PREFIXES = ('attributedSales',)
+
+_MISSING = {INT: 0, FLOAT: float('nan')}
+
+
+def column_type(name, value=None):
+    """Returns the typecode for column **name**, given a sample **value**."""
+    if name in INT_COLUMNS or name.startswith(INT_PREFIXES) or name.endswith('Id'):
+        if value is None or isinstance(value, int) and not isinstance(value, bool):
+            return INT
+    if name in FLOAT_COLUMNS or name.startswith(FLOAT_PREFIXES):
+        if value is None or isinstance(value, (int, float)) and not isinstance(value, bool):
+            return FLOAT
+    if isinstance(value, bool) or value is None:
+        return OBJECT
+    if isinstance(value, int):
+        return INT
+    if isinstance(value, float):
+        return FLOAT
+    return OBJECT
+
+
+def _require(module):
+    try:
+        return __import__(module)
+    except ImportError:
+        raise ImportError('This export requires the {} package.'.format(module))
+
+
+class ReportColumns(object):
+
+    """
+    Report rows stored column by column.
+
+    **columns** maps each column name to an ``array.array`` for int64 and
+    float64 columns, or to a list. Missing values are 0 in int columns and
+    NaN in float columns.
+    """
+
+    def __init__(self, columns=None, length=0):
+        self.columns = columns if columns is not None else {}
+        self.length = length
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    @property
+    def names(self):
+        return list(self.columns)
+
+    def typecode(self, name):
+        """Returns 'q', 'd' or 'O' for column **name**."""
+        column = self.columns[name]
+        return column.typecode if isinstance(column, array) else OBJECT
+
+    def to_numpy(self):
+        """
+        Returns a dictionary of numpy arrays; numeric columns share memory
+        with the underlying buffers.
+        """
+        np = _require('numpy')
+        result = {}
+        for name, column in self.columns.items():
+            if isinstance(column, array):
+                dtype = np.int64 if column.typecode == INT else np.float64
+                result[name] = np.frombuffer(column, dtype=dtype)
+            else:
+                result[name] = np.array(column, dtype=object)
+        return result
+
+    def to_arrow(self):
+        """Returns a ``pyarrow.Table``."""
+        pa = _require('pyarrow')
+        arrays = []
+        for name, column in self.columns.items():
+            if isinstance(column, array):
+                kind = pa.int64() if column.typecode == INT else pa.float64()
+                arrays.append(pa.Array.from_buffers(kind, len(column), [None, pa.py_buffer(column)]))
+            else:
+                arrays.append(pa.array(column))
+        return pa.Table.from_arrays(arrays, names=list(self.columns))
+
+    def to_pandas(self):
+        """Returns a ``pandas.DataFrame``."""
+        pd = _require('pandas')
+        return pd.DataFrame(self.to_numpy(), columns=list(self.columns))
+
+    def write_parquet(self, path, **kwargs):
+        """Writes the columns to a Parquet file at **path**."""
+        _require('pyarrow')
+        import pyarrow.parquet
+        pyarrow.parquet.write_table(self.to_arrow(), path, **kwargs)
+        return path
+
+    def write_feather(self, path, **kwargs):
+        """Writes the columns to a Feather (Arrow IPC) file at **path**."""
+        _require('pyarrow')
+        import pyarrow.feather
+        pyarrow.feather.write_feather(self.to_arrow(), path, **kwargs)
+        return path
+
+
+def load_columns(rows, types=None):
+    """
+    Converts report rows into a :class:`ReportColumns`.
+
+    :param rows: Iterable of row dictionaries, e.g. the **response** of a
+        streamed report download.
+    :param types: Optional typecodes ('q', 'd' or 'O') by column name,
+        overriding the inferred ones.
+    :type types: dictionary
+    :returns: :class:`ReportColumns`
+    """
+    types = dict(types or {})
+    columns = {}
+    length = 0
+    for row in rows:
+        for name, value in row.items():
+            column = columns.get(name)
+            if column is None:
+                code = types.get(name) or column_type(name, value)
+                if code == OBJECT:
+                    column = [None] * length
+                else:
+                    column = array(code, [_MISSING[code]]) * length
+                columns[name] = column
+            if column.__class__ is list:
+                column.append(value)
+                continue
+            if value is None:
+                column.append(_MISSING[column.typecode])
+                continue
+            try:
+                column.append(value)
+            except (TypeError, OverflowError):
+                column = columns[name] = _widen(name, column, value, types)
+                column.append(value)
+        length += 1
+        for column in columns.values():
+            if len(column) < length:
+                column.append(_MISSING[column.typecode] if column.__class__ is not list else None)
+    return ReportColumns(columns, length)
+
+
+def _widen(name, column, value, types):
+    """Returns a copy of **column** able to hold **value**."""
+    if name in types:
+        raise TypeError('Column {} holds {!r}, not typecode {}.'.format(
+            name, value, types[name]))
+    if column.typecode == INT and isinstance(value, float):
+        return array(FLOAT, column)
+    return list(column)
@@ -0,0 +1,119 @@
+"""
+Overall deadlines for calls that make several requests.
+
+A deadline set with :func:`deadline` applies to every request made in its
+block, including the status, redirect and download requests of
+``get_report`` and every page of an ``iter_*`` iterator. Socket timeouts
+are shortened to the time left, retries and polling stop waiting when the
+deadline would pass, and :class:`DeadlineExceeded` is raised. Worker
+threads of the pipelines inherit the deadline of the caller; asyncio tasks
+inherit it through their context.
+"""
+from amazon_advertising_api.exceptions import DeadlineExceeded
+from contextlib import contextmanager
+import contextvars
+import time
+
+_current = contextvars.ContextVar('amazon_advertising_api_deadline', default=None)
+
+
+class Deadline(object):
+
+    """A point in time by which a call must have finished."""
+
+    def __init__(self, seconds):
+        """
+        :param seconds: Seconds from now.
+        :type seconds: float
+        """
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self):
+        """Returns the seconds left, 0 once expired."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return time.monotonic() >= self.expires_at
+
+    def check(self, wait=0):
+        """
+        Raises :class:`DeadlineExceeded` if the deadline has passed, or
+        would pass during a wait of **wait** seconds.
+        """
+        if time.monotonic() + wait >= self.expires_at:
+            raise DeadlineExceeded(self.seconds)
+
+    def timeout(self, timeout=None):
+        """
+        Returns **timeout** shortened to the time left.
+
+        :raises DeadlineExceeded: when no time is left.
+        """
+        remaining = self.expires_at - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded(self.seconds)
+        return remaining if timeout is None else min(timeout, remaining)
+
+
+@contextmanager
+def deadline(seconds):
+    """
+    Runs the block under a deadline of **seconds**; inside an enclosing
+    deadline, the earlier of the two applies::
+
+        with deadline(30):
+            api.get_report(report_id)
+
+    :returns: the :class:`Deadline` in effect.
+    """
+    new = Deadline(seconds)
+    current = _current.get()
+    if current is not None and current.expires_at <= new.expires_at:
+        new = current
+    token = _current.set(new)
+    try:
+        yield new
+    finally:
+        _current.reset(token)
+
+
+def current_deadline():
+    """Returns the :class:`Deadline` in effect, or None."""
+    return _current.get()
+
+
+def check_deadline(wait=0):
+    """:meth:`Deadline.check` for the deadline in effect, if any."""
+    current = _current.get()
+    if current is not None:
+        current.check(wait)
+
+
+def timeout(value=None):
+    """
+    Returns the socket timeout **value** shortened to the time left of the
+    deadline in effect, if any.
+    """
+    current = _current.get()
+    if current is None:
+        return value
+    return current.timeout(value)
+
+
+def propagate(fn):
+    """
+    Returns **fn** wrapped to run under the caller's deadline, for work
+    handed to other threads.
+    """
+    current = _current.get()
+    if current is None:
+        return fn
+
+    def run(*args, **kwargs):
+        token = _current.set(current)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current.reset(token)
+    return run
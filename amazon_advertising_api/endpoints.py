@@ -0,0 +1,836 @@
+"""
+Declarative table of the API endpoints that map one call to one request.
+
+Each entry of ENDPOINTS names a client method and gives its HTTP method and
+path template. The method's arguments follow from the entry: the path's
+Ids first, then **data** (the body of a POST or PUT, or the optional query
+of a paged list), then **campaign_type** when the path starts with it.
+Every paged ``list_*`` entry also gets an ``iter_*`` method.
+
+The methods are installed on ``AdvertisingApi`` when it is defined, with
+their signatures and docstrings, so they show up in ``help()``, the Sphinx
+docs and ``mock.create_autospec``; entries added later are installed by
+:func:`register`. All of them go through ``_operation``, and so share its
+retries, rate limiting, hooks, caching and coalescing; the API version is
+picked there from the path, v3 for 'sb' paths.
+"""
+from amazon_advertising_api.pagination import DEFAULT_PAGE_SIZE
+from collections import namedtuple
+import inspect
+import string
+
+_formatter = string.Formatter()
+
+# Classes the endpoint methods have been installed on.
+_installed = []
+
+
+class Endpoint(namedtuple('Endpoint', 'method path campaign_type paged doc')):
+
+    """
+    One endpoint: **method** and **path**, e.g.
+    '{campaign_type}/campaigns/{campaign_id}', the default **campaign_type**,
+    whether the endpoint is a **paged** list, and the method docstring.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, method, path, campaign_type='sp', paged=False, doc=None):
+        return super(Endpoint, cls).__new__(cls, method, path, campaign_type, paged, doc)
+
+    @property
+    def fields(self):
+        """Returns the names of the path's placeholders, in order."""
+        return [name for _, name, _, _ in _formatter.parse(self.path) if name]
+
+    @property
+    def params(self):
+        """Returns the method's ``(name, default)`` arguments; required ones have no default."""
+        fields = self.fields
+        params = [(name,) for name in fields if name != 'campaign_type']
+        if self.method in ('POST', 'PUT'):
+            params.append(('data',))
+        elif self.paged:
+            params.append(('data', None))
+        if 'campaign_type' in fields:
+            params.append(('campaign_type', self.campaign_type))
+        return params
+
+
+ENDPOINTS = {
+    'get_profiles': Endpoint('GET', 'profiles', doc="""
+        Retrieves profiles associated with an auth token.
+
+        :GET: /profiles
+        :returns:
+            :200: Success
+            :401: Unauthorized
+        """),
+    'get_profile': Endpoint('GET', 'profiles/{profile_id}', doc="""
+        Retrieves a single profile by Id.
+
+        :GET: /profiles/{profileId}
+        :param profile_id: The Id of the requested profile.
+        :type profile_id: string
+        :returns:
+            :200: List of **Profile**
+            :401: Unauthorized
+            :404: Profile not found
+        """),
+    'update_profiles': Endpoint('PUT', 'profiles', doc="""
+        Updates one or more profiles. Advertisers are identified using their
+        profileIds.
+
+        :PUT: /profiles
+        :param data: A list of updates containing **profileId** and the
+            mutable fields to be modified. Only daily budgets are mutable at
+            this time.
+        :type data: List of **Profile**
+        :returns:
+            :207: List of **ProfileResponse** reflecting the same order as the
+                input
+            :401: Unauthorized
+        """),
+    'get_campaign': Endpoint('GET', '{campaign_type}/campaigns/{campaign_id}', doc="""
+        Retrieves a campaign by Id. Note that this call returns the minimal
+        set of campaign fields, but is more efficient than **getCampaignEx**.
+
+        :GET: {campaignType}/campaigns/{campaignId}
+        :param campaign_id: The Id of the requested campaign.
+        :type campaign_id: string
+        :param campaign_type: The campaignType of the requested campaign ('sp' or 'sb')
+          Defaults to 'sp'
+        :type campaign_type: string
+        :returns:
+            :200: Campaign
+            :401: Unauthorized
+            :404: Campaign not found
+        """),
+    'get_campaign_ex': Endpoint('GET', '{campaign_type}/campaigns/extended/{campaign_id}', doc="""
+        Retrieves a campaign and its extended fields by ID. Note that this
+        call returns the complete set of campaign fields (including serving
+        status and other read-only fields), but is less efficient than
+        **getCampaign**.
+
+        :GET: {campaignType}/campaigns/extended/{campaignId}
+        :param campaign_id: The Id of the requested campaign.
+        :type campaign_id: string
+        :param campaign_type: The campaignType of the requested campaign ('sp' or 'sb')
+          Defaults to 'sp'
+        :type campaign_type: string
+        :returns:
+            :200: Campaign
+            :401: Unauthorized
+            :404: Campaign not found
+
+        """),
+    'create_campaigns': Endpoint('POST', '{campaign_type}/campaigns', doc="""
+        Creates one or more campaigns. Successfully created campaigns will be
+        assigned unique **campaignIds**.
+
+        :POST: /campaigns
+        :param data: A list of up to 100 campaigns to be created.  Required
+            fields for campaign creation are **name**, **campaignType**,
+            **targetingType**, **state**, **dailyBudget** and **startDate**.
+        :type data: List of **Campaign**
+        :returns:
+            :207: List of **CampaignResponse** reflecting the same order as the
+                input.
+            :401: Unauthorized
+        """),
+    'update_campaigns': Endpoint('PUT', '{campaign_type}/campaigns', doc="""
+        Updates one or more campaigns.  Campaigns are identified using their
+        **campaignIds**.
+
+        :PUT: /campaigns
+        :param data: A list of up to 100 updates containing **campaignIds** and
+            the mutable fields to be modified. Mutable fields are **name**,
+            **state**, **dailyBudget**, **startDate**, and **endDate**.
+        :type data: List of **Campaign**
+        :returns:
+            :207: List of **CampaignResponse** reflecting the same order as the
+                input
+            :401: Unauthorized
+        """),
+    'get_campaigns': Endpoint('GET', '{campaign_type}/campaigns', doc="""
+        Gets campaigns
+
+        :GET: /campaigns
+        :returns:
+            :207: List of **CampaignResponse**
+            :401: Unauthorized
+        """),
+    'archive_campaign': Endpoint('DELETE', '{campaign_type}/campaigns/{campaign_id}', doc="""
+        Sets the campaign status to archived. This same operation can be
+        performed via an update, but is included for completeness.
+
+        :DELETE: /campaigns/{campaignId}
+        :param campaign_id: The Id of the campaign to be archived.
+        :type campaign_id: string
+        :returns:
+            :200: Success, campaign response
+            :401: Unauthorized
+            :404: Campaign not found
+        """),
+    'list_campaigns': Endpoint('GET', '{campaign_type}/campaigns', paged=True, doc="""
+        Retrieves a list of campaigns satisfying optional criteria.
+
+        :GET: /{campaignType}/campaigns
+        :param campaign_type: The campaignType to retrieve campaigns for ('sp' or 'hsa')
+          Defaults to 'sp'
+        :type campaign_type: string
+        :param data: Optional, search criteria containing the following
+            parameters.
+
+        data may contain the following optional parameters:
+
+        :param startIndex: 0-indexed record offset for the result set.
+            Defaults to 0.
+        :type startIndex: Integer
+        :param count: Number of records to include in the paged response.
+            Defaults to max page size.
+        :type count: Integer
+        :param campaignType: Restricts results to campaigns of a single
+            campaign type. Must be **sponsoredProducts**.
+        :type campaignType: String
+        :param stateFilter: Restricts results to campaigns with state within
+            the specified comma-separatedlist. Must be one of **enabled**,
+            **paused**, **archived**. Default behavior is to include all.
+        :param name: Restricts results to campaigns with the specified name.
+        :type name: String
+        :param campaignFilterId: Restricts results to campaigns specified in
+            comma-separated list.
+        :type campaignFilterId: String
+        :returns:
+            :200: Success. list of campaign
+            :401: Unauthorized
+        """),
+    'list_campaigns_ex': Endpoint('GET', '{campaign_type}/campaigns/extended', paged=True, doc="""
+        Retrieves a list of campaigns with extended fields satisfying
+        optional filtering criteria.
+
+        :GET: /{campaignType}/campaigns/extended
+        :param campaign_type: campaignType of the requested campaigns ('sp' or 'hsa')
+          Defaults to 'sp'
+        :type campaign_type: string
+        :param data: Optional, search criteria containing the following
+            parameters.
+        :type data: JSON string
+        """),
+    'get_ad_group': Endpoint('GET', '{campaign_type}/adGroups/{ad_group_id}', doc="""
+        Retrieves an ad group by Id. Note that this call returns the minimal
+        set of ad group fields, but is more efficient than getAdGroupEx.
+
+        :GET: /sp/adGroups/{adGroupId}
+        :param ad_group_id: The Id of the requested ad group.
+        :type ad_group_id: string
+
+        :returns:
+            :200: Success, AdGroup response
+            :401: Unauthorized
+            :404: Ad group not found
+        """),
+    'get_ad_group_ex': Endpoint('GET', '{campaign_type}/adGroups/extended/{ad_group_id}', doc="""
+        Retrieves an ad group and its extended fields by ID. Note that this
+        call returns the complete set of ad group fields (including serving
+        status and other read-only fields), but is less efficient than
+        getAdGroup.
+
+        :GET: /sp/adGroups/extended/{adGroupId}
+        :param ad_group_id: The Id of the requested ad group.
+        :type ad_group_id: string
+
+        :returns:
+            :200: Success, AdGroup response
+            :401: Unauthorized
+            :404: Ad group not found
+        """),
+    'create_ad_groups': Endpoint('POST', '{campaign_type}/adGroups', doc="""
+        Creates one or more ad groups. Successfully created ad groups will
+        be assigned unique adGroupIds.
+
+        :POST: /adGroups
+        :param data: A list of up to 100 ad groups to be created. Required
+            fields for ad group creation are campaignId, name, state and
+            defaultBid.
+        :type data: List of **AdGroup**
+
+        :returns:
+            :207: Multi-status. List of AdGroupResponse reflecting the same
+                order as the input
+            :401: Unauthorized
+        """),
+    'update_ad_groups': Endpoint('PUT', '{campaign_type}/adGroups', doc="""
+        Updates one or more ad groups. Ad groups are identified using their
+        adGroupIds.
+
+        :PUT: /adGroups
+        :param data: A list of up to 100 updates containing adGroupIds and the
+            mutable fields to be modified.
+        :type data: List of **AdGroup**
+
+        :returns:
+            :207: Multi-status. List of AdGroupResponse reflecting the same
+                order as the input
+            :401: Unauthorized
+        """),
+    'archive_ad_group': Endpoint('DELETE', '{campaign_type}/adGroups/{ad_group_id}', doc="""
+        Sets the ad group status to archived. This same operation can be
+        performed via an update, but is included for completeness.
+
+        :DELETE: /adGroup/{adGroupId}
+        :param ad_group_id: The Id of the ad group to be archived.
+        :type ad_group_id: string
+
+        :returns:
+            :200: Success. AdGroupResponse
+            :401: Unauthorized
+            :404: Ad group not found
+        """),
+    'list_ad_groups': Endpoint('GET', '{campaign_type}/adGroups', paged=True, doc="""
+        Retrieves a list of ad groups satisfying optional criteria.
+
+        :GET: /sp/adGroups
+        :param data: Parameter list of criteria.
+
+        data may contain the following optional parameters:
+
+        :param startIndex: 0-indexed record offset for the result
+            set. Defaults to 0.
+        :type startIndex: integer
+        :param count: Number of records to include in the paged response.
+            Defaults to max page size.
+        :type count: integer
+        :param campaignType: Restricts results to ad groups belonging to
+            campaigns of the specified type. Must be sponsoredProducts
+        :type campaignType: string
+        :param campaignIdFilter: Restricts results to ad groups within
+            campaigns specified in comma-separated list.
+        :type campaignIdFilter: string
+        :param adGroupIdFilter: Restricts results to ad groups specified in
+            comma-separated list.
+        :type adGroupIdFilter: string
+        :param stateFilter: Restricts results to keywords with state within the
+            specified comma-separatedlist. Must be one of enabled, paused,
+            archived.  Default behavior is to include all.
+        :type stateFilter: string
+        :param name: Restricts results to ad groups with the specified name.
+        :type name: string
+
+        :returns:
+            :200: Success. List of adGroup.
+            :401: Unauthorized.
+
+        """),
+    'list_ad_groups_ex': Endpoint('GET', '{campaign_type}/adGroups/extended', paged=True, doc="""
+        Retrieves a list of ad groups satisfying optional criteria.
+
+        :GET: /sp/adGroups/extended
+        :param data: Parameter list of criteria.
+
+        data may contain the following optional parameters:
+
+        :param startIndex: 0-indexed record offset for the result
+            set. Defaults to 0.
+        :type startIndex: integer
+        :param count: Number of records to include in the paged response.
+            Defaults to max page size.
+        :type count: integer
+        :param campaignType: Restricts results to ad groups belonging to
+            campaigns of the specified type. Must be sponsoredProducts
+        :type campaignType: string
+        :param campaignIdFilter: Restricts results to ad groups within
+            campaigns specified in comma-separated list.
+        :type campaignIdFilter: string
+        :param adGroupIdFilter: Restricts results to ad groups specified in
+            comma-separated list.
+        :type adGroupIdFilter: string
+        :param stateFilter: Restricts results to keywords with state within the
+            specified comma-separatedlist. Must be one of enabled, paused,
+            archived.  Default behavior is to include all.
+        :type stateFilter: string
+        :param name: Restricts results to ad groups with the specified name.
+        :type name: string
+
+        :returns:
+            :200: Success. List of adGroup.
+            :401: Unauthorized.
+        """),
+    'get_target': Endpoint('GET', '{campaign_type}/targets/{target_id}', doc="""
+        Retrieves an ad group by Id. Note that this call returns the minimal
+        set of ad group fields, but is more efficient than getAdGroupEx.
+
+        :GET: /sp/targets/{targetId}
+        :param target_id: The Id of the requested ad group.
+        :type target_id: string
+
+        :returns:
+            :200: Success, Target response
+            :401: Unauthorized
+            :404: Ad group not found
+        """),
+    'get_target_ex': Endpoint('GET', 'sp/targets/extended/{target_id}', doc="""
+        Retrieves a target and its extended fields by ID. Note that this
+        call returns the complete set of target fields (including serving
+        status and other read-only fields), but is less efficient than
+        getTarget.
+
+        :GET: /sp/targets/extended/{adGroupId}
+        :param target_id: The Id of the requested target.
+        :type target_id: string
+
+        :returns:
+            :200: Success, Target response
+            :401: Unauthorized
+            :404: Target not found
+        """),
+    'create_targets': Endpoint('POST', '{campaign_type}/targets', doc="""
+        Creates one or more ad groups. Successfully created ad groups will
+        be assigned unique adGroupIds.
+
+        :POST: /targets
+        :param data: A list of up to 100 targets to be created.
+        :type data: List of **Target**
+
+        :returns:
+            :207: Multi-status. List of AdGroupResponse reflecting the same
+                order as the input
+            :401: Unauthorized
+        """),
+    'create_targets_list': Endpoint('POST', '{campaign_type}/targets/list', doc="""
+        Creates many targets
+
+        :POST: /targets
+        :param data: A list of up to 100 targets to be created.
+        :type data: List of **Target**
+
+        :returns:
+            :207: Multi-status. List of AdGroupResponse reflecting the same
+                order as the input
+            :401: Unauthorized
+        """),
+    'update_targets': Endpoint('PUT', '{campaign_type}/targets', doc="""
+        Updates one or more targets. Targets are identified using their
+        targetId.
+
+        :PUT: /targets
+        :param data: A list of up to 100 updates containing targetIds and the
+            mutable fields to be modified.
+        :type data: List of **Target**
+
+        :returns:
+            :207: Multi-status. List of Targets reflecting the same
+                order as the input
+            :401: Unauthorized
+        """),
+    'archive_target': Endpoint('DELETE', '{campaign_type}/targets/{ad_group_id}', doc="""
+        Sets the ad group status to archived. This same operation can be
+        performed via an update, but is included for completeness.
+
+        :DELETE: /targets/{targetId}
+        :param target_id: The Id of the ad group to be archived.
+        :type target_id: string
+
+        :returns:
+            :200: Success. TargetResponse
+            :401: Unauthorized
+            :404: Ad group not found
+        """),
+    'list_targets': Endpoint('GET', 'sp/targets', paged=True, doc="""
+        Retrieves a list of targets satisfying optional criteria.
+
+        :GET: /sp/targets
+        :param data: Parameter list of criteria.
+
+        data may contain the following optional parameters:
+
+        :param startIndex: 0-indexed record offset for the result
+            set. Defaults to 0.
+        :type startIndex: integer
+        :param count: Number of records to include in the paged response.
+            Defaults to max page size.
+        :type count: integer
+        :param expressionTypeFilter: Restricts results to targets
+            with expression types within the specified comma-separated list.
+            Possible filter types are: auto and manual
+        :type expressionTypeFilter: string
+        :param expressionTextFilter: Content of the targeting expression
+        :type expressionTextFilter: string
+        :param campaignIdFilter: Restricts results to ad groups within
+            campaigns specified in comma-separated list.
+        :type campaignIdFilter: string
+        :param adGroupIdFilter: Restricts results to ad groups specified in
+            comma-separated list.
+        :type adGroupIdFilter: string
+        :param stateFilter: Restricts results to targets with state within the
+            specified comma-separatedlist. Must be one of enabled, paused,
+            archived.  Default behavior is to include all.
+        :type stateFilter: string
+        :returns:
+            :200: Success. List of Targets.
+            :401: Unauthorized.
+        """),
+    'list_targets_ex': Endpoint('GET', 'sp/targets/extended', paged=True, doc="""
+        Retrieves a list of targets satisfying optional criteria.
+
+        :GET: /sp/targets/extended
+        :param data: Parameter list of criteria.
+
+        data may contain the following optional parameters:
+
+        :param startIndex: 0-indexed record offset for the result
+            set. Defaults to 0.
+        :type startIndex: integer
+        :param count: Number of records to include in the paged response.
+            Defaults to max page size.
+        :type count: integer
+        :param expressionTypeFilter: Restricts results to targets
+            with expression types within the specified comma-separated list.
+            Possible filter types are: auto and manual
+        :type expressionTypeFilter: string
+        :param expressionTextFilter: Content of the targeting expression
+        :type expressionTextFilter: string
+        :param campaignIdFilter: Restricts results to ad groups within
+            campaigns specified in comma-separated list.
+        :type campaignIdFilter: string
+        :param adGroupIdFilter: Restricts results to ad groups specified in
+            comma-separated list.
+        :type adGroupIdFilter: string
+        :param stateFilter: Restricts results to targets with state within the
+            specified comma-separatedlist. Must be one of enabled, paused,
+            archived.  Default behavior is to include all.
+        :type stateFilter: string
+        :returns:
+            :200: Success. List of Targets.
+            :401: Unauthorized.
+        """),
+    'get_negative_target': Endpoint('GET', '{campaign_type}/negativeTargets/{target_id}', campaign_type='sb', doc="""
+        Retrieves an ad group by Id. Note that this call returns the minimal
+        set of ad group fields, but is more efficient than getAdGroupEx.
+
+        :GET: /sp/negativeTargets/{targetId}
+        :param target_id: The Id of the requested ad group.
+        :type target_id: string
+
+        :returns:
+            :200: Success, Target response
+            :401: Unauthorized
+            :404: Ad group not found
+        """),
+    'get_negative_target_ex': Endpoint('GET', 'sp/negativeTargets/extended/{target_id}', doc="""
+        Retrieves a target and its extended fields by ID. Note that this
+        call returns the complete set of target fields (including serving
+        status and other read-only fields), but is less efficient than
+        getTarget.
+
+        :GET: /sp/negativeTargets/extended/{adGroupId}
+        :param target_id: The Id of the requested target.
+        :type target_id: string
+
+        :returns:
+            :200: Success, Target response
+            :401: Unauthorized
+            :404: Target not found
+        """),
+    'create_negative_targets': Endpoint('POST', '{campaign_type}/negativeTargets', doc="""
+        Creates one or more ad groups. Successfully created ad groups will
+        be assigned unique adGroupIds.
+
+        :POST: /negativeTargets
+        :param data: A list of up to 100 negativeTargets to be created.
+        :type data: List of **Target**
+
+        :returns:
+            :207: Multi-status. List of AdGroupResponse reflecting the same
+                order as the input
+            :401: Unauthorized
+        """),
+    'create_negative_targets_list': Endpoint('POST', '{campaign_type}/negativeTargets/list', campaign_type='sb', doc="""
+        Creates list of targets
+
+        :POST: /negativeTargets/list
+        :param data: A list of negativeTargets to be created.
+        :type data: List of **Target**
+
+        :returns:
+            :207: Multi-status. List of AdGroupResponse reflecting the same
+                order as the input
+            :401: Unauthorized
+        """),
+    'update_negative_targets': Endpoint('PUT', '{campaign_type}/negativeTargets', doc="""
+        Updates one or more negativeTargets. negativeTargets are identified using their
+        targetId.
+
+        :PUT: /negativeTargets
+        :param data: A list of up to 100 updates containing targetIds and the
+            mutable fields to be modified.
+        :type data: List of **Target**
+
+        :returns:
+            :207: Multi-status. List of negativeTargets reflecting the same
+                order as the input
+            :401: Unauthorized
+        """),
+    'archive_negative_target': Endpoint('DELETE', '{campaign_type}/negativeTargets/{ad_group_id}', doc="""
+        Sets the ad group status to archived. This same operation can be
+        performed via an update, but is included for completeness.
+
+        :DELETE: /negativeTargets/{targetId}
+        :param target_id: The Id of the ad group to be archived.
+        :type target_id: string
+
+        :returns:
+            :200: Success. TargetResponse
+            :401: Unauthorized
+            :404: Ad group not found
+        """),
+    'list_negative_targets': Endpoint('GET', 'sp/negativeTargets', paged=True, doc="""
+        Retrieves a list of negativeTargets satisfying optional criteria.
+
+        :GET: /sp/negativeTargets
+        :param data: Parameter list of criteria.
+
+        data may contain the following optional parameters:
+
+        :param startIndex: 0-indexed record offset for the result
+            set. Defaults to 0.
+        :type startIndex: integer
+        :param count: Number of records to include in the paged response.
+            Defaults to max page size.
+        :type count: integer
+        :param expressionTypeFilter: Restricts results to negativeTargets
+            with expression types within the specified comma-separated list.
+            Possible filter types are: auto and manual
+        :type expressionTypeFilter: string
+        :param expressionTextFilter: Content of the targeting expression
+        :type expressionTextFilter: string
+        :param campaignIdFilter: Restricts results to ad groups within
+            campaigns specified in comma-separated list.
+        :type campaignIdFilter: string
+        :param adGroupIdFilter: Restricts results to ad groups specified in
+            comma-separated list.
+        :type adGroupIdFilter: string
+        :param stateFilter: Restricts results to negativeTargets with state within the
+            specified comma-separatedlist. Must be one of enabled, paused,
+            archived.  Default behavior is to include all.
+        :type stateFilter: string
+        :returns:
+            :200: Success. List of negativeTargets.
+            :401: Unauthorized.
+        """),
+    'list_negative_targets_ex': Endpoint('GET', 'sp/negativeTargets/extended', paged=True, doc="""
+        Retrieves a list of negativeTargets satisfying optional criteria.
+
+        :GET: /sp/negativeTargets/extended
+        :param data: Parameter list of criteria.
+
+        data may contain the following optional parameters:
+
+        :param startIndex: 0-indexed record offset for the result
+            set. Defaults to 0.
+        :type startIndex: integer
+        :param count: Number of records to include in the paged response.
+            Defaults to max page size.
+        :type count: integer
+        :param expressionTypeFilter: Restricts results to negativeTargets
+            with expression types within the specified comma-separated list.
+            Possible filter types are: auto and manual
+        :type expressionTypeFilter: string
+        :param expressionTextFilter: Content of the targeting expression
+        :type expressionTextFilter: string
+        :param campaignIdFilter: Restricts results to ad groups within
+            campaigns specified in comma-separated list.
+        :type campaignIdFilter: string
+        :param adGroupIdFilter: Restricts results to ad groups specified in
+            comma-separated list.
+        :type adGroupIdFilter: string
+        :param stateFilter: Restricts results to negativeTargets with state within the
+            specified comma-separatedlist. Must be one of enabled, paused,
+            archived.  Default behavior is to include all.
+        :type stateFilter: string
+        :returns:
+            :200: Success. List of negativeTargets.
+            :401: Unauthorized.
+        """),
+    'get_biddable_keyword': Endpoint('GET', '{campaign_type}/keywords/{keyword_id}', doc="""
+        Retrieves a keyword by ID. Note that this call returns the minimal set
+        of keyword fields, but is more efficient than getBiddableKeywordEx.
+
+        :GET: /{campaignType}/keywords/{keywordId}
+        :param keyword_id: The Id of the requested keyword.
+        :type keyword_id: string
+        :param campaign_type: The campaignType for the requested keyword
+          Defaults to 'sp'
+        :type campaign_type: string
+
+        :returns:
+            :200: Success. Keyword.
+            :401: Unauthorized.
+            :404: Keyword not found.
+        """),
+    'get_biddable_keyword_ex': Endpoint('GET', 'sp/keywords/extended/{keyword_id}', doc="""
+        Retrieves a keyword and its extended fields by ID. Note that this call
+        returns the complete set of keyword fields (including serving status
+        and other read-only fields), but is less efficient than
+        getBiddableKeyword.
+
+        :GET: /keywords/extended/{keywordId}
+        :param keyword_id: The Id of the requested keyword.
+        :type keyword_id: string
+
+        :returns:
+            :200: Success. Keyword.
+            :401: Unauthorized.
+            :404: Keyword not found.
+        """),
+    'create_biddable_keywords': Endpoint('POST', '{campaign_type}/keywords', doc="""
+        Creates one or more keywords. Successfully created keywords will be
+        assigned unique keywordIds.
+
+        :POST: /keywords
+        :param data: A list of up to 1000 keywords to be created. Required
+            fields for keyword creation are campaignId, adGroupId, keywordText,
+            matchType and state.
+        :type data: List of **Keyword**
+        """),
+    'update_biddable_keywords': Endpoint('PUT', '{campaign_type}/keywords'),
+    'archive_biddable_keyword': Endpoint('DELETE', '{campaign_type}/keywords/{keyword_id}'),
+    'list_biddable_keywords': Endpoint('GET', '{campaign_type}/keywords', paged=True),
+    'list_biddable_keywords_ex': Endpoint('GET', 'sp/keywords/extended', paged=True),
+    'get_negative_keyword': Endpoint('GET', '{campaign_type}/negativeKeywords/{negative_keyword_id}'),
+    'get_negative_keyword_ex': Endpoint('GET', 'sp/negativeKeywords/extended/{negative_keyword_id}'),
+    'create_negative_keywords': Endpoint('POST', '{campaign_type}/negativeKeywords'),
+    'update_negative_keywords': Endpoint('PUT', '{campaign_type}/negativeKeywords'),
+    'archive_negative_keyword': Endpoint('DELETE', '{campaign_type}/negativeKeywords/{negative_keyword_id}'),
+    'list_negative_keywords': Endpoint('GET', '{campaign_type}/negativeKeywords', paged=True),
+    'list_negative_keywords_ex': Endpoint('GET', 'sp/negativeKeywords/extended', paged=True),
+    'get_campaign_negative_keyword': Endpoint('GET', 'sp/campaignNegativeKeywords/{campaign_negative_keyword_id}'),
+    'get_campaign_negative_keyword_ex': Endpoint('GET', 'sp/campaignNegativeKeywords/extended/{campaign_negative_keyword_id}'),
+    'create_campaign_negative_keywords': Endpoint('POST', 'campaignNegativeKeywords'),
+    'update_campaign_negative_keywords': Endpoint('PUT', 'campaignNegativeKeywords'),
+    'remove_campaign_negative_keyword': Endpoint('DELETE', 'campaignNegativeKeywords/{campaign_negative_keyword_id}'),
+    'list_campaign_negative_keywords': Endpoint('GET', 'sp/campaignNegativeKeywords', paged=True),
+    'list_campaign_negative_keywords_ex': Endpoint('GET', 'sp/campaignNegativeKeywords/extended', paged=True),
+    'get_product_ad': Endpoint('GET', 'sp/productAds/{product_ad_id}'),
+    'get_product_ad_ex': Endpoint('GET', 'sp/productAds/extended/{product_ad_id}'),
+    'create_product_ads': Endpoint('POST', 'productAds'),
+    'update_product_ads': Endpoint('PUT', 'productAds'),
+    'list_product_ads': Endpoint('GET', '{campaign_type}/productAds', paged=True),
+    'list_product_ads_ex': Endpoint('GET', '{campaign_type}/productAds/extended', paged=True),
+    'create_keyword_recommendations': Endpoint('POST', '{campaign_type}/recommendations/keyword'),
+    'get_ad_group_bid_recommendations': Endpoint('GET', 'adGroups/{ad_group_id}/bidRecommendations', doc="""Request bid recommendations for specified ad group."""),
+}
+
+
+def _list_name(name):
+    """Returns the paged list method behind iter_* method **name**, or None."""
+    if name.startswith('iter_'):
+        list_name = 'list_' + name[len('iter_'):]
+        endpoint = ENDPOINTS.get(list_name)
+        if endpoint is not None and endpoint.paged:
+            return list_name
+    return None
+
+
+def _signature(params):
+    parameters = [inspect.Parameter('self', inspect.Parameter.POSITIONAL_OR_KEYWORD)]
+    for param in params:
+        default = param[1] if len(param) > 1 else inspect.Parameter.empty
+        parameters.append(inspect.Parameter(param[0], inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                                            default=default))
+    return inspect.Signature(parameters)
+
+
+def _operation_method(endpoint):
+    signature = _signature(endpoint.params)
+    fields = endpoint.fields
+    has_data = any(param[0] == 'data' for param in endpoint.params)
+    options = {} if endpoint.method == 'GET' else {'method': endpoint.method}
+
+    def method(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = bound.arguments
+        interface = endpoint.path.format(**{f: arguments[f] for f in fields})
+        if has_data:
+            return arguments['self']._operation(interface, arguments['data'], **options)
+        return arguments['self']._operation(interface, **options)
+
+    method.__signature__ = signature
+    return method
+
+
+def _iter_method(list_name):
+    params = list(ENDPOINTS[list_name].params)
+    params += [('page_size', DEFAULT_PAGE_SIZE), ('prefetch', False), ('model', None)]
+    signature = _signature(params)
+    paged_by_type = any(param[0] == 'campaign_type' for param in params)
+
+    def method(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = bound.arguments
+        self = arguments['self']
+        extra = {'campaign_type': arguments['campaign_type']} if paged_by_type else {}
+        return self._iter_pages(getattr(self, list_name), arguments['data'],
+                                arguments['page_size'], arguments['prefetch'],
+                                arguments['model'], **extra)
+
+    method.__signature__ = signature
+    return method
+
+
+def names():
+    """Returns the names of every generated method."""
+    return list(ENDPOINTS) + ['iter_' + name[len('list_'):]
+                              for name, endpoint in ENDPOINTS.items() if endpoint.paged]
+
+
+def make_method(name, owner='AdvertisingApi'):
+    """
+    Builds the client method **name**.
+
+    :raises AttributeError: when **name** is not an endpoint.
+    """
+    list_name = _list_name(name)
+    if name in ENDPOINTS:
+        endpoint = ENDPOINTS[name]
+        method = _operation_method(endpoint)
+        doc = endpoint.doc or '\n:{}: /{}\n'.format(endpoint.method, endpoint.path)
+    elif list_name is not None:
+        method = _iter_method(list_name)
+        doc = ('Pages through **{}** lazily, yielding one entity, or **model** instance, '
+               'at a time.'.format(list_name))
+    else:
+        raise AttributeError(name)
+    method.__name__ = name
+    method.__qualname__ = '{}.{}'.format(owner, name)
+    method.__doc__ = doc
+    method.__module__ = 'amazon_advertising_api.advertising_api'
+    return method
+
+
+def install(cls):
+    """
+    Installs every endpoint method on **cls**, except those it defines
+    itself; used as a class decorator.
+    """
+    for name in names():
+        if name not in cls.__dict__:
+            setattr(cls, name, make_method(name, cls.__name__))
+    _installed.append(cls)
+    return cls
+
+
+def register(name, endpoint):
+    """
+    Adds **endpoint** to ENDPOINTS as method **name**, plus its ``iter_*``
+    method when it is paged, and installs them on the client classes.
+    """
+    ENDPOINTS[name] = endpoint
+    new = [name]
+    if endpoint.paged and name.startswith('list_'):
+        new.append('iter_' + name[len('list_'):])
+    for cls in _installed:
+        for method_name in new:
+            setattr(cls, method_name, make_method(method_name, cls.__name__))
@@ -0,0 +1,37 @@
+class AdvertisingApiError(Exception):
+
+    """
+    Raised where a result dictionary cannot be returned, e.g. by iterators
+    and pipelines. Carries the failed result.
+    """
+
+    def __init__(self, result):
+        self.result = result
+        self.code = result.get('code')
+        self.response = result.get('response')
+        super(AdvertisingApiError, self).__init__(
+            '{}: {}'.format(self.code, self.response))
+
+
+class DeadlineExceeded(AdvertisingApiError):
+
+    """Raised when a call would run past the deadline set with ``deadline``."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        super(DeadlineExceeded, self).__init__(
+            {'success': False,
+             'code': 0,
+             'response': 'Deadline of {} seconds exceeded.'.format(seconds)})
+
+
+def error_result(error):
+    """
+    Returns a failed result dictionary for an exception raised by a call, for
+    callers that report failures per item instead of raising. **code** is 0
+    and the exception is kept under **error**.
+    """
+    return {'success': False,
+            'code': 0,
+            'response': '{}: {}'.format(type(error).__name__, error),
+            'error': error}
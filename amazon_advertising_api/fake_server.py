@@ -0,0 +1,517 @@
+"""
+In-process stand-in for the Advertising API, for offline load testing.
+
+Serves profiles, sp/sb entities, reports, snapshots, the 307 redirect to a
+gzipped download and the token URL over plain HTTP on localhost::
+
+    with FakeAdvertisingServer(latency=0.01, error_429_rate=0.05) as server:
+        api = server.client(profile_id='1')
+        api.list_campaigns()
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import itertools
+import json
+import random
+import re
+import threading
+import time
+import urllib.parse
+import zlib
+
+# Path segment -> Id field of the entity.
+ID_FIELDS = {'campaigns': 'campaignId',
+             'adGroups': 'adGroupId',
+             'keywords': 'keywordId',
+             'negativeKeywords': 'keywordId',
+             'campaignNegativeKeywords': 'keywordId',
+             'productAds': 'adId',
+             'targets': 'targetId',
+             'negativeTargets': 'targetId'}
+
+_ENTITY_PATH = re.compile(
+    r'^/(?:v2/)?(?:(sp|sb|hsa)/)?(campaigns|adGroups|keywords|negativeKeywords|'
+    r'campaignNegativeKeywords|productAds|targets|negativeTargets)'
+    r'(?:/(extended))?(?:/(\d+))?$')
+_JOB_REQUEST = re.compile(r'^/(?:v2/)?(?:(sp|sb|hsa)/)?(\w+)/(report|snapshot)$')
+_JOB_STATUS = re.compile(r'^/(?:v2/)?(?:(?:sp|sb|hsa)/)?(reports|snapshots)/([\w.-]+)(/download)?$')
+_BID_RECOMMENDATIONS = re.compile(
+    r'^/(?:v2/)?(?:sp/)?(adGroups|keywords)(?:/(\d+))?/bidRecommendations$')
+_KEYWORD_RECOMMENDATIONS = re.compile(r'^/(?:v2/)?(?:(sp|sb|hsa)/)?recommendations/keyword$')
+_PROFILE_PATH = re.compile(r'^/(?:v2/)?profiles(?:/(register|\d+))?$')
+
+
+class FakeAdvertisingServer(object):
+
+    """Threaded local HTTP server imitating the Advertising API."""
+
+    def __init__(self,
+                 host='127.0.0.1',
+                 port=0,
+                 latency=0.0,
+                 error_429_rate=0.0,
+                 error_5xx_rate=0.0,
+                 entity_count=1000,
+                 report_rows=1000,
+                 row_padding=0,
+                 job_delay=0.0,
+                 idle_timeout=None,
+                 seed=None):
+        """
+        :param host: Interface to listen on.
+        :type host: string
+        :param port: Port to listen on; 0 picks a free one.
+        :type port: integer
+        :param latency: Seconds of delay added to every response.
+        :type latency: float
+        :param error_429_rate: Fraction of API calls answered with 429.
+        :type error_429_rate: float
+        :param error_5xx_rate: Fraction of API calls answered with 500/503.
+        :type error_5xx_rate: float
+        :param entity_count: Entities served by each list endpoint.
+        :type entity_count: integer
+        :param report_rows: Rows in each report and snapshot download.
+        :type report_rows: integer
+        :param row_padding: Extra bytes of text added to each report row.
+        :type row_padding: integer
+        :param job_delay: Seconds a report or snapshot stays IN_PROGRESS.
+        :type job_delay: float
+        :param idle_timeout: Seconds a keep-alive connection may sit idle
+            before the server closes it; None keeps it open.
+        :type idle_timeout: float
+        :param seed: Seed for the error injection.
+        :type seed: integer
+        """
+        self.latency = latency
+        self.error_429_rate = error_429_rate
+        self.error_5xx_rate = error_5xx_rate
+        self.entity_count = entity_count
+        self.report_rows = report_rows
+        self.row_padding = row_padding
+        self.job_delay = job_delay
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._jobs = {}
+        self._updates = {}
+        self._stats = {'requests': 0, 'by_status': {}, 'bytes_sent': 0}
+
+        handler = type('Handler', (_Handler,), {'fake': self, 'timeout': idle_timeout})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def endpoint(self):
+        host, port = self._server.server_address[:2]
+        return 'http://{}:{}'.format(host, port)
+
+    @property
+    def token_url(self):
+        return self.endpoint + '/auth/o2/token'
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def client(self, profile_id=None, client_class=None, **kwargs):
+        """
+        Returns a client pointed at this server.
+
+        :param profile_id: Profile for the client.
+        :param client_class: Client class, defaults to AdvertisingApi.
+        :param kwargs: Further client arguments.
+        """
+        if client_class is None:
+            from amazon_advertising_api.advertising_api import AdvertisingApi
+            client_class = AdvertisingApi
+        kwargs.setdefault('access_token', 'fake-access-token')
+        kwargs.setdefault('refresh_token', 'fake-refresh-token')
+        return client_class('fake-client-id', 'fake-client-secret', 'na',
+                            profile_id=profile_id, endpoint=self.endpoint,
+                            token_url=self.token_url, **kwargs)
+
+    def stats(self):
+        """Returns request counts, counts per status and bytes sent."""
+        with self._lock:
+            return {'requests': self._stats['requests'],
+                    'by_status': dict(self._stats['by_status']),
+                    'bytes_sent': self._stats['bytes_sent']}
+
+    def _record(self, status, size):
+        with self._lock:
+            self._stats['requests'] += 1
+            by_status = self._stats['by_status']
+            by_status[status] = by_status.get(status, 0) + 1
+            self._stats['bytes_sent'] += size
+
+    def _injected_error(self):
+        with self._lock:
+            roll = self._random.random()
+            if roll < self.error_429_rate:
+                return 429
+            if roll < self.error_429_rate + self.error_5xx_rate:
+                return self._random.choice((500, 503))
+        return None
+
+    def _new_job(self, kind, record_type, campaign_type, params):
+        job_id = 'amzn1.{}.{}'.format(kind, next(self._ids))
+        with self._lock:
+            self._jobs[job_id] = {'kind': kind,
+                                  'record_type': record_type,
+                                  'campaign_type': campaign_type,
+                                  'params': params,
+                                  'ready_at': time.monotonic() + self.job_delay}
+        return job_id
+
+    def _job(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def entity(self, resource, index, extended=False, campaign_type='sp'):
+        """Builds the fake entity number **index** of **resource**."""
+        entity = {ID_FIELDS[resource]: index + 1,
+                  'state': ('enabled', 'paused', 'archived')[index % 3]}
+        if resource == 'campaigns':
+            entity.update({'name': 'Campaign {}'.format(index + 1),
+                           'campaignType': 'sponsoredProducts' if campaign_type == 'sp' else 'sponsoredBrands',
+                           'targetingType': 'manual',
+                           'dailyBudget': 10.0 + index % 50,
+                           'startDate': '20200101'})
+        else:
+            entity['campaignId'] = index // 100 + 1
+        if resource in ('keywords', 'negativeKeywords', 'productAds',
+                        'targets', 'negativeTargets'):
+            entity['adGroupId'] = index // 10 + 1
+        if resource == 'adGroups':
+            entity.update({'name': 'Ad group {}'.format(index + 1), 'defaultBid': 0.75})
+        if resource in ('keywords', 'negativeKeywords', 'campaignNegativeKeywords'):
+            entity.update({'keywordText': 'keyword {}'.format(index + 1),
+                           'matchType': ('exact', 'phrase', 'broad')[index % 3]})
+            if resource == 'keywords':
+                entity['bid'] = 0.5 + (index % 20) / 10.0
+        if resource == 'productAds':
+            entity.update({'sku': 'SKU{:08d}'.format(index + 1),
+                           'asin': 'B{:09d}'.format(index + 1)})
+        if resource in ('targets', 'negativeTargets'):
+            entity.update({'expressionType': 'manual',
+                           'expression': [{'type': 'asinSameAs',
+                                           'value': 'B{:09d}'.format(index + 1)}]})
+            if resource == 'targets':
+                entity['bid'] = 0.8
+        if extended:
+            entity.update({'creationDate': 1577836800000,
+                           'lastUpdatedDate': 1577836800000 + index * 1000,
+                           'servingStatus': 'DELIVERING'})
+        update = self._updates.get((resource, index + 1))
+        if update is not None:
+            entity.update(update if extended else
+                          {k: v for k, v in update.items() if k != 'lastUpdatedDate'})
+        return entity
+
+    def update(self, resource, entity_id, fields):
+        """
+        Applies **fields** to an entity and bumps its lastUpdatedDate, as a
+        PUT does.
+        """
+        fields = {k: v for k, v in fields.items() if k != ID_FIELDS[resource]}
+        fields['lastUpdatedDate'] = int(time.time() * 1000)
+        with self._lock:
+            self._updates.setdefault((resource, int(entity_id)), {}).update(fields)
+
+    def list_entities(self, resource, query, extended=False, campaign_type='sp'):
+        """Returns the page of **resource** selected by the query filters."""
+        filters = {}
+        for name in ('campaignIdFilter', 'adGroupIdFilter', 'stateFilter'):
+            if query.get(name):
+                filters[name[:-len('Filter')]] = set(query[name].split(','))
+        entities = (self.entity(resource, index, extended, campaign_type)
+                    for index in range(self.entity_count))
+        if filters:
+            entities = (e for e in entities
+                        if all(str(e.get(field)) in values for field, values in filters.items()))
+        start = int(query.get('startIndex', 0))
+        count = int(query.get('count', self.entity_count))
+        return list(itertools.islice(entities, start, start + count))
+
+    def report_row(self, record_type, index):
+        """Builds report or snapshot row number **index**."""
+        if record_type in ID_FIELDS:
+            row = self.entity(record_type, index, extended=True)
+        else:
+            row = {'campaignId': index // 100 + 1}
+        row.update({'impressions': (index * 37) % 10000,
+                    'clicks': (index * 7) % 300,
+                    'cost': round(((index * 13) % 5000) / 100.0, 2),
+                    'attributedSales14d': round(((index * 29) % 9000) / 100.0, 2)})
+        if self.row_padding:
+            row['padding'] = 'x' * self.row_padding
+        return row
+
+    def iter_download(self, job):
+        """Yields the gzipped JSON array for a finished job in chunks."""
+        compressor = zlib.compressobj(1, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        parts = []
+        size = 0
+        encode = json.JSONEncoder(separators=(',', ':')).encode
+        parts.append(b'[')
+        for index in range(self.report_rows):
+            piece = (b',' if index else b'') + encode(self.report_row(job['record_type'], index)).encode('utf-8')
+            parts.append(piece)
+            size += len(piece)
+            if size >= 256 * 1024:
+                data = compressor.compress(b''.join(parts))
+                parts, size = [], 0
+                if data:
+                    yield data
+        parts.append(b']')
+        data = compressor.compress(b''.join(parts)) + compressor.flush()
+        if data:
+            yield data
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+    # Buffer each response and flush it whole, as real servers do.
+    wbufsize = -1
+    disable_nagle_algorithm = True
+    fake = None
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=None, headers=()):
+        if body is None:
+            data = b''
+        elif isinstance(body, bytes):
+            data = body
+        else:
+            data = json.dumps(body).encode('utf-8')
+        if self.command == 'GET' and status == 200 and data:
+            etag = '"{:08x}"'.format(zlib.crc32(data))
+            headers = list(headers) + [('ETag', etag)]
+            if self.headers.get('If-None-Match') == etag:
+                status, data = 304, b''
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        if status != 304:
+            self.send_header('Content-Length', str(len(data)))
+        try:
+            self.end_headers()
+            self.wfile.write(data)
+        except ConnectionError:
+            # The client went away, e.g. it timed out waiting for this reply.
+            self.close_connection = True
+        self.fake._record(status, len(data))
+
+    def _send_chunks(self, chunks):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        size = 0
+        try:
+            for chunk in chunks:
+                self.wfile.write('{:x}\r\n'.format(len(chunk)).encode('ascii') + chunk + b'\r\n')
+                size += len(chunk)
+            self.wfile.write(b'0\r\n\r\n')
+        except ConnectionError:
+            # The client gave up on the download, e.g. at its deadline.
+            self.close_connection = True
+        self.fake._record(200, size)
+
+    def _body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def _handle(self, method):
+        body = self._body()
+        fake = self.fake
+        parts = urllib.parse.urlsplit(self.path)
+        path = parts.path
+        query = dict(urllib.parse.parse_qsl(parts.query))
+
+        if fake.latency:
+            time.sleep(fake.latency)
+
+        if path == '/auth/o2/token' and method == 'POST':
+            return self._send(200, {'access_token': 'fake-access-token-{}'.format(next(fake._ids)),
+                                    'refresh_token': 'fake-refresh-token',
+                                    'token_type': 'bearer',
+                                    'expires_in': 3600})
+
+        if path.startswith('/storage/'):
+            job = fake._job(path.rsplit('/', 1)[-1].split('.json.gz')[0])
+            if job is None:
+                return self._send(404, {'code': 'NOT_FOUND'})
+            return self._send_chunks(fake.iter_download(job))
+
+        if 'Authorization' not in self.headers:
+            return self._send(401, {'code': 'UNAUTHORIZED', 'details': 'Not authorized.'})
+
+        error = fake._injected_error()
+        if error == 429:
+            return self._send(429, {'code': 'THROTTLED', 'details': 'Too many requests.'},
+                              headers=[('Retry-After', '1')])
+        if error is not None:
+            return self._send(error, {'code': 'SERVER_ERROR', 'details': 'Injected failure.'})
+
+        data = json.loads(body.decode('utf-8')) if body else None
+
+        match = _PROFILE_PATH.match(path)
+        if match:
+            return self._profiles(method, match.group(1), data)
+
+        match = _JOB_REQUEST.match(path)
+        if match and method == 'POST':
+            campaign_type, record_type, kind = match.groups()
+            job_id = fake._new_job(kind, record_type, campaign_type or 'sp', data)
+            return self._send(202, {'{}Id'.format(kind): job_id,
+                                    'recordType': record_type,
+                                    'status': 'IN_PROGRESS',
+                                    'statusDetails': '{} is being generated.'.format(kind.title())})
+
+        match = _JOB_STATUS.match(path)
+        if match and method == 'GET':
+            return self._job_status(match.group(1), match.group(2), bool(match.group(3)))
+
+        match = _BID_RECOMMENDATIONS.match(path)
+        if match:
+            return self._bid_recommendations(method, match.group(1), match.group(2), data)
+
+        match = _KEYWORD_RECOMMENDATIONS.match(path)
+        if match and method == 'POST':
+            data = data or {}
+            return self._send(200, [{'keywordText': '{} keyword {}'.format(asin, rank + 1),
+                                     'matchType': ('exact', 'phrase', 'broad')[rank % 3],
+                                     'rank': rank + 1}
+                                    for asin in data.get('asins') or []
+                                    for rank in range(int(data.get('maxNumSuggestions', 10)))])
+
+        match = _ENTITY_PATH.match(path)
+        if match:
+            return self._entities(method, match, query, data)
+
+        self._send(404, {'code': 'NOT_FOUND', 'details': 'No route for {} {}.'.format(method, path)})
+
+    def _profiles(self, method, profile_id, data):
+        if profile_id == 'register':
+            return self._send(200, {'registerProfileId': 'fake-register-id',
+                                    'status': 'IN_PROGRESS'})
+        if method == 'PUT':
+            return self._send(207, [{'profileId': item.get('profileId'), 'code': 'SUCCESS'}
+                                    for item in data or []])
+        profiles = [{'profileId': i + 1,
+                     'countryCode': 'US',
+                     'currencyCode': 'USD',
+                     'dailyBudget': 100.0,
+                     'timezone': 'America/Los_Angeles',
+                     'accountInfo': {'marketplaceStringId': 'ATVPDKIKX0DER',
+                                     'id': 'A{:013d}'.format(i + 1),
+                                     'type': 'seller'}}
+                    for i in range(5)]
+        if profile_id is not None:
+            for profile in profiles:
+                if profile['profileId'] == int(profile_id):
+                    return self._send(200, profile)
+            return self._send(404, {'code': 'NOT_FOUND'})
+        self._send(200, profiles)
+
+    def _job_status(self, kind, job_id, download):
+        fake = self.fake
+        job = fake._job(job_id)
+        if job is None:
+            return self._send(404, {'code': 'NOT_FOUND'})
+        if download:
+            return self._send(307, headers=[
+                ('Location', '{}/storage/{}.json.gz'.format(fake.endpoint, job_id))])
+        id_field = 'reportId' if kind == 'reports' else 'snapshotId'
+        if time.monotonic() < job['ready_at']:
+            return self._send(200, {id_field: job_id, 'status': 'IN_PROGRESS',
+                                    'statusDetails': 'Still generating.'})
+        self._send(200, {id_field: job_id,
+                         'status': 'SUCCESS',
+                         'statusDetails': 'Ready.',
+                         'location': '{}/v2/{}/{}/download'.format(fake.endpoint, kind, job_id),
+                         'fileSize': fake.report_rows * 200})
+
+    def _bid_recommendations(self, method, resource, entity_id, data):
+        def suggested_bid(seed):
+            suggested = round(0.25 + zlib.crc32(seed.encode('utf-8')) % 300 / 100.0, 2)
+            return {'suggested': suggested,
+                    'rangeStart': round(suggested * 0.8, 2),
+                    'rangeEnd': round(suggested * 1.2, 2)}
+
+        if entity_id is not None and method == 'GET':
+            id_field = 'adGroupId' if resource == 'adGroups' else 'keywordId'
+            return self._send(200, {id_field: int(entity_id),
+                                    'suggestedBid': suggested_bid(resource + entity_id)})
+        if resource == 'keywords' and entity_id is None and method == 'POST':
+            keywords = data.get('keywords') or []
+            if len(keywords) > 100:
+                return self._send(400, {'code': 'INVALID_ARGUMENT',
+                                        'details': 'At most 100 keywords per request.'})
+            return self._send(200, {'adGroupId': data.get('adGroupId'),
+                                    'recommendations': [
+                                        {'code': 'SUCCESS',
+                                         'keyword': item.get('keyword'),
+                                         'matchType': item.get('matchType'),
+                                         'suggestedBid': suggested_bid(
+                                             '{}|{}'.format(item.get('keyword'), item.get('matchType')))}
+                                        for item in keywords]})
+        self._send(405, {'code': 'METHOD_NOT_ALLOWED'})
+
+    def _entities(self, method, match, query, data):
+        fake = self.fake
+        campaign_type, resource, extended, entity_id = match.groups()
+        campaign_type = campaign_type or 'sp'
+        id_field = ID_FIELDS[resource]
+
+        if method == 'GET' and entity_id is not None:
+            index = int(entity_id) - 1
+            if not 0 <= index < fake.entity_count:
+                return self._send(404, {'code': 'NOT_FOUND'})
+            return self._send(200, fake.entity(resource, index, bool(extended), campaign_type))
+        if method == 'GET':
+            return self._send(200, fake.list_entities(resource, query, bool(extended), campaign_type))
+        if method == 'DELETE' and entity_id is not None:
+            return self._send(200, {id_field: int(entity_id), 'code': 'SUCCESS'})
+        if method in ('POST', 'PUT'):
+            results = []
+            for item in data or []:
+                item_id = item.get(id_field) or next(fake._ids)
+                if method == 'PUT':
+                    fake.update(resource, item_id, item)
+                results.append({id_field: item_id, 'code': 'SUCCESS'})
+            return self._send(207, results)
+        self._send(405, {'code': 'METHOD_NOT_ALLOWED'})
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
@@ -0,0 +1,99 @@
+"""Runs one client operation across many advertising profiles."""
+from amazon_advertising_api.deadline import propagate
+from amazon_advertising_api.exceptions import error_result
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio
+import threading
+
+
+class ProfileExecutor(object):
+
+    """
+    Fans an operation out over many profiles.
+
+    Each profile gets a client from :meth:`AdvertisingApi.for_profile`, so
+    connections, tokens, rate limits and retry policy are shared. Results
+    are yielded as ``(profile_id, result)`` in completion order.
+    """
+
+    def __init__(self, api, max_workers=8, per_profile_limit=None):
+        """
+        :param api: Client whose settings are shared by every profile.
+        :type api: AdvertisingApi
+        :param max_workers: Maximum operations in flight overall.
+        :type max_workers: integer
+        :param per_profile_limit: Optional maximum of API requests in
+            flight per profile, e.g. when an operation makes several
+            concurrent calls such as ``bulk_mutate``.
+        :type per_profile_limit: integer
+        """
+        self.api = api
+        self.max_workers = max_workers
+        self.per_profile_limit = per_profile_limit
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def client(self, profile_id):
+        """Returns the shared client for **profile_id**."""
+        with self._lock:
+            client = self._clients.get(profile_id)
+            if client is None:
+                client = self._clients[profile_id] = self.api.for_profile(
+                    profile_id, max_in_flight=self.per_profile_limit)
+            return client
+
+    @staticmethod
+    def _call(client, operation, args, kwargs):
+        if isinstance(operation, str):
+            return getattr(client, operation)(*args, **kwargs)
+        return operation(client, *args, **kwargs)
+
+    def map(self, profile_ids, operation, *args, **kwargs):
+        """
+        Runs **operation** once per profile on a thread pool.
+
+        :param profile_ids: Profiles to run the operation for.
+        :type profile_ids: list
+        :param operation: Client method name such as 'list_campaigns_ex', or
+            a callable taking the profile's client first.
+        :param args: Positional arguments for the operation.
+        :param kwargs: Keyword arguments for the operation.
+        :returns: generator of ``(profile_id, result)``. An exception raised
+            by the operation is reported as a failed result carrying it under
+            **error**.
+        """
+        def run(profile_id):
+            try:
+                return self._call(self.client(profile_id), operation, args, kwargs)
+            except Exception as e:
+                return error_result(e)
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            run = propagate(run)
+            futures = {executor.submit(run, profile_id): profile_id for profile_id in profile_ids}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            executor.shutdown(wait=False)
+            for future in futures:
+                future.cancel()
+
+    async def amap(self, profile_ids, operation, *args, **kwargs):
+        """:meth:`map` for an :class:`AsyncAdvertisingApi`; an async generator."""
+        limit = asyncio.Semaphore(self.max_workers)
+
+        async def run(profile_id):
+            async with limit:
+                try:
+                    return profile_id, await self._call(self.client(profile_id), operation, args, kwargs)
+                except Exception as e:
+                    return profile_id, error_result(e)
+
+        tasks = [asyncio.ensure_future(run(profile_id)) for profile_id in profile_ids]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
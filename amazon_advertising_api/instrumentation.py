@@ -0,0 +1,234 @@
+"""
+Request hooks for observing API calls and downloads.
+
+A hook's ``before_request`` and ``after_request`` are called with an event
+dictionary for every call made through ``_operation`` and ``_download``:
+
+:kind: 'operation' or 'download'.
+:interface: Interface path, e.g. 'sp/campaigns/extended'.
+:method: HTTP method.
+:profile_id: Profile the call was made for.
+:url: Request URL.
+:status: HTTP status, or 0 when no response was received.
+:success: Whether the call succeeded.
+:retries: Retries made by the retry policy.
+:bytes_sent: Request body size.
+:bytes_received: Response body size.
+:timings: Seconds per phase ('dns', 'connect', 'tls', 'send', 'server',
+    'read'), summed over every HTTP request the call made, plus 'total',
+    the wall-clock time of the call.
+:error: Exception that ended the call, if any.
+
+Only ``kind`` through ``bytes_sent`` are set before the request is sent.
+"""
+from amazon_advertising_api.connection_pool import PHASES, new_timings
+import re
+import threading
+import time
+
+DEFAULT_BUCKETS = (.005, .01, .025, .05, .1, .25, .5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_ID_SEGMENT = re.compile(r'/(\d+|amzn1\.[^/]+)(?=/|$)')
+
+
+def normalize_interface(interface):
+    """Replaces Ids in **interface** with ``{id}`` to bound label values."""
+    return _ID_SEGMENT.sub('/{id}', '/' + interface.lstrip('/'))[1:]
+
+
+def new_event(kind, interface, method, profile_id, url, bytes_sent=0):
+    timings = new_timings()
+    timings['total'] = 0.0
+    return {'kind': kind,
+            'interface': interface,
+            'method': method,
+            'profile_id': profile_id,
+            'url': url,
+            'status': None,
+            'success': None,
+            'retries': 0,
+            'bytes_sent': bytes_sent,
+            'bytes_received': 0,
+            'timings': timings,
+            'error': None,
+            '_start': time.perf_counter()}
+
+
+def record_response(event, response):
+    """Adds the timings and size of **response**, or of an HTTPError, to **event**."""
+    if event is None:
+        return
+    event['status'] = getattr(response, 'code', None)
+    event['bytes_received'] += getattr(response, 'bytes_received', 0)
+    timings = getattr(response, 'timings', None)
+    if timings:
+        for phase, seconds in timings.items():
+            event['timings'][phase] += seconds
+
+
+class Hook(object):
+
+    """Base class for request hooks; both methods do nothing by default."""
+
+    def before_request(self, event):
+        pass
+
+    def after_request(self, event):
+        pass
+
+
+class PrometheusHook(Hook):
+
+    """
+    Collects Prometheus-style metrics in memory and renders them in the text
+    exposition format, e.g. for a ``/metrics`` handler.
+
+    Metrics are labelled by interface, with Ids replaced by ``{id}``:
+
+    - ``<namespace>_requests_total{interface,method,status}``
+    - ``<namespace>_retries_total{interface,method}``
+    - ``<namespace>_bytes_sent_total{interface}`` and
+      ``<namespace>_bytes_received_total{interface}``
+    - ``<namespace>_request_duration_seconds{interface,method}`` histogram
+    - ``<namespace>_request_phase_seconds{interface,phase}`` histogram
+    """
+
+    def __init__(self, namespace='advertising_api', buckets=DEFAULT_BUCKETS):
+        """
+        :param namespace: Prefix for the metric names.
+        :type namespace: string
+        :param buckets: Upper bounds of the histogram buckets in seconds.
+        :type buckets: tuple
+        """
+        self.namespace = namespace
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    def _inc(self, name, labels, value=1):
+        key = (name, labels)
+        self._counters[key] = self._counters.get(key, 0) + value
+
+    def _observe(self, name, labels, value):
+        key = (name, labels)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = [[0] * len(self.buckets), 0, 0.0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                histogram[0][i] += 1
+        histogram[1] += 1
+        histogram[2] += value
+
+    def after_request(self, event):
+        interface = normalize_interface(event['interface'])
+        method = event['method']
+        timings = event['timings']
+        with self._lock:
+            self._inc('requests_total', (('interface', interface), ('method', method),
+                                         ('status', str(event['status'] or 0))))
+            if event['retries']:
+                self._inc('retries_total', (('interface', interface), ('method', method)),
+                          event['retries'])
+            self._inc('bytes_sent_total', (('interface', interface),), event['bytes_sent'])
+            self._inc('bytes_received_total', (('interface', interface),), event['bytes_received'])
+            self._observe('request_duration_seconds',
+                          (('interface', interface), ('method', method)), timings['total'])
+            for phase in PHASES:
+                self._observe('request_phase_seconds',
+                              (('interface', interface), ('phase', phase)), timings[phase])
+
+    def wall_clock(self):
+        """
+        Returns total seconds spent per interface, largest first, to show
+        which endpoints dominate a run.
+        """
+        totals = {}
+        with self._lock:
+            for (name, labels), histogram in self._histograms.items():
+                if name == 'request_duration_seconds':
+                    interface = dict(labels)['interface']
+                    totals[interface] = totals.get(interface, 0.0) + histogram[2]
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+    def render(self):
+        """Returns the metrics in the Prometheus text exposition format."""
+        def labels_text(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ''
+            return '{' + ','.join('{}="{}"'.format(k, _escape(v)) for k, v in pairs) + '}'
+
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items())
+
+        seen = set()
+        for (name, labels), value in counters:
+            full = '{}_{}'.format(self.namespace, name)
+            if full not in seen:
+                seen.add(full)
+                lines.append('# TYPE {} counter'.format(full))
+            lines.append('{}{} {}'.format(full, labels_text(labels), value))
+
+        for (name, labels), (counts, count, total) in histograms:
+            full = '{}_{}'.format(self.namespace, name)
+            if full not in seen:
+                seen.add(full)
+                lines.append('# TYPE {} histogram'.format(full))
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append('{}_bucket{} {}'.format(
+                    full, labels_text(labels, [('le', repr(float(bound)))]), bucket_count))
+            lines.append('{}_bucket{} {}'.format(full, labels_text(labels, [('le', '+Inf')]), count))
+            lines.append('{}_sum{} {}'.format(full, labels_text(labels), total))
+            lines.append('{}_count{} {}'.format(full, labels_text(labels), count))
+        return '\n'.join(lines) + '\n'
+
+
+class PrometheusClientHook(Hook):
+
+    """
+    Exports the same metrics as :class:`PrometheusHook` through the
+    ``prometheus_client`` package, which must be installed.
+    """
+
+    def __init__(self, namespace='advertising_api', registry=None, buckets=DEFAULT_BUCKETS):
+        try:
+            import prometheus_client
+        except ImportError:
+            raise ImportError('PrometheusClientHook requires the prometheus_client package.')
+        kwargs = {'namespace': namespace}
+        if registry is not None:
+            kwargs['registry'] = registry
+        self.requests = prometheus_client.Counter(
+            'requests_total', 'API calls.', ['interface', 'method', 'status'], **kwargs)
+        self.retries = prometheus_client.Counter(
+            'retries_total', 'Retried API calls.', ['interface', 'method'], **kwargs)
+        self.bytes_sent = prometheus_client.Counter(
+            'bytes_sent_total', 'Request body bytes.', ['interface'], **kwargs)
+        self.bytes_received = prometheus_client.Counter(
+            'bytes_received_total', 'Response body bytes.', ['interface'], **kwargs)
+        self.duration = prometheus_client.Histogram(
+            'request_duration_seconds', 'Wall-clock time per call.', ['interface', 'method'],
+            buckets=buckets, **kwargs)
+        self.phases = prometheus_client.Histogram(
+            'request_phase_seconds', 'Time per request phase.', ['interface', 'phase'],
+            buckets=buckets, **kwargs)
+
+    def after_request(self, event):
+        interface = normalize_interface(event['interface'])
+        method = event['method']
+        self.requests.labels(interface, method, str(event['status'] or 0)).inc()
+        if event['retries']:
+            self.retries.labels(interface, method).inc(event['retries'])
+        self.bytes_sent.labels(interface).inc(event['bytes_sent'])
+        self.bytes_received.labels(interface).inc(event['bytes_received'])
+        self.duration.labels(interface, method).observe(event['timings']['total'])
+        for phase in PHASES:
+            self.phases.labels(interface, phase).observe(event['timings'][phase])
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
@@ -0,0 +1,78 @@
+"""
+Fastest available JSON parser and the parsed result type.
+
+``loads`` is orjson's when installed, then ujson's, then the standard
+library's; all of them accept bytes, so bodies are parsed without decoding
+them first.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+if orjson is not None:
+    BACKEND = 'orjson'
+    loads = orjson.loads
+elif ujson is not None:
+    BACKEND = 'ujson'
+    loads = ujson.loads
+else:
+    BACKEND = 'json'
+    loads = json.loads
+
+
+def response_body(result):
+    """
+    Returns the decoded body of a successful result, whether its response is
+    still JSON text or was already parsed.
+    """
+    response = result['response']
+    if isinstance(response, (str, bytes, bytearray)):
+        return loads(response) if response else None
+    return response
+
+
+class ParsedResult(dict):
+
+    """
+    Result dictionary whose **response** is the parsed body.
+
+    The body as received stays available as :attr:`raw` (bytes) and, decoded
+    on first use, :attr:`text`.
+    """
+
+    __slots__ = ('raw', '_text')
+
+    def __init__(self, raw, **fields):
+        dict.__init__(self, fields)
+        self.raw = raw
+        self._text = None
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = self.raw.decode('utf-8')
+        return self._text
+
+
+def parsed_result(raw, **fields):
+    """
+    Builds a :class:`ParsedResult` from the body bytes **raw**. A body that
+    is empty or not JSON is kept as text in **response**.
+    """
+    result = ParsedResult(raw, **fields)
+    if not raw:
+        result['response'] = None
+        return result
+    try:
+        result['response'] = loads(raw)
+    except ValueError:
+        result['response'] = result.text
+    return result
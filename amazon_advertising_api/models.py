@@ -0,0 +1,171 @@
+"""
+Compact entity records for large accounts.
+
+Each model keeps its fields in ``__slots__`` instead of a per-object dict,
+and interns the short enumerated strings (state, match type, ...) so that
+millions of entities share one copy of each. Build them with
+:meth:`Entity.from_json` and send them back with :meth:`Entity.to_payload`;
+lists of models can also be passed to the ``create_*``/``update_*`` methods
+directly.
+"""
+import sys
+
+# Fields set by the API that are never sent back.
+READ_ONLY_FIELDS = ('creationDate', 'lastUpdatedDate', 'servingStatus')
+
+# Fields with a small set of string values, interned on load.
+ENUM_FIELDS = ('state', 'matchType', 'servingStatus', 'campaignType',
+               'targetingType', 'expressionType')
+
+
+class Entity(object):
+
+    """
+    Base class of the entity models.
+
+    Subclasses list their API fields in **FIELDS**, the first of which is
+    the entity Id. Fields the model does not know are kept in **extra**.
+    """
+
+    __slots__ = ('extra',)
+
+    FIELDS = ()
+    _field_set = frozenset()
+
+    def __init__(self, **fields):
+        extra = None
+        for name in self.FIELDS:
+            setattr(self, name, fields.pop(name, None))
+        if fields:
+            extra = fields
+        self.extra = extra
+
+    @property
+    def id(self):
+        return getattr(self, self.FIELDS[0])
+
+    @classmethod
+    def from_json(cls, data):
+        """
+        Builds a model from a decoded API entity.
+
+        :param data: The entity as returned by the API.
+        :type data: dictionary
+        """
+        obj = cls.__new__(cls)
+        get = data.get
+        intern = sys.intern
+        for name in cls.FIELDS:
+            value = get(name)
+            if value.__class__ is str and name in ENUM_FIELDS:
+                value = intern(value)
+            setattr(obj, name, value)
+        extra = None
+        field_set = cls._field_set
+        for key in data:
+            if key not in field_set:
+                if extra is None:
+                    extra = {}
+                extra[key] = data[key]
+        obj.extra = extra
+        return obj
+
+    @classmethod
+    def from_json_list(cls, data):
+        """Builds models from a list of decoded API entities."""
+        from_json = cls.from_json
+        return [from_json(item) for item in data]
+
+    def to_json(self):
+        """Returns every field that is set, including unknown ones."""
+        data = {}
+        for name in self.FIELDS:
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def to_payload(self, fields=None):
+        """
+        Returns the entity in the format expected by ``create_*`` and
+        ``update_*`` calls: the fields that are set, without read-only ones.
+
+        :param fields: Optional names of the fields to send; the Id is
+            always included when set.
+        :type fields: list
+        """
+        id_field = self.FIELDS[0]
+        names = self.FIELDS if fields is None else [id_field] + [f for f in fields if f != id_field]
+        payload = {}
+        for name in names:
+            if name in READ_ONLY_FIELDS:
+                continue
+            value = getattr(self, name)
+            if value is not None:
+                payload[name] = value
+        return payload
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_json() == other.to_json()
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, ', '.join(
+            '{}={!r}'.format(name, getattr(self, name))
+            for name in self.FIELDS if getattr(self, name) is not None))
+
+
+def _model(name, fields, doc):
+    return type(name, (Entity,), {'__slots__': fields,
+                                  '__doc__': doc,
+                                  'FIELDS': fields,
+                                  '_field_set': frozenset(fields)})
+
+
+Campaign = _model('Campaign', (
+    'campaignId', 'name', 'campaignType', 'targetingType', 'state',
+    'dailyBudget', 'startDate', 'endDate', 'premiumBidAdjustment', 'bidding',
+    'portfolioId', 'creationDate', 'lastUpdatedDate', 'servingStatus'),
+    """A campaign, as returned by list_campaigns(_ex).""")
+
+AdGroup = _model('AdGroup', (
+    'adGroupId', 'name', 'campaignId', 'defaultBid', 'state',
+    'creationDate', 'lastUpdatedDate', 'servingStatus'),
+    """An ad group, as returned by list_ad_groups(_ex).""")
+
+Keyword = _model('Keyword', (
+    'keywordId', 'campaignId', 'adGroupId', 'state', 'keywordText',
+    'matchType', 'bid', 'creationDate', 'lastUpdatedDate', 'servingStatus'),
+    """A biddable keyword, as returned by list_biddable_keywords(_ex).""")
+
+NegativeKeyword = _model('NegativeKeyword', (
+    'keywordId', 'campaignId', 'adGroupId', 'state', 'keywordText',
+    'matchType', 'creationDate', 'lastUpdatedDate', 'servingStatus'),
+    """An ad group or campaign negative keyword.""")
+
+Target = _model('Target', (
+    'targetId', 'campaignId', 'adGroupId', 'state', 'expressionType',
+    'expression', 'resolvedExpression', 'bid', 'creationDate',
+    'lastUpdatedDate', 'servingStatus'),
+    """A product or category target, as returned by list_targets(_ex).""")
+
+ProductAd = _model('ProductAd', (
+    'adId', 'campaignId', 'adGroupId', 'sku', 'asin', 'state',
+    'creationDate', 'lastUpdatedDate', 'servingStatus'),
+    """A product ad, as returned by list_product_ads(_ex).""")
+
+
+def encode_entity(obj):
+    """``json.dumps`` default that sends models as their payload."""
+    if isinstance(obj, Entity):
+        return obj.to_payload()
+    raise TypeError('Object of type {} is not JSON serializable'.format(type(obj).__name__))
@@ -0,0 +1,102 @@
+"""Lazy paging over the list_* endpoints."""
+from amazon_advertising_api.deadline import propagate
+from amazon_advertising_api.exceptions import AdvertisingApiError
+from amazon_advertising_api.jsonlib import response_body
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_PAGE_SIZE = 100
+
+
+def _page_params(data, start_index, page_size):
+    params = dict(data or {})
+    params['startIndex'] = start_index
+    params['count'] = page_size
+    return params
+
+
+def _page_entities(result):
+    if not result['success']:
+        raise AdvertisingApiError(result)
+    return response_body(result)
+
+
+def iter_pages(fetch, data=None, page_size=DEFAULT_PAGE_SIZE, prefetch=False, model=None):
+    """
+    Yields entities from a paged list endpoint one at a time.
+
+    Pages are requested with ``startIndex``/``count`` until a short page is
+    returned, so only one page (two with ``prefetch``) is held in memory.
+
+    :param fetch: Callable taking the query parameters and returning a result
+        dictionary, e.g. ``api.list_campaigns``.
+    :param data: Optional filters; ``startIndex`` is used as the first offset.
+    :type data: dictionary
+    :param page_size: Number of records requested per page.
+    :type page_size: integer
+    :param prefetch: Request the next page in a background thread while the
+        current one is consumed.
+    :type prefetch: boolean
+    :param model: Optional model class whose ``from_json_list`` converts each
+        page, e.g. models.Keyword.
+    :raises AdvertisingApiError: when a page request fails.
+    """
+    start_index = int((data or {}).get('startIndex', 0))
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    prefetch_page = propagate(fetch)
+    try:
+        pending = None
+        if executor is not None:
+            pending = executor.submit(prefetch_page, _page_params(data, start_index, page_size))
+        while True:
+            if pending is not None:
+                result = pending.result()
+            else:
+                result = fetch(_page_params(data, start_index, page_size))
+            entities = _page_entities(result)
+            start_index += len(entities)
+            last_page = len(entities) < page_size
+            if model is not None:
+                entities = model.from_json_list(entities)
+            if executor is not None and not last_page:
+                pending = executor.submit(prefetch_page, _page_params(data, start_index, page_size))
+            for entity in entities:
+                yield entity
+            if last_page:
+                return
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+async def aiter_pages(fetch, data=None, page_size=DEFAULT_PAGE_SIZE, prefetch=False, model=None):
+    """
+    Async generator counterpart of :func:`iter_pages` for coroutine
+    ``fetch`` callables.
+    """
+    import asyncio
+
+    start_index = int((data or {}).get('startIndex', 0))
+    pending = None
+    try:
+        if prefetch:
+            pending = asyncio.ensure_future(fetch(_page_params(data, start_index, page_size)))
+        while True:
+            if pending is not None:
+                result = await pending
+                pending = None
+            else:
+                result = await fetch(_page_params(data, start_index, page_size))
+            entities = _page_entities(result)
+            start_index += len(entities)
+            last_page = len(entities) < page_size
+            if model is not None:
+                entities = model.from_json_list(entities)
+            if prefetch and not last_page:
+                pending = asyncio.ensure_future(fetch(_page_params(data, start_index, page_size)))
+            for entity in entities:
+                yield entity
+            if last_page:
+                return
+    finally:
+        if pending is not None:
+            pending.cancel()
@@ -0,0 +1,153 @@
+"""Request, poll and download pipeline shared by reports and snapshots."""
+from amazon_advertising_api.deadline import check_deadline, propagate
+from amazon_advertising_api.exceptions import error_result
+from amazon_advertising_api.jsonlib import response_body
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import time
+
+
+def _call(fn, *args):
+    try:
+        return fn(*args)
+    except Exception as e:
+        return error_result(e)
+
+
+class Pipeline(object):
+
+    """
+    Submits many asynchronous server-side jobs, polls all pending ones in a
+    single loop with a growing interval, and downloads the finished ones
+    concurrently.
+
+    Subclasses implement :meth:`_request`, :meth:`_status` and
+    :meth:`_download`.
+    """
+
+    def __init__(self,
+                 api,
+                 max_workers=8,
+                 poll_interval=2.0,
+                 max_poll_interval=60.0,
+                 backoff=1.5,
+                 timeout=3600.0,
+                 stream=False,
+                 path_for=None):
+        """
+        :param api: Client used for every call.
+        :type api: AdvertisingApi
+        :param max_workers: Maximum requests in flight.
+        :type max_workers: integer
+        :param poll_interval: Seconds before the first status poll.
+        :type poll_interval: float
+        :param max_poll_interval: Upper bound for the poll interval.
+        :type max_poll_interval: float
+        :param backoff: Factor applied to the interval after every poll.
+        :type backoff: float
+        :param timeout: Seconds after which jobs still pending are given up.
+        :type timeout: float
+        :param stream: Download results as row generators, see
+            AdvertisingApi._download.
+        :type stream: boolean
+        :param path_for: Optional callable returning a file path for a job;
+            the raw gzipped download is saved there instead of parsed.
+        """
+        self.api = api
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.backoff = backoff
+        self.timeout = timeout
+        self.stream = stream
+        self.path_for = path_for
+
+    def _request(self, job):
+        """Submits **job**; returns the result of the request call."""
+        raise NotImplementedError
+
+    def _status(self, job_id, job):
+        """Returns the result of the status call for **job_id**."""
+        raise NotImplementedError
+
+    def _job_id(self, body):
+        """Extracts the job Id from a decoded request response."""
+        raise NotImplementedError
+
+    def _download(self, job, location):
+        path = self.path_for(job) if self.path_for is not None else None
+        return self.api._download(location, stream=self.stream, path=path)
+
+    def run(self, jobs):
+        """
+        Runs every job to completion.
+
+        :param jobs: Job descriptions understood by :meth:`_request`.
+        :returns: generator of ``(job, result)`` in completion order. The
+            result is the download result, or the failed request, status or
+            timeout result.
+        """
+        jobs = list(jobs)
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        downloads = {}
+        try:
+            pending = {}
+            send_request, poll_status, start_download = (
+                propagate(self._request), propagate(self._status), propagate(self._download))
+            for job, result in zip(jobs, executor.map(lambda job: _call(send_request, job), jobs)):
+                if not result['success']:
+                    yield job, result
+                    continue
+                pending[self._job_id(response_body(result))] = job
+
+            start = time.monotonic()
+            interval = self.poll_interval
+            next_poll = start + interval
+            while pending or downloads:
+                for future in [f for f in downloads if f.done()]:
+                    yield downloads.pop(future), _call(future.result)
+
+                if not pending:
+                    if downloads:
+                        wait(list(downloads), return_when=FIRST_COMPLETED)
+                    continue
+
+                now = time.monotonic()
+                if now < next_poll:
+                    if downloads:
+                        wait(list(downloads), timeout=next_poll - now, return_when=FIRST_COMPLETED)
+                    else:
+                        check_deadline(next_poll - now)
+                        time.sleep(next_poll - now)
+                    continue
+
+                if self.timeout is not None and now - start > self.timeout:
+                    for job in pending.values():
+                        yield job, {'success': False,
+                                    'code': 0,
+                                    'response': 'Not ready after {} seconds.'.format(self.timeout)}
+                    pending.clear()
+                    continue
+
+                job_ids = list(pending)
+                statuses = executor.map(
+                    lambda job_id: _call(poll_status, job_id, pending[job_id]), job_ids)
+                for job_id, result in zip(job_ids, statuses):
+                    if not result['success']:
+                        yield pending.pop(job_id), result
+                        continue
+                    body = response_body(result)
+                    status = body.get('status')
+                    if status == 'SUCCESS':
+                        job = pending.pop(job_id)
+                        future = executor.submit(start_download, job, body['location'])
+                        downloads[future] = job
+                    elif status in ('FAILURE', 'FAILED'):
+                        result['success'] = False
+                        yield pending.pop(job_id), result
+
+                interval = min(self.max_poll_interval, interval * self.backoff)
+                next_poll = time.monotonic() + interval
+        finally:
+            for future in downloads:
+                future.cancel()
+            executor.shutdown(wait=False)
@@ -0,0 +1,216 @@
+"""Client-side token-bucket rate limiting with adaptive throttling."""
+from amazon_advertising_api.deadline import check_deadline
+from email.utils import parsedate_to_datetime
+import datetime
+import threading
+import time
+
+
+def parse_retry_after(value):
+    """
+    Returns the delay in seconds from a ``Retry-After`` header value, which
+    may be a number of seconds or an HTTP date, or None if it is missing or
+    invalid.
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, (when - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+
+class TokenBucket(object):
+
+    """Token bucket that hands out reservations instead of blocking."""
+
+    def __init__(self, rate, burst):
+        """
+        :param rate: Tokens added per second.
+        :type rate: float
+        :param burst: Bucket capacity.
+        :type burst: float
+        """
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        # End of the window in which further 429s don't cut the rate again,
+        # and the time the rate last grew.
+        self._cooldown_until = 0.0
+        self._grown_at = self._updated
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self):
+        """Takes one token and returns the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(delay, self._blocked_until - now)
+
+    def pause(self, seconds):
+        """Blocks new reservations for **seconds** and drains the bucket."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens = min(self._tokens, 0.0)
+            self._blocked_until = max(self._blocked_until, now + seconds)
+
+    def set_rate(self, rate):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = float(rate)
+
+    def throttle(self, factor, min_rate, delay=None, cooldown=0.0):
+        """
+        Backs off after a 429: multiplies the rate by **factor**, unless it
+        was already cut less than **cooldown** seconds (or the previous
+        pause) ago, and pauses the bucket for **delay** seconds, by default
+        one request interval. Returns True if the rate was cut.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            cut = now >= self._cooldown_until
+            if cut:
+                self.rate = max(float(min_rate), self.rate * factor)
+            if delay is None:
+                delay = 1.0 / self.rate
+            self._tokens = min(self._tokens, 0.0)
+            self._blocked_until = max(self._blocked_until, now + delay)
+            if cut:
+                # Requests already in flight will get 429s for the same
+                # throttling event; they must not cut the rate again.
+                self._cooldown_until = now + max(cooldown, delay)
+                self._grown_at = self._blocked_until
+            return cut
+
+    def grow(self, step, max_rate):
+        """
+        Adds **step** requests per second for every second elapsed since
+        the rate last grew or was cut, up to **max_rate**.
+        """
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._grown_at
+            if elapsed <= 0:
+                return
+            self._refill(now)
+            self.rate = min(float(max_rate), self.rate + step * elapsed)
+            self._grown_at = now
+
+
+class RateLimiter(object):
+
+    """
+    Token buckets keyed by profile Id and endpoint host.
+
+    The rate of a bucket backs off multiplicatively on a 429, at most once
+    per **cooldown** or ``Retry-After`` window so that a burst of 429s from
+    one throttling event counts once, and grows back linearly in time while
+    requests succeed, up to **max_rate**. A ``Retry-After`` header pauses
+    the bucket for the requested time. A limiter can be shared by several
+    clients.
+    """
+
+    def __init__(self,
+                 rate=5.0,
+                 burst=None,
+                 min_rate=0.2,
+                 max_rate=None,
+                 increase=0.05,
+                 decrease=0.5,
+                 cooldown=1.0):
+        """
+        :param rate: Initial requests per second per profile and host.
+        :type rate: float
+        :param burst: Requests allowed back to back. Defaults to **rate**.
+        :type burst: float
+        :param min_rate: Lower bound when backing off.
+        :type min_rate: float
+        :param max_rate: Upper bound when recovering. Defaults to **rate**;
+            set higher to probe for more throughput.
+        :type max_rate: float
+        :param increase: Fraction of **max_rate** added back per second
+            while requests succeed.
+        :type increase: float
+        :param decrease: Factor applied to the rate after a 429.
+        :type decrease: float
+        :param cooldown: Seconds after a decrease during which further 429s
+            pause the bucket without cutting the rate again.
+        :type cooldown: float
+        """
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate if max_rate is not None else rate)
+        self.increase = float(increase)
+        self.decrease = float(decrease)
+        self.cooldown = float(cooldown)
+        self._buckets = {}
+        self._throttled = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, profile_id, host):
+        key = (profile_id, host)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(self.rate, self.burst)
+                self._throttled[key] = 0
+        return bucket
+
+    def reserve(self, profile_id, host):
+        """Returns the seconds to wait before sending the next request."""
+        return self.bucket(profile_id, host).reserve()
+
+    def acquire(self, profile_id, host):
+        """
+        Blocks until a request may be sent; returns the time waited.
+
+        :raises DeadlineExceeded: when the wait would pass the deadline in
+            effect.
+        """
+        delay = self.reserve(profile_id, host)
+        if delay > 0:
+            check_deadline(delay)
+            time.sleep(delay)
+        return delay
+
+    def feedback(self, profile_id, host, code, retry_after=None):
+        """
+        Adapts the bucket to a response.
+
+        :param code: HTTP status code of the response.
+        :type code: integer
+        :param retry_after: Raw ``Retry-After`` header value, if any.
+        :type retry_after: string
+        """
+        bucket = self.bucket(profile_id, host)
+        if code == 429:
+            with self._lock:
+                self._throttled[(profile_id, host)] += 1
+            bucket.throttle(self.decrease, self.min_rate, parse_retry_after(retry_after),
+                            self.cooldown)
+        elif code < 400 and bucket.rate < self.max_rate:
+            bucket.grow(self.increase * self.max_rate, self.max_rate)
+
+    def stats(self):
+        """Returns the current rate and 429 count per (profile Id, host)."""
+        with self._lock:
+            return {key: {'rate': bucket.rate, 'throttled': self._throttled[key]}
+                    for key, bucket in self._buckets.items()}
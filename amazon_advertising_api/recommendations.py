@@ -0,0 +1,228 @@
+"""
+Batched, concurrent bid and keyword recommendations.
+
+:class:`KeywordBidRecommender` packs keywords into bid recommendation
+requests of up to 100. :class:`KeywordRecommendationBatcher` asks for the
+keyword recommendations of many ASINs, once per ASIN and profile
+(marketplace), and keeps the answers for a while.
+"""
+from amazon_advertising_api.bulk import adispatch, chunk_responses, chunked, dispatch
+from amazon_advertising_api.cache import EntityCache
+from amazon_advertising_api.jsonlib import response_body
+from collections import OrderedDict
+
+# Keywords accepted by one keyword bid recommendations request.
+KEYWORD_BID_LIMIT = 100
+
+# Seconds keyword recommendations of an ASIN are reused.
+KEYWORD_RECOMMENDATION_TTL = 24 * 3600
+
+
+def _field(keyword, name):
+    if isinstance(keyword, dict):
+        return keyword.get(name)
+    return getattr(keyword, name, None)
+
+
+class KeywordBidRecommender(object):
+
+    """
+    Fetches bid recommendations for any number of keywords. Keywords are
+    grouped by ad group, packed into requests of up to KEYWORD_BID_LIMIT
+    and the requests are sent concurrently.
+    """
+
+    def __init__(self, api, chunk_size=KEYWORD_BID_LIMIT, max_workers=8):
+        """
+        :param api: Client used to send the requests.
+        :type api: AdvertisingApi
+        :param chunk_size: Maximum keywords per request.
+        :type chunk_size: integer
+        :param max_workers: Maximum requests in flight at once.
+        :type max_workers: integer
+        """
+        self.api = api
+        self.chunk_size = min(chunk_size, KEYWORD_BID_LIMIT)
+        self.max_workers = max_workers
+
+    def batches(self, keywords):
+        """
+        Groups **keywords** into ``(ad_group_id, keywords)`` batches; a
+        keyword Id listed twice is only sent once.
+        """
+        groups = OrderedDict()
+        seen = set()
+        for keyword in keywords:
+            keyword_id = _field(keyword, 'keywordId')
+            if keyword_id in seen:
+                continue
+            seen.add(keyword_id)
+            groups.setdefault(_field(keyword, 'adGroupId'), []).append(keyword)
+        return [(ad_group_id, chunk)
+                for ad_group_id, group in groups.items()
+                for chunk in chunked(group, self.chunk_size)]
+
+    def _send(self, batch):
+        ad_group_id, chunk = batch
+        data = {'adGroupId': ad_group_id,
+                'keywords': [{'keyword': _field(keyword, 'keywordText'),
+                              'matchType': _field(keyword, 'matchType')}
+                             for keyword in chunk]}
+        return self.api.get_keyword_bid_recommendations(keyword_data=data)
+
+    def run(self, keywords):
+        """
+        Requests bid recommendations for **keywords**.
+
+        :param keywords: Keywords with keywordId, adGroupId, keywordText
+            and matchType, as dictionaries or Keyword models.
+        :returns: dictionary with **success** (every request succeeded),
+            **code** 207, **batches**, **failed_batches** and **response**,
+            the recommendation of each keyword keyed by keywordId. Keywords
+            of a failed request get an error with the request's HTTP status.
+        """
+        batches = self.batches(keywords)
+        return _index(batches, dispatch(self._send, batches, self.max_workers))
+
+    async def arun(self, keywords):
+        """:meth:`run` for an :class:`AsyncAdvertisingApi`."""
+        batches = self.batches(keywords)
+        return _index(batches, await adispatch(self._send, batches, self.max_workers))
+
+
+def _recommendations(result):
+    """
+    Returns the recommendations of a result, or None if its body is not a
+    JSON object, e.g. an error page, so that its batch counts as failed.
+    """
+    try:
+        body = response_body(result)
+    except ValueError:
+        return None
+    if not isinstance(body, dict):
+        return None
+    return body.get('recommendations')
+
+
+def _index(batches, results):
+    chunks = [chunk for _, chunk in batches]
+    responses, failed = chunk_responses(chunks, results, _recommendations)
+    indexed = {}
+    for chunk, recommendations in zip(chunks, responses):
+        for keyword, recommendation in zip(chunk, recommendations):
+            indexed[_field(keyword, 'keywordId')] = recommendation
+    return {'success': failed == 0,
+            'code': 207,
+            'batches': len(batches),
+            'failed_batches': failed,
+            'response': indexed}
+
+
+class KeywordRecommendationBatcher(object):
+
+    """
+    Requests keyword recommendations for many ASINs. Each ASIN is requested
+    once per batch, answers are cached per profile (marketplace), ASIN and
+    options for **ttl** seconds, and the remaining ASINs are requested
+    concurrently. A batcher may be shared by clients of several profiles.
+    """
+
+    def __init__(self, api, ttl=KEYWORD_RECOMMENDATION_TTL, maxsize=10000, max_workers=8):
+        """
+        :param api: Client used to send the requests.
+        :type api: AdvertisingApi
+        :param ttl: Seconds to reuse the recommendations of an ASIN; 0
+            disables caching.
+        :type ttl: float
+        :param maxsize: Maximum number of cached ASINs.
+        :type maxsize: integer
+        :param max_workers: Maximum requests in flight at once.
+        :type max_workers: integer
+        """
+        self.api = api
+        self.max_workers = max_workers
+        self.cache = EntityCache(maxsize=maxsize, ttls={'recommendations': ttl})
+
+    def _client(self, profile_id):
+        if profile_id is None or profile_id == self.api.profile_id:
+            return self.api
+        return self.api.for_profile(profile_id)
+
+    def _plan(self, asins, profile_id, campaign_type, options):
+        """Returns the cached results by ASIN and the ASINs to request."""
+        profile_id = profile_id if profile_id is not None else self.api.profile_id
+        interface = '{}/recommendations/keyword'.format(campaign_type)
+        cached = {}
+        missing = []
+        for asin in OrderedDict.fromkeys(asins):
+            result, _ = self.cache.get(profile_id, interface, dict(options, asin=asin))
+            if result is not None:
+                cached[asin] = result
+            else:
+                missing.append(asin)
+        return profile_id, interface, cached, missing
+
+    def _store(self, profile_id, interface, options, asin, result):
+        self.cache.put(profile_id, interface, dict(options, asin=asin), result)
+
+    def run(self, asins, profile_id=None, campaign_type='sp', **options):
+        """
+        Requests keyword recommendations for **asins**.
+
+        :param asins: ASINs, duplicates allowed.
+        :type asins: list
+        :param profile_id: Profile (marketplace) to ask for; the client's
+            by default.
+        :type profile_id: string
+        :param campaign_type: Campaign type of the recommendations.
+        :type campaign_type: string
+        :param options: Other fields of the request, e.g. maxNumSuggestions.
+        :returns: dictionary with **success** (every request succeeded),
+            **code** 207, the numbers of **requests**, **cached** and
+            **failed** ASINs, and **response**, the result of each ASIN's
+            create_keyword_recommendations call keyed by ASIN.
+        """
+        profile_id, interface, results, missing = self._plan(asins, profile_id, campaign_type, options)
+        client = self._client(profile_id)
+
+        def send(asin):
+            return client.create_keyword_recommendations(dict(options, asins=[asin]),
+                                                         campaign_type=campaign_type)
+
+        fetched = dispatch(send, missing, self.max_workers)
+        return self._collect(profile_id, interface, options, results, missing, fetched)
+
+    async def arun(self, asins, profile_id=None, campaign_type='sp', **options):
+        """:meth:`run` for an :class:`AsyncAdvertisingApi`."""
+        profile_id, interface, results, missing = self._plan(asins, profile_id, campaign_type, options)
+        client = self._client(profile_id)
+
+        def send(asin):
+            return client.create_keyword_recommendations(dict(options, asins=[asin]),
+                                                         campaign_type=campaign_type)
+
+        fetched = await adispatch(send, missing, self.max_workers)
+        return self._collect(profile_id, interface, options, results, missing, fetched)
+
+    def _collect(self, profile_id, interface, options, results, missing, fetched):
+        cached = len(results)
+        failed = 0
+        for asin, result in zip(missing, fetched):
+            if result['success']:
+                self._store(profile_id, interface, options, asin, result)
+            else:
+                failed += 1
+            results[asin] = result
+        return {'success': failed == 0,
+                'code': 207,
+                'requests': len(missing),
+                'cached': cached,
+                'failed': failed,
+                'response': results}
+
+    def stats(self):
+        """Returns the cache's hit, miss and eviction counts."""
+        return self.cache.stats()
+
+    def clear(self):
+        self.cache.clear()
@@ -4,3 +4,10 @@ regions = {'na': {'sandbox': 'advertising-api-test.amazon.com',
            'eu': {'sandbox': 'advertising-api-test.amazon.com',
                   'prod': 'advertising-api-eu.amazon.com',
                   'token_url': 'api.amazon.com/auth/o2/token'}}
+
+
+def base_url(host):
+    """Returns **host** as a URL, using https unless it names a scheme."""
+    if '://' in host:
+        return host.rstrip('/')
+    return 'https://{}'.format(host)
@@ -0,0 +1,48 @@
+"""Concurrent report request, polling and download."""
+from amazon_advertising_api.pipeline import Pipeline
+from collections import namedtuple
+
+ReportSpec = namedtuple('ReportSpec', ['record_type', 'report_date', 'metrics',
+                                       'campaign_type', 'segment', 'extra'])
+ReportSpec.__new__.__defaults__ = ('sp', None, None)
+ReportSpec.__doc__ = """
+Describes one report.
+
+:param record_type: e.g. 'campaigns', 'adGroups', 'keywords', 'productAds'.
+:param report_date: Day of the report as YYYYMMDD.
+:param metrics: List of metric names, or a comma-separated string.
+:param campaign_type: 'sp' or 'hsa'. Defaults to 'sp'.
+:param segment: Optional segment, e.g. 'query'.
+:param extra: Optional dictionary of further request fields.
+"""
+
+
+class ReportPipeline(Pipeline):
+
+    """
+    Requests many reports at once, polls every pending report in one loop
+    and downloads completed ones concurrently::
+
+        specs = [ReportSpec(record_type, day, metrics)
+                 for day in days for record_type in record_types]
+        for spec, res in ReportPipeline(api).run(specs):
+            ...
+    """
+
+    def _request(self, spec):
+        metrics = spec.metrics
+        if not isinstance(metrics, str):
+            metrics = ','.join(metrics)
+        data = {'reportDate': spec.report_date, 'metrics': metrics}
+        if spec.segment is not None:
+            data['segment'] = spec.segment
+        if spec.extra:
+            data.update(spec.extra)
+        return self.api.request_report(record_type=spec.record_type, data=data,
+                                       campaign_type=spec.campaign_type)
+
+    def _job_id(self, body):
+        return body['reportId']
+
+    def _status(self, report_id, spec):
+        return self.api.request_report(report_id=report_id)
@@ -0,0 +1,119 @@
+"""Retry policy with capped exponential backoff and full jitter."""
+from amazon_advertising_api.rate_limit import parse_retry_after
+import asyncio
+import http.client
+import random
+import socket
+import threading
+import urllib.error
+
+TRANSIENT_ERRORS = (urllib.error.URLError,
+                    http.client.HTTPException,
+                    ConnectionError,
+                    socket.timeout,
+                    asyncio.IncompleteReadError)
+
+
+class RetryPolicy(object):
+
+    """
+    Decides whether a failed request is retried and how long to wait first.
+
+    429 and 5xx responses, connection resets and timeouts are retried for
+    idempotent methods. POST requests are only retried when **retry_post** is
+    set or the caller marks the call as idempotent.
+    """
+
+    def __init__(self,
+                 max_attempts=3,
+                 backoff_base=0.5,
+                 backoff_cap=30.0,
+                 retry_statuses=(429, 500, 502, 503, 504),
+                 retry_methods=('GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS'),
+                 retry_post=False,
+                 respect_retry_after=True):
+        """
+        :param max_attempts: Total attempts, including the first one.
+        :type max_attempts: integer
+        :param backoff_base: Backoff for the first retry, in seconds; doubles
+            on every further attempt.
+        :type backoff_base: float
+        :param backoff_cap: Upper bound on the backoff, in seconds.
+        :type backoff_cap: float
+        :param retry_statuses: HTTP statuses treated as transient.
+        :type retry_statuses: tuple
+        :param retry_methods: HTTP methods that are safe to repeat.
+        :type retry_methods: tuple
+        :param retry_post: Also retry POST requests.
+        :type retry_post: boolean
+        :param respect_retry_after: Wait at least as long as a Retry-After
+            header asks for.
+        :type respect_retry_after: boolean
+        """
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_methods = frozenset(m.upper() for m in retry_methods)
+        self.retry_post = retry_post
+        self.respect_retry_after = respect_retry_after
+        self._lock = threading.Lock()
+        self._stats = {'retries': 0, 'gave_up': 0, 'by_reason': {}}
+
+    def is_idempotent(self, method):
+        method = method.upper()
+        return method in self.retry_methods or (method == 'POST' and self.retry_post)
+
+    def backoff(self, attempt):
+        """Full-jitter backoff before retry number ``attempt + 1``."""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def next_delay(self, method, attempt, error, idempotent=None):
+        """
+        Returns the seconds to wait before retrying, or None to give up.
+
+        :param method: HTTP method of the failed request.
+        :type method: string
+        :param attempt: Number of retries already made.
+        :type attempt: integer
+        :param error: The exception raised by the attempt.
+        :param idempotent: Overrides the per-method idempotency rule.
+        :type idempotent: boolean
+        """
+        if isinstance(error, urllib.error.HTTPError):
+            if error.code not in self.retry_statuses:
+                return None
+            reason = error.code
+        elif isinstance(error, TRANSIENT_ERRORS):
+            reason = type(error).__name__
+        else:
+            return None
+
+        if idempotent is None:
+            idempotent = self.is_idempotent(method)
+        if not idempotent:
+            return None
+
+        if attempt + 1 >= self.max_attempts:
+            with self._lock:
+                self._stats['gave_up'] += 1
+            return None
+
+        delay = self.backoff(attempt)
+        if self.respect_retry_after and isinstance(error, urllib.error.HTTPError):
+            retry_after = parse_retry_after(error.headers.get('Retry-After'))
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+
+        with self._lock:
+            self._stats['retries'] += 1
+            by_reason = self._stats['by_reason']
+            by_reason[reason] = by_reason.get(reason, 0) + 1
+        return delay
+
+    def stats(self):
+        """Returns the total retries, give-ups and retries per reason."""
+        with self._lock:
+            return {'retries': self._stats['retries'],
+                    'gave_up': self._stats['gave_up'],
+                    'by_reason': dict(self._stats['by_reason'])}
@@ -0,0 +1,86 @@
+"""Concurrent snapshot request, polling and entity streaming."""
+from amazon_advertising_api.pipeline import Pipeline
+from collections import namedtuple
+import threading
+
+RECORD_TYPES = ('campaigns', 'adGroups', 'keywords', 'negativeKeywords',
+                'productAds', 'targets')
+
+SnapshotSpec = namedtuple('SnapshotSpec', ['record_type', 'campaign_type', 'state_filter'])
+SnapshotSpec.__new__.__defaults__ = ('sp', None)
+
+
+class SnapshotPipeline(Pipeline):
+
+    """
+    Requests snapshots for several record types at once, polls them together
+    and streams each finished snapshot's entities into a sink::
+
+        def sink(record_type, entity):
+            store[record_type][entity['campaignId']] = entity
+
+        SnapshotPipeline(api).mirror(sink)
+
+    The sink is called from worker threads, one call at a time.
+    """
+
+    def __init__(self, api, sink=None, **kwargs):
+        """
+        Accepts the same arguments as :class:`Pipeline`, plus:
+
+        :param sink: Callable taking ``(record_type, entity)``. When given,
+            entities are streamed into it and each result's **response** is
+            the number of entities delivered.
+        """
+        super(SnapshotPipeline, self).__init__(api, **kwargs)
+        self.sink = sink
+        self._sink_lock = threading.Lock()
+
+    def _request(self, spec):
+        data = None
+        if spec.state_filter is not None:
+            data = {'stateFilter': spec.state_filter}
+        return self.api.request_snapshot(record_type=spec.record_type, data=data,
+                                         campaign_type=spec.campaign_type)
+
+    def _job_id(self, body):
+        return body['snapshotId']
+
+    def _status(self, snapshot_id, spec):
+        return self.api.request_snapshot(snapshot_id=snapshot_id,
+                                         campaign_type=spec.campaign_type)
+
+    def _download(self, spec, location):
+        if self.sink is None:
+            return super(SnapshotPipeline, self)._download(spec, location)
+
+        res = self.api._download(location, stream=True)
+        if res['success']:
+            count = 0
+            for entity in res['response']:
+                with self._sink_lock:
+                    self.sink(spec.record_type, entity)
+                count += 1
+            res['response'] = count
+        return res
+
+    def mirror(self, sink=None, record_types=RECORD_TYPES, campaign_type='sp', state_filter=None):
+        """
+        Snapshots every record type and streams the entities into **sink**.
+
+        :param sink: Callable taking ``(record_type, entity)``. Defaults to
+            the pipeline's sink.
+        :param record_types: Record types to snapshot.
+        :type record_types: list
+        :param campaign_type: 'sp' or 'hsa'.
+        :type campaign_type: string
+        :param state_filter: Optional comma-separated states, e.g.
+            'enabled,paused'.
+        :type state_filter: string
+        :returns: dictionary of results keyed by record type.
+        """
+        if sink is not None:
+            self.sink = sink
+        specs = [SnapshotSpec(record_type, campaign_type, state_filter)
+                 for record_type in record_types]
+        return {spec.record_type: res for spec, res in self.run(specs)}
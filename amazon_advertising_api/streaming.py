@@ -0,0 +1,190 @@
+"""Chunked gzip decompression and incremental JSON array parsing."""
+import codecs
+import json
+import zlib
+
+CHUNK_SIZE = 64 * 1024
+
+# Characters that can start, and make up, a JSON number.
+_NUMBER_START = frozenset('-0123456789')
+_NUMBER_CHARS = frozenset('-+0123456789.eE')
+
+
+def iter_chunks(response, chunk_size=CHUNK_SIZE):
+    """Reads a response body in ``chunk_size`` pieces and closes it."""
+    try:
+        while True:
+            chunk = response.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    finally:
+        response.close()
+
+
+class Gunzip(object):
+
+    """Incremental gzip decompressor that also handles concatenated members."""
+
+    def __init__(self):
+        self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def decompress(self, chunk):
+        """Returns the bytes decompressed from **chunk**, possibly empty."""
+        parts = []
+        while chunk:
+            data = self._decompressor.decompress(chunk)
+            if data:
+                parts.append(data)
+            if self._decompressor.eof:
+                chunk = self._decompressor.unused_data
+                self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            else:
+                chunk = b''
+        return b''.join(parts)
+
+    def flush(self):
+        return self._decompressor.flush()
+
+
+class JsonArrayParser(object):
+
+    """
+    Incremental parser for the elements of a top-level JSON array.
+
+    Bytes are passed to :meth:`feed`, which returns the elements they
+    complete; **done** is set once the closing bracket has been read.
+    """
+
+    def __init__(self, encoding='utf-8'):
+        self.done = False
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder(encoding)()
+        self._buf = ''
+        self._started = False
+
+    def feed(self, data, final=False):
+        """
+        Adds **data** and returns the list of elements parsed so far.
+
+        :param final: No more data follows.
+        :type final: boolean
+        :raises ValueError: if the document is not a JSON array, or is
+            incomplete when **final** is set.
+        """
+        if self.done:
+            return []
+        buf = self._buf + self._text_decoder.decode(data, final)
+        raw_decode = self._decoder.raw_decode
+        size = len(buf)
+        pos = 0
+        values = []
+        while True:
+            while pos < size and buf[pos] in ' \t\r\n':
+                pos += 1
+            if pos == size:
+                if final:
+                    raise ValueError('Unexpected end of JSON array.')
+                break
+
+            char = buf[pos]
+            if char == ',':
+                pos += 1
+                continue
+            if not self._started:
+                if char != '[':
+                    raise ValueError('Expected a JSON array.')
+                self._started = True
+                pos += 1
+                continue
+            if char == ']':
+                self.done = True
+                pos += 1
+                break
+
+            if char in _NUMBER_START and not final:
+                # A number may go on in the next chunk, even after a '.' or
+                # an 'e'; wait until something follows it.
+                end = pos
+                while end < size and buf[end] in _NUMBER_CHARS:
+                    end += 1
+                if end == size:
+                    break
+            try:
+                value, pos_end = raw_decode(buf, pos)
+            except ValueError:
+                if final:
+                    raise
+                break
+            values.append(value)
+            pos = pos_end
+        self._buf = buf[pos:]
+        return values
+
+
+def iter_gunzip(chunks):
+    """
+    Decompresses an iterable of gzip byte chunks, including concatenated
+    gzip members, without holding the whole body.
+    """
+    gunzip = Gunzip()
+    for chunk in chunks:
+        data = gunzip.decompress(chunk)
+        if data:
+            yield data
+    data = gunzip.flush()
+    if data:
+        yield data
+
+
+def iter_json_array(chunks, encoding='utf-8'):
+    """
+    Yields the elements of a top-level JSON array as they are parsed from an
+    iterable of byte chunks.
+
+    :raises ValueError: if the document is not a JSON array.
+    """
+    parser = JsonArrayParser(encoding)
+    for chunk in chunks:
+        for value in parser.feed(chunk):
+            yield value
+        if parser.done:
+            return
+    for value in parser.feed(b'', final=True):
+        yield value
+
+
+async def aiter_chunks(response, chunk_size=CHUNK_SIZE):
+    """Async version of :func:`iter_chunks` for streamed async responses."""
+    try:
+        while True:
+            chunk = await response.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    finally:
+        response.close()
+
+
+async def aiter_gunzip(chunks):
+    """Async version of :func:`iter_gunzip`."""
+    gunzip = Gunzip()
+    async for chunk in chunks:
+        data = gunzip.decompress(chunk)
+        if data:
+            yield data
+    data = gunzip.flush()
+    if data:
+        yield data
+
+
+async def aiter_json_array(chunks, encoding='utf-8'):
+    """Async version of :func:`iter_json_array`."""
+    parser = JsonArrayParser(encoding)
+    async for chunk in chunks:
+        for value in parser.feed(chunk):
+            yield value
+        if parser.done:
+            return
+    for value in parser.feed(b'', final=True):
+        yield value
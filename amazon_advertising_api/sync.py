@@ -0,0 +1,338 @@
+"""
+Incremental mirror of the entities of advertising profiles.
+
+Campaigns, and the record types in **detect_changes** (ad groups by
+default), are listed in full on every run; their ``lastUpdatedDate`` is
+compared with the profile's cursor, and only the ad groups, keywords,
+targets, ... of campaigns with a change since the last run are re-listed,
+using ``campaignIdFilter``. When too many campaigns changed, or on the first
+run, the children are re-loaded from snapshots instead.
+
+Changes to a child entity do not always move its campaign's
+``lastUpdatedDate``. Edits to record types outside **detect_changes**, such
+as keywords and targets by default, are only seen by an incremental run if
+the campaign is marked with :meth:`AccountSync.touch`; its summary lists
+them as **unchecked**. The periodic full sync, once per
+**full_sync_interval** (a day by default), picks up the rest.
+"""
+from amazon_advertising_api.deadline import propagate
+from amazon_advertising_api.exceptions import AdvertisingApiError
+from amazon_advertising_api.fanout import ProfileExecutor
+from amazon_advertising_api.snapshots import SnapshotPipeline
+from concurrent.futures import ThreadPoolExecutor
+import itertools
+import json
+import threading
+import time
+
+# Record type -> (extended list iterator, Id field, takes campaign_type).
+CHILD_TYPES = {'adGroups': ('iter_ad_groups_ex', 'adGroupId', True),
+               'keywords': ('iter_biddable_keywords_ex', 'keywordId', False),
+               'negativeKeywords': ('iter_negative_keywords_ex', 'keywordId', False),
+               'productAds': ('iter_product_ads_ex', 'adId', True),
+               'targets': ('iter_targets_ex', 'targetId', False)}
+
+ID_FIELDS = dict({'campaigns': 'campaignId'},
+                 **{record_type: spec[1] for record_type, spec in CHILD_TYPES.items()})
+
+ALL_STATES = 'enabled,paused,archived'
+
+# Seconds after which a profile's next sync is a full one.
+DEFAULT_FULL_SYNC_INTERVAL = 24 * 3600
+
+
+class MemoryStore(object):
+
+    """
+    Entities and sync cursors per profile, held in memory. :meth:`save` and
+    :meth:`load` persist them as JSON between runs.
+    """
+
+    def __init__(self):
+        self._profiles = {}
+        self._lock = threading.Lock()
+
+    def _profile(self, profile_id):
+        profile = self._profiles.get(profile_id)
+        if profile is None:
+            profile = self._profiles[profile_id] = {'cursor': None, 'entities': {}}
+        return profile
+
+    def cursor(self, profile_id):
+        """Returns the cursor saved by the last sync of **profile_id**, or None."""
+        with self._lock:
+            cursor = self._profile(profile_id)['cursor']
+            return dict(cursor) if cursor is not None else None
+
+    def set_cursor(self, profile_id, cursor):
+        with self._lock:
+            self._profile(profile_id)['cursor'] = dict(cursor)
+
+    def entities(self, profile_id, record_type):
+        """Returns the stored entities of **record_type** keyed by Id."""
+        with self._lock:
+            return dict(self._profile(profile_id)['entities'].get(record_type, {}))
+
+    def replace(self, profile_id, record_type, entities, campaign_ids=None):
+        """
+        Replaces stored entities with **entities**.
+
+        :param campaign_ids: Only replace the entities of these campaigns;
+            by default every entity of the record type is replaced.
+        :type campaign_ids: set
+        """
+        id_field = ID_FIELDS[record_type]
+        with self._lock:
+            stored = self._profile(profile_id)['entities'].setdefault(record_type, {})
+            if campaign_ids is None:
+                stored.clear()
+            else:
+                for entity_id in [entity_id for entity_id, entity in stored.items()
+                                  if entity.get('campaignId') in campaign_ids]:
+                    del stored[entity_id]
+            for entity in entities:
+                stored[entity[id_field]] = entity
+
+    def prune(self, profile_id, campaign_ids):
+        """Drops child entities of campaigns not in **campaign_ids**."""
+        with self._lock:
+            for record_type, stored in self._profile(profile_id)['entities'].items():
+                if record_type == 'campaigns':
+                    continue
+                for entity_id in [entity_id for entity_id, entity in stored.items()
+                                  if entity.get('campaignId') not in campaign_ids]:
+                    del stored[entity_id]
+
+    def save(self, path):
+        with self._lock:
+            data = {str(profile_id): {'cursor': profile['cursor'],
+                                      'entities': {record_type: list(stored.values())
+                                                   for record_type, stored in profile['entities'].items()}}
+                    for profile_id, profile in self._profiles.items()}
+        with open(path, 'w') as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, path):
+        store = cls()
+        with open(path) as f:
+            data = json.load(f)
+        for profile_id, profile in data.items():
+            if profile['cursor']:
+                store.set_cursor(profile_id, profile['cursor'])
+            for record_type, entities in profile['entities'].items():
+                store.replace(profile_id, record_type, entities)
+        return store
+
+
+class AccountSync(object):
+
+    """
+    Keeps a store of each profile's entities up to date.
+
+    An incremental run only notices an edit when the edited entity is a
+    campaign, is of a record type in **detect_changes**, or belongs to a
+    campaign passed to :meth:`touch`. Mirrored record types whose own edits
+    can go unnoticed are listed in the summary's **unchecked** entry; add
+    them to **detect_changes** to check them on every run, at the cost of
+    listing them in full.
+    """
+
+    def __init__(self,
+                 api,
+                 store=None,
+                 record_types=('adGroups', 'keywords', 'targets'),
+                 detect_changes=('adGroups',),
+                 campaign_type='sp',
+                 state_filter=ALL_STATES,
+                 max_changed_ratio=0.25,
+                 max_changed_campaigns=None,
+                 full_sync_interval=DEFAULT_FULL_SYNC_INTERVAL,
+                 filter_chunk_size=100,
+                 page_size=1000,
+                 max_workers=4,
+                 snapshot_options=None):
+        """
+        :param api: Client whose settings every profile's client shares.
+        :type api: AdvertisingApi
+        :param store: Where entities and cursors are kept; a new
+            MemoryStore by default.
+        :param record_types: Child record types to mirror, from CHILD_TYPES.
+        :type record_types: tuple
+        :param detect_changes: Record types listed in full on every run so
+            that their own edits are detected by ``lastUpdatedDate``, not
+            only edits to their campaign. Types not in **record_types** are
+            ignored.
+        :type detect_changes: tuple
+        :param campaign_type: 'sp' or 'hsa'.
+        :type campaign_type: string
+        :param state_filter: States to mirror. Include 'archived' so that
+            archived entities are replaced rather than left stale.
+        :type state_filter: string
+        :param max_changed_ratio: Fraction of changed campaigns above which
+            a full snapshot sync is done instead.
+        :type max_changed_ratio: float
+        :param max_changed_campaigns: Optional absolute limit of changed
+            campaigns for an incremental sync.
+        :type max_changed_campaigns: integer
+        :param full_sync_interval: Seconds after which the next sync of a
+            profile is a full one, so that child changes that did not move
+            their campaign's lastUpdatedDate are caught. None disables it;
+            the store can then drift unless every such change is reported
+            with touch().
+        :type full_sync_interval: float
+        :param filter_chunk_size: Campaign Ids per campaignIdFilter.
+        :type filter_chunk_size: integer
+        :param page_size: Records requested per page.
+        :type page_size: integer
+        :param max_workers: Concurrent list requests per profile.
+        :type max_workers: integer
+        :param snapshot_options: Extra SnapshotPipeline arguments, e.g.
+            poll_interval.
+        :type snapshot_options: dictionary
+        """
+        self.api = api
+        self.store = store if store is not None else MemoryStore()
+        self.record_types = tuple(record_types)
+        self.detect_changes = tuple(record_type for record_type in detect_changes
+                                    if record_type in self.record_types)
+        self.campaign_type = campaign_type
+        self.state_filter = state_filter
+        self.max_changed_ratio = max_changed_ratio
+        self.max_changed_campaigns = max_changed_campaigns
+        self.full_sync_interval = full_sync_interval
+        self.filter_chunk_size = filter_chunk_size
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self.snapshot_options = dict(snapshot_options or {})
+        self._touched = {}
+        self._lock = threading.Lock()
+
+    def touch(self, profile_id, campaign_ids):
+        """Marks campaigns whose children must be re-listed on the next sync."""
+        with self._lock:
+            self._touched.setdefault(profile_id, set()).update(campaign_ids)
+
+    def sync(self, profile_id, full=False):
+        """
+        Brings the store up to date for **profile_id**.
+
+        :param full: Re-load every child entity from snapshots.
+        :type full: boolean
+        :returns: dictionary with **profile_id**, **mode** ('full' or
+            'incremental'), **campaigns**, **changed_campaigns**, the number
+            of **entities** fetched per record type, the record types whose
+            own edits this run could not see (**unchecked**) and **seconds**.
+        :raises AdvertisingApiError: when a request fails; the cursor is then
+            left where it was so the next run retries.
+        """
+        return self._sync(self.api.for_profile(profile_id), full)
+
+    def sync_all(self, profile_ids, full=False, max_workers=4):
+        """
+        Syncs several profiles concurrently.
+
+        :returns: generator of ``(profile_id, summary)`` in completion order;
+            a failed profile's summary is an error result.
+        """
+        executor = ProfileExecutor(self.api, max_workers=max_workers)
+        return executor.map(profile_ids, lambda client: self._sync(client, full))
+
+    def _sync(self, client, full):
+        start = time.monotonic()
+        profile_id = client.profile_id
+        cursor = self.store.cursor(profile_id)
+        with self._lock:
+            touched = self._touched.pop(profile_id, set())
+
+        try:
+            campaigns = list(client.iter_campaigns_ex(
+                data={'stateFilter': self.state_filter}, campaign_type=self.campaign_type,
+                page_size=self.page_size))
+            listed = [self._list(client, record_type, {'stateFilter': self.state_filter})
+                      for record_type in self.detect_changes]
+            since = cursor['lastUpdatedDate'] if cursor else None
+            changed = set(touched)
+            for entity in itertools.chain(campaigns, *listed):
+                if since is None or (entity.get('lastUpdatedDate') or 0) > since:
+                    changed.add(entity['campaignId'])
+
+            now = time.time()
+            if full or cursor is None or self._too_many(len(changed), len(campaigns)) or (
+                    self.full_sync_interval is not None
+                    and now - cursor.get('full_sync_at', 0) > self.full_sync_interval):
+                mode = 'full'
+                fetched = self._full(client)
+                full_sync_at = now
+            else:
+                mode = 'incremental'
+                fetched = self._incremental(client, sorted(changed))
+                full_sync_at = cursor.get('full_sync_at')
+        except Exception:
+            with self._lock:
+                self._touched.setdefault(profile_id, set()).update(touched)
+            raise
+
+        self.store.replace(profile_id, 'campaigns', campaigns)
+        self.store.prune(profile_id, {campaign['campaignId'] for campaign in campaigns})
+        last_updated = max([entity.get('lastUpdatedDate') or 0
+                            for entity in itertools.chain(campaigns, *listed)]
+                           + [since or 0])
+        self.store.set_cursor(profile_id, {'lastUpdatedDate': last_updated,
+                                           'synced_at': now,
+                                           'full_sync_at': full_sync_at})
+        fetched['campaigns'] = len(campaigns)
+        return {'profile_id': profile_id,
+                'mode': mode,
+                'campaigns': len(campaigns),
+                'changed_campaigns': len(changed) if mode == 'incremental' else len(campaigns),
+                'entities': fetched,
+                'unchecked': [record_type for record_type in self.record_types
+                              if mode == 'incremental' and record_type not in self.detect_changes],
+                'seconds': round(time.monotonic() - start, 3)}
+
+    def _too_many(self, changed, total):
+        if self.max_changed_campaigns is not None and changed > self.max_changed_campaigns:
+            return True
+        return total > 0 and changed > self.max_changed_ratio * total
+
+    def _full(self, client):
+        pipeline = SnapshotPipeline(client, **self.snapshot_options)
+        results = pipeline.mirror(record_types=self.record_types,
+                                  campaign_type=self.campaign_type,
+                                  state_filter=self.state_filter)
+        fetched = {}
+        for record_type in self.record_types:
+            result = results.get(record_type)
+            if result is None or not result['success']:
+                raise AdvertisingApiError(result or {'success': False, 'code': 0,
+                                                     'response': 'No {} snapshot.'.format(record_type)})
+            self.store.replace(client.profile_id, record_type, result['response'])
+            fetched[record_type] = len(result['response'])
+        return fetched
+
+    def _list(self, client, record_type, data):
+        """Lists the extended entities of **record_type** matching **data**."""
+        name, _, typed = CHILD_TYPES[record_type]
+        kwargs = {'campaign_type': self.campaign_type} if typed else {}
+        return list(getattr(client, name)(data=data, page_size=self.page_size, **kwargs))
+
+    def _incremental(self, client, campaign_ids):
+        chunks = [campaign_ids[i:i + self.filter_chunk_size]
+                  for i in range(0, len(campaign_ids), self.filter_chunk_size)]
+        tasks = [(record_type, chunk) for record_type in self.record_types for chunk in chunks]
+
+        def fetch(task):
+            record_type, chunk = task
+            data = {'campaignIdFilter': ','.join(str(campaign_id) for campaign_id in chunk),
+                    'stateFilter': self.state_filter}
+            return self._list(client, record_type, data)
+
+        fetched = dict.fromkeys(self.record_types, 0)
+        if not tasks:
+            return fetched
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(tasks))) as executor:
+            for (record_type, chunk), entities in zip(tasks, executor.map(propagate(fetch), tasks)):
+                self.store.replace(client.profile_id, record_type, entities, set(chunk))
+                fetched[record_type] += len(entities)
+        return fetched
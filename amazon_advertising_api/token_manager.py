@@ -0,0 +1,198 @@
+from amazon_advertising_api.connection_pool import PoolManager
+from amazon_advertising_api.deadline import check_deadline
+from amazon_advertising_api.exceptions import AdvertisingApiError
+from amazon_advertising_api.regions import base_url, regions
+import json
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+
+class TokenManager(object):
+
+    """
+    Thread-safe access token cache that can be shared by many clients.
+
+    The token is refreshed shortly before it expires. Only one thread calls
+    the token URL at a time; the others keep using the current token while it
+    is still valid, or wait for the refresh to finish.
+    """
+
+    def __init__(self,
+                 client_id,
+                 client_secret,
+                 refresh_token,
+                 region='na',
+                 access_token=None,
+                 expires_in=None,
+                 refresh_margin=60,
+                 pool_manager=None,
+                 retry_policy=None,
+                 token_url=None):
+        """
+        :param client_id: Login with Amazon client Id.
+        :type client_id: string
+        :param client_secret: Login with Amazon client secret key.
+        :type client_secret: string
+        :param refresh_token: The refresh token for the advertiser account.
+        :type refresh_token: string
+        :param region: Region code used to look up the token URL.
+        :type region: string
+        :param access_token: Optional access token to start with.
+        :type access_token: string
+        :param expires_in: Seconds until **access_token** expires. Unknown
+            expiry is treated as valid until the API rejects the token.
+        :type expires_in: integer
+        :param refresh_margin: Seconds before expiry at which the token is
+            proactively refreshed.
+        :type refresh_margin: float
+        :param pool_manager: Optional PoolManager for the token requests.
+        :type pool_manager: PoolManager
+        :param retry_policy: Optional RetryPolicy for the token requests.
+        :type retry_policy: RetryPolicy
+        :param token_url: Optional token host and path, or URL, overriding
+            the region's token URL.
+        :type token_url: string
+        """
+        if region not in regions:
+            raise KeyError('Region {} not found in regions.'.format(region))
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.refresh_token = urllib.parse.unquote(refresh_token)
+        self.token_url = token_url or regions[region]['token_url']
+        self.refresh_margin = refresh_margin
+        self.pool_manager = pool_manager or PoolManager(maxsize=2)
+        self.retry_policy = retry_policy
+
+        self._access_token = None
+        self._expires_at = None
+        if access_token:
+            self._set_token(urllib.parse.unquote(access_token), expires_in)
+
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self.refresh_count = 0
+
+    def _set_token(self, access_token, expires_in):
+        self._access_token = access_token
+        if expires_in is None:
+            self._expires_at = None
+        else:
+            self._expires_at = time.monotonic() + float(expires_in)
+
+    def _is_valid(self, margin=0):
+        if self._access_token is None:
+            return False
+        if self._expires_at is None:
+            return True
+        return time.monotonic() < self._expires_at - margin
+
+    @property
+    def access_token(self):
+        return self._access_token
+
+    @access_token.setter
+    def access_token(self, value):
+        """Set access_token with unknown expiry."""
+        with self._lock:
+            self._set_token(value, None)
+
+    def get_token(self):
+        """
+        Returns a valid access token, refreshing it when needed.
+
+        :raises AdvertisingApiError: if no valid token is held and the
+            refresh fails.
+        """
+        if self._is_valid(self.refresh_margin):
+            return self._access_token
+
+        if self._is_valid():
+            # Still usable: refresh proactively unless another thread already
+            # is, in which case keep using the current token.
+            if not self._refresh_lock.acquire(blocking=False):
+                return self._access_token
+        else:
+            self._refresh_lock.acquire()
+
+        try:
+            if self._is_valid(self.refresh_margin):
+                return self._access_token
+            result = self._request_token()
+            if not result['success'] and not self._is_valid():
+                raise AdvertisingApiError(result)
+            return self._access_token
+        finally:
+            self._refresh_lock.release()
+
+    def invalidate(self, access_token):
+        """
+        Marks **access_token** as rejected, e.g. after a 401. Has no effect
+        if the token was already replaced by another thread.
+        """
+        with self._lock:
+            if access_token == self._access_token:
+                self._expires_at = 0
+
+    def refresh(self):
+        """
+        Forces a refresh, unless another thread has just done one.
+
+        :returns: dictionary with **success**, **code** and **response**.
+        """
+        stale = self._access_token
+        with self._refresh_lock:
+            if self._access_token != stale and self._is_valid(self.refresh_margin):
+                return {'success': True,
+                        'code': 200,
+                        'response': self._access_token}
+            return self._request_token()
+
+    def _request_token(self):
+        params = {
+            'grant_type': 'refresh_token',
+            'refresh_token': self.refresh_token,
+            'client_id': self.client_id,
+            'client_secret': self.client_secret}
+
+        req = urllib.request.Request(
+            url=base_url(self.token_url),
+            data=urllib.parse.urlencode(params).encode('utf-8'),
+            headers={'Content-Type': 'application/x-www-form-urlencoded'})
+
+        retries = 0
+        while True:
+            try:
+                f = self.pool_manager.urlopen(req)
+                response = f.read().decode('utf-8')
+                break
+            except Exception as e:
+                delay = None
+                if self.retry_policy is not None:
+                    delay = self.retry_policy.next_delay('POST', retries, e, idempotent=True)
+                if delay is None:
+                    if isinstance(e, urllib.error.HTTPError):
+                        return {'success': False,
+                                'code': e.code,
+                                'response': '{msg}: {details}'.format(msg=e.msg, details=e.read())}
+                    raise
+                check_deadline(delay)
+                time.sleep(delay)
+                retries += 1
+
+        if 'access_token' not in response:
+            return {'success': False,
+                    'code': f.code,
+                    'response': 'access_token not in response.'}
+
+        json_data = json.loads(response)
+        with self._lock:
+            self._set_token(json_data['access_token'], json_data.get('expires_in'))
+            if json_data.get('refresh_token'):
+                self.refresh_token = json_data['refresh_token']
+            self.refresh_count += 1
+        return {'success': True,
+                'code': f.code,
+                'response': self._access_token}
@@ -0,0 +1,388 @@
+"""
+Benchmarks for the client against a local FakeAdvertisingServer.
+
+Measures the per-call overhead of ``_operation``, sustained requests per
+second for list and bulk workloads, and the peak RSS of ``_download``.
+Results are written as JSON; with ``--baseline`` a previous result file is
+compared and the run fails on regressions::
+
+    python benchmarks/bench_client.py --output before.json
+    python benchmarks/bench_client.py --baseline before.json
+"""
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import platform
+import queue as queue_module
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from amazon_advertising_api import versions  # noqa: E402
+from amazon_advertising_api.advertising_api import AdvertisingApi  # noqa: E402
+from amazon_advertising_api.bulk import DEFAULT_CHUNK_SIZE, chunked  # noqa: E402
+from amazon_advertising_api.fake_server import FakeAdvertisingServer  # noqa: E402
+from amazon_advertising_api.jsonlib import BACKEND  # noqa: E402
+
+MB = 1024 * 1024
+
+
+class _StaticResponse(object):
+
+    def __init__(self, body):
+        self.code = 200
+        self.headers = {}
+        self._body = io.BytesIO(body)
+
+    def read(self, amt=None):
+        return self._body.read(amt)
+
+
+class _StaticPoolManager(object):
+
+    """Answers every request with the same body without touching the network."""
+
+    def __init__(self, body):
+        self.body = body
+
+    def urlopen(self, req):
+        return _StaticResponse(self.body)
+
+    def stats(self):
+        return {}
+
+
+def _client(endpoint='http://127.0.0.1:1', **kwargs):
+    kwargs.setdefault('access_token', 'bench-access-token')
+    return AdvertisingApi('bench-client-id', 'bench-client-secret', 'na',
+                          profile_id='1', endpoint=endpoint,
+                          token_url=endpoint + '/auth/o2/token', **kwargs)
+
+
+def _per_call(fn, number, repeat):
+    """Returns the best and median microseconds per call of **fn**."""
+    times = timeit.repeat(fn, number=number, repeat=repeat)
+    per_call = [t / number * 1e6 for t in times]
+    return {'best_us': round(min(per_call), 3),
+            'median_us': round(statistics.median(per_call), 3)}
+
+
+def bench_overhead(number=2000, repeat=5, page_size=100):
+    """Client-side cost of one call, excluding the network."""
+    entity = {'keywordId': 123456789012, 'campaignId': 223456789012,
+              'adGroupId': 323456789012, 'keywordText': 'running shoes',
+              'matchType': 'exact', 'state': 'enabled', 'bid': 1.25}
+    items = [dict(entity, keywordId=entity['keywordId'] + i) for i in range(page_size)]
+    body = json.dumps(items).encode('utf-8')
+    text = body.decode('utf-8')
+    api = _client(pool_manager=_StaticPoolManager(body))
+    parsing_api = _client(pool_manager=_StaticPoolManager(body), parse_responses=True)
+    params = {'startIndex': 0, 'count': page_size, 'stateFilter': 'enabled'}
+
+    return {
+        'page_size': page_size,
+        'response_bytes': len(body),
+        'prepare_get': _per_call(
+            lambda: api._prepare_operation('sp/keywords', params, 'GET'), number, repeat),
+        'prepare_put': _per_call(
+            lambda: api._prepare_operation('sp/keywords', items, 'PUT'), number // 10, repeat),
+        'json_dumps': _per_call(
+            lambda: json.dumps(items).encode('utf-8'), number // 10, repeat),
+        'decode': _per_call(lambda: body.decode('utf-8'), number, repeat),
+        'json_loads': _per_call(lambda: json.loads(text), number // 10, repeat),
+        'operation_get': _per_call(
+            lambda: api._operation('sp/keywords', params), number // 10, repeat),
+        'operation_get_parsed': _per_call(
+            lambda: json.loads(api._operation('sp/keywords', params)['response']),
+            number // 10, repeat),
+        'operation_get_parse_responses': _per_call(
+            lambda: parsing_api._operation('sp/keywords', params)['response'],
+            number // 10, repeat),
+        'json_backend': BACKEND,
+    }
+
+
+def _serve(queue, stop, options):
+    server = FakeAdvertisingServer(**options).start()
+    queue.put(server.endpoint)
+    stop.wait()
+    server.stop()
+
+
+class _ServerProcess(object):
+
+    """Runs a FakeAdvertisingServer in its own process, away from the GIL."""
+
+    def __init__(self, **options):
+        context = multiprocessing.get_context('spawn')
+        self._queue = context.Queue()
+        self._stop = context.Event()
+        self._process = context.Process(target=_serve, args=(self._queue, self._stop, options),
+                                        daemon=True)
+
+    def __enter__(self):
+        self._process.start()
+        self.endpoint = self._queue.get(timeout=30)
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._process.join(timeout=10)
+        if self._process.is_alive():
+            self._process.terminate()
+
+
+def _run_for(duration, threads, call):
+    """Calls **call** from **threads** threads for **duration** seconds."""
+    counts = [0] * threads
+    errors = [0] * threads
+    deadline = time.monotonic() + duration
+
+    def worker(index):
+        while time.monotonic() < deadline:
+            result = call()
+            counts[index] += result[0]
+            errors[index] += result[1]
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.monotonic()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.monotonic() - start
+    return sum(counts), sum(errors), elapsed
+
+
+def bench_throughput(duration=5.0, threads=8, latency=0.0, page_size=100, bulk_items=1000):
+    """Sustained requests per second for list and bulk workloads."""
+    results = {'duration_s': duration, 'threads': threads, 'latency_s': latency}
+    with _ServerProcess(latency=latency, entity_count=page_size) as server:
+        api = _client(server.endpoint, pool_size=threads)
+        params = {'startIndex': 0, 'count': page_size}
+
+        def list_call():
+            res = api.list_campaigns(params)
+            return 1, 0 if res['success'] else 1
+
+        api.list_campaigns(params)
+        requests, errors, elapsed = _run_for(duration, threads, list_call)
+        results['list'] = {'requests': requests,
+                           'errors': errors,
+                           'requests_per_s': round(requests / elapsed, 1)}
+
+        items = [{'keywordId': i + 1, 'bid': 1.0} for i in range(bulk_items)]
+
+        def bulk_call():
+            res = api.bulk_mutate('update_biddable_keywords', items, max_workers=threads)
+            return res['chunks'], res['failed_chunks']
+
+        requests, errors, elapsed = _run_for(duration, 1, bulk_call)
+        calls = requests // len(chunked(items, DEFAULT_CHUNK_SIZE))
+        results['bulk'] = {'items_per_call': bulk_items,
+                           'calls': calls,
+                           'requests': requests,
+                           'errors': errors,
+                           'requests_per_s': round(requests / elapsed, 1),
+                           'items_per_s': round(calls * bulk_items / elapsed, 1)}
+        results['pool'] = api.connection_stats()
+    return results
+
+
+def _download_child(queue, endpoint, report_id, mode, memory_limit_mb=None):
+    if memory_limit_mb:
+        limit = memory_limit_mb * MB
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    api = _client(endpoint)
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.monotonic()
+    location = '{}/v2/reports/{}/download'.format(endpoint, report_id)
+    rows = 0
+    try:
+        if mode == 'path':
+            with tempfile.TemporaryDirectory() as tmp:
+                res = api._download(location, path=os.path.join(tmp, 'report.json.gz'))
+        elif mode == 'stream':
+            res = api._download(location, stream=True)
+            if res['success']:
+                for _ in res['response']:
+                    rows += 1
+        else:
+            res = api._download(location)
+            if res['success']:
+                rows = len(res['response'])
+    except Exception as e:
+        # Some JSON backends report a failed allocation as a decode error.
+        error = 'out of memory' if isinstance(e, MemoryError) else '{}: {}'.format(
+            type(e).__name__, e)
+        queue.put({'success': False, 'error': error,
+                   'memory_limit_mb': memory_limit_mb,
+                   'seconds': round(time.monotonic() - start, 3)})
+        return
+    elapsed = time.monotonic() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        base, peak = base // 1024, peak // 1024
+    queue.put({'success': res['success'],
+               'rows': rows,
+               'seconds': round(elapsed, 3),
+               'baseline_rss_kb': base,
+               'peak_rss_kb': peak,
+               'delta_rss_kb': peak - base})
+
+
+def _gzip_row_bytes(sample_rows=20000):
+    """Average gzipped bytes per row of the fake server's campaigns report."""
+    server = FakeAdvertisingServer(report_rows=sample_rows)
+    size = sum(len(chunk) for chunk in server.iter_download({'record_type': 'campaigns'}))
+    server.stop()
+    return size / sample_rows
+
+
+def bench_download(sizes_mb=(10, 100, 1024), modes=('path', 'stream', 'list'), list_max_mb=None,
+                   memory_limit_mb=4096):
+    """
+    Peak RSS of ``_download`` per report size and mode, each in a fresh
+    process. Sizes are of the gzipped download, as served; the row count is
+    derived from the compressed size of a sample of rows.
+
+    Every mode is run at every size. A child that fails, e.g. when 'list',
+    which holds the whole report, runs out of its **memory_limit_mb** of
+    address space, is reported with its error. Sizes above **list_max_mb**,
+    if given, are reported as skipped for 'list'.
+    """
+    row_bytes = _gzip_row_bytes()
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for size_mb in sizes_mb:
+        rows = max(1, int(size_mb * MB / row_bytes))
+        with _ServerProcess(report_rows=rows) as server:
+            api = _client(server.endpoint)
+            report = json.loads(api.request_report(record_type='campaigns', data={})['response'])
+            for mode in modes:
+                result = {'size_mb': size_mb, 'mode': mode, 'expected_rows': rows}
+                if mode == 'list' and list_max_mb is not None and size_mb > list_max_mb:
+                    result.update({'success': False, 'skipped': True})
+                    results.append(result)
+                    continue
+                queue = context.Queue()
+                child = context.Process(target=_download_child,
+                                        args=(queue, server.endpoint, report['reportId'], mode,
+                                              memory_limit_mb))
+                child.start()
+                while True:
+                    try:
+                        result.update(queue.get(timeout=1))
+                        break
+                    except queue_module.Empty:
+                        if not child.is_alive():
+                            # Killed, e.g. by the kernel's OOM killer.
+                            result.update({'success': False,
+                                           'error': 'exited with code {}'.format(child.exitcode)})
+                            break
+                child.join()
+                results.append(result)
+    return results
+
+
+# Metrics where larger is better; every other compared metric is a cost.
+_HIGHER_IS_BETTER = ('requests_per_s', 'items_per_s')
+
+
+def _flatten(value, prefix=''):
+    if isinstance(value, dict):
+        flat = {}
+        for key, item in value.items():
+            flat.update(_flatten(item, '{}{}.'.format(prefix, key)))
+        return flat
+    if isinstance(value, list):
+        flat = {}
+        for item in value:
+            if isinstance(item, dict) and 'size_mb' in item:
+                key = '{}MB.{}'.format(item['size_mb'], item['mode'])
+                flat.update(_flatten({k: v for k, v in item.items() if k in ('peak_rss_kb', 'seconds')},
+                                     '{}{}.'.format(prefix, key)))
+        return flat
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return {prefix[:-1]: value}
+    return {}
+
+
+def compare(baseline, current, tolerance):
+    """
+    Lists metrics of **current** that are worse than **baseline** by more
+    than **tolerance**, a fraction.
+    """
+    regressions = []
+    old = _flatten({k: baseline.get(k) for k in ('overhead', 'throughput', 'download')})
+    new = _flatten({k: current.get(k) for k in ('overhead', 'throughput', 'download')})
+    for key, value in sorted(new.items()):
+        before = old.get(key)
+        if not before or not key.endswith(('_us', '_per_s', 'peak_rss_kb', 'seconds')):
+            continue
+        if key.endswith(_HIGHER_IS_BETTER):
+            change = (before - value) / before
+        else:
+            change = (value - before) / before
+        if change > tolerance:
+            regressions.append({'metric': key, 'baseline': before, 'current': value,
+                                'change': round(change, 3)})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--only', choices=('overhead', 'throughput', 'download'), action='append',
+                        help='run only these benchmarks (repeatable)')
+    parser.add_argument('--duration', type=float, default=5.0,
+                        help='seconds per throughput workload')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='seconds of server latency for throughput runs')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1024],
+                        help='gzipped report sizes in MB')
+    parser.add_argument('--memory-limit', type=int, default=4096,
+                        help='address space in MB allowed per download process')
+    parser.add_argument('--output', help='write results here instead of stdout')
+    parser.add_argument('--baseline', help='previous results to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='allowed fractional slowdown before failing')
+    args = parser.parse_args(argv)
+    selected = args.only or ['overhead', 'throughput', 'download']
+
+    results = {'version': versions.__version__,
+               'python': platform.python_version(),
+               'platform': platform.platform(),
+               'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())}
+    if 'overhead' in selected:
+        results['overhead'] = bench_overhead()
+    if 'throughput' in selected:
+        results['throughput'] = bench_throughput(args.duration, args.threads, args.latency)
+    if 'download' in selected:
+        results['download'] = bench_download(args.sizes, memory_limit_mb=args.memory_limit)
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            results['regressions'] = compare(json.load(f), results, args.tolerance)
+        status = 1 if results['regressions'] else 0
+
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
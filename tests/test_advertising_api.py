@@ -0,0 +1,23 @@
+import unittest
+
+from amazon_advertising_api.fake_server import FakeAdvertisingServer
+from amazon_advertising_api.token_manager import TokenManager
+
+
+class DownloadTest(unittest.TestCase):
+
+    def test_download_when_token_refresh_fails(self):
+        with FakeAdvertisingServer() as server:
+            tokens = TokenManager('fake-client-id', 'fake-client-secret', 'fake-refresh-token',
+                                  token_url=server.endpoint + '/missing/token')
+            api = server.client(profile_id='1', token_manager=tokens, access_token=None)
+
+            result = api._download('{}/v2/reports/amzn1.report.1/download'.format(server.endpoint))
+
+            self.assertFalse(result['success'])
+            self.assertEqual(result['code'], 401)
+            self.assertEqual(server.stats()['requests'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import json
+import time
+import unittest
+
+from amazon_advertising_api.cache import EntityCache
+from amazon_advertising_api.fake_server import FakeAdvertisingServer
+
+
+class JobStatusTest(unittest.TestCase):
+
+    def test_job_status_is_never_cached(self):
+        cache = EntityCache(default_ttl=60, ttls={'reports': 60})
+        for interface in ('reports/amzn1.report.1', 'sp/snapshots/amzn1.snapshot.2',
+                          'reports/amzn1.report.1/download'):
+            self.assertIsNone(cache.ttl(interface))
+        self.assertEqual(cache.ttl('sp/portfolios'), 60)
+
+    def test_report_poll_sees_new_status(self):
+        with FakeAdvertisingServer(job_delay=0.3) as server:
+            api = server.client(profile_id='1', cache=EntityCache(default_ttl=60))
+            report_id = json.loads(api.request_report(record_type='campaigns',
+                                                      data={})['response'])['reportId']
+            pending = json.loads(api.request_report(report_id=report_id)['response'])
+            self.assertEqual(pending['status'], 'IN_PROGRESS')
+
+            ready = None
+            for _ in range(50):
+                status = json.loads(api.request_report(report_id=report_id)['response'])
+                if status['status'] == 'SUCCESS':
+                    ready = status
+                    break
+                time.sleep(0.05)
+            self.assertIsNotNone(ready)
+            self.assertEqual(api.cache.stats()['hits'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
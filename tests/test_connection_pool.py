@@ -0,0 +1,40 @@
+import time
+import unittest
+from unittest import mock
+
+from amazon_advertising_api.fake_server import FakeAdvertisingServer
+
+
+class ClosedConnectionTest(unittest.TestCase):
+
+    def test_post_after_server_closed_idle_connection(self):
+        with FakeAdvertisingServer(idle_timeout=0.3) as server:
+            api = server.client(profile_id='1')
+            self.assertTrue(api.list_campaigns()['success'])
+            time.sleep(1)
+
+            result = api.create_campaigns([{'name': 'New', 'state': 'enabled'}])
+
+            self.assertTrue(result['success'])
+            self.assertEqual(result['code'], 207)
+            stats = api.pool_manager.stats()[server.endpoint]
+            self.assertEqual(stats['connections_reused'], 0)
+            self.assertEqual(stats['connections_discarded'], 1)
+            self.assertEqual(server.stats()['by_status'], {200: 1, 207: 1})
+
+    def test_post_resent_when_write_fails_on_closed_connection(self):
+        with FakeAdvertisingServer(idle_timeout=0.3) as server:
+            api = server.client(profile_id='1')
+            self.assertTrue(api.list_campaigns()['success'])
+            time.sleep(1)
+
+            with mock.patch('amazon_advertising_api.connection_pool.ConnectionPool._is_dropped',
+                            return_value=False):
+                result = api.create_campaigns([{'name': 'New', 'state': 'enabled'}])
+
+            self.assertTrue(result['success'])
+            self.assertEqual(server.stats()['by_status'], {200: 1, 207: 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import threading
+import unittest
+from unittest import mock
+
+from amazon_advertising_api.rate_limit import RateLimiter
+
+
+class RateLimiterTest(unittest.TestCase):
+
+    def test_simultaneous_429s_decrease_once(self):
+        limiter = RateLimiter(rate=50, cooldown=1.0)
+        threads = [threading.Thread(target=limiter.feedback, args=('1', 'host', 429))
+                   for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = limiter.stats()[('1', 'host')]
+        self.assertEqual(stats['rate'], 25)
+        self.assertEqual(stats['throttled'], 20)
+
+    def test_429_after_cooldown_decreases_again(self):
+        limiter = RateLimiter(rate=50, cooldown=1.0)
+        with mock.patch('amazon_advertising_api.rate_limit.time.monotonic') as monotonic:
+            monotonic.return_value = 100.0
+            limiter.feedback('1', 'host', 429)
+            monotonic.return_value = 100.5
+            limiter.feedback('1', 'host', 429, retry_after='0')
+            self.assertEqual(limiter.stats()[('1', 'host')]['rate'], 25)
+            monotonic.return_value = 101.5
+            limiter.feedback('1', 'host', 429)
+        self.assertEqual(limiter.stats()[('1', 'host')]['rate'], 12.5)
+
+    def test_recovery_depends_on_time_not_request_count(self):
+        limiter = RateLimiter(rate=50, min_rate=0.2, increase=0.05, cooldown=1.0)
+        with mock.patch('amazon_advertising_api.rate_limit.time.monotonic') as monotonic:
+            monotonic.return_value = 100.0
+            limiter.feedback('1', 'host', 429)
+            # The pause after the 429 lasts one interval at 25 rps.
+            monotonic.return_value = 100.04
+            for _ in range(1000):
+                limiter.feedback('1', 'host', 200)
+            self.assertEqual(limiter.stats()[('1', 'host')]['rate'], 25)
+            monotonic.return_value = 110.04
+            limiter.feedback('1', 'host', 200)
+        # 5% of max_rate, 2.5 rps, per second for 10 seconds.
+        self.assertEqual(limiter.stats()[('1', 'host')]['rate'], 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import json
+import unittest
+
+from amazon_advertising_api.recommendations import KeywordBidRecommender
+
+
+class _Api(object):
+
+    """Answers each bid recommendations request with the result for its ad group."""
+
+    def __init__(self, results):
+        self.results = results
+
+    def get_keyword_bid_recommendations(self, keyword_data):
+        result = self.results[keyword_data['adGroupId']]
+        if callable(result):
+            return result(keyword_data)
+        return result
+
+
+def _recommended(keyword_data):
+    return {'success': True, 'code': 200,
+            'response': json.dumps({'adGroupId': keyword_data['adGroupId'],
+                                    'recommendations': [{'code': 'SUCCESS', 'keyword': k['keyword']}
+                                                        for k in keyword_data['keywords']]})}
+
+
+def _keywords(ad_group_id, count):
+    return [{'keywordId': ad_group_id * 100 + i, 'adGroupId': ad_group_id,
+             'keywordText': 'keyword {}'.format(i), 'matchType': 'exact'}
+            for i in range(count)]
+
+
+class KeywordBidRecommenderTest(unittest.TestCase):
+
+    def test_failed_batch_with_text_body(self):
+        api = _Api({1: _recommended,
+                    2: {'success': False, 'code': 500, 'response': 'Internal Server Error'},
+                    3: {'success': True, 'code': 200, 'response': 'Service Unavailable'},
+                    4: {'success': True, 'code': 200, 'response': '["unexpected"]'}})
+        keywords = _keywords(1, 3) + _keywords(2, 2) + _keywords(3, 1) + _keywords(4, 1)
+
+        result = KeywordBidRecommender(api, max_workers=2).run(keywords)
+
+        self.assertFalse(result['success'])
+        self.assertEqual(result['batches'], 4)
+        self.assertEqual(result['failed_batches'], 3)
+        self.assertEqual(result['response'][100]['code'], 'SUCCESS')
+        self.assertEqual(result['response'][200], {'code': 'HTTP_500',
+                                                   'description': 'Internal Server Error'})
+        self.assertEqual(result['response'][300]['code'], 'HTTP_200')
+        self.assertEqual(result['response'][400]['code'], 'HTTP_200')
+
+
+if __name__ == '__main__':
+    unittest.main()
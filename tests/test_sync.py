@@ -0,0 +1,50 @@
+import unittest
+
+from amazon_advertising_api.fake_server import FakeAdvertisingServer
+from amazon_advertising_api.sync import AccountSync
+
+
+class KeywordChangeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeAdvertisingServer(entity_count=300)
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        self.api = self.server.client()
+
+    def sync_keyword_change(self, **kwargs):
+        sync = AccountSync(self.api, snapshot_options={'poll_interval': 0.01}, **kwargs)
+        self.assertEqual(sync.sync('1')['mode'], 'full')
+        result = self.api.for_profile('1').update_biddable_keywords([{'keywordId': 150, 'bid': 9.5}])
+        self.assertTrue(result['success'])
+        return sync, sync.sync('1')
+
+    def test_keyword_change_is_reported_as_unchecked(self):
+        sync, summary = self.sync_keyword_change()
+
+        self.assertEqual(summary['mode'], 'incremental')
+        self.assertEqual(summary['changed_campaigns'], 0)
+        self.assertEqual(summary['unchecked'], ['keywords', 'targets'])
+        self.assertNotEqual(sync.store.entities('1', 'keywords')[150]['bid'], 9.5)
+
+    def test_keyword_change_is_detected(self):
+        sync, summary = self.sync_keyword_change(detect_changes=('adGroups', 'keywords'))
+
+        self.assertEqual(summary['mode'], 'incremental')
+        self.assertEqual(summary['changed_campaigns'], 1)
+        self.assertEqual(summary['unchecked'], ['targets'])
+        self.assertEqual(sync.store.entities('1', 'keywords')[150]['bid'], 9.5)
+
+    def test_ad_group_change_is_detected_by_default(self):
+        sync = AccountSync(self.api, snapshot_options={'poll_interval': 0.01})
+        sync.sync('1')
+        self.api.for_profile('1').update_ad_groups([{'adGroupId': 25, 'defaultBid': 2.0}])
+
+        summary = sync.sync('1')
+
+        self.assertEqual(summary['changed_campaigns'], 1)
+        self.assertEqual(sync.store.entities('1', 'adGroups')[25]['defaultBid'], 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()